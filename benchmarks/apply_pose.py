@@ -0,0 +1,84 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Cost of a pose update on the fast path
+
+Times PTZ.apply_pose, the path of the local control socket, against an element whose
+properties are no-ops, so only the service's own work is measured: the bookkeeping of the
+pose, the history, the level of detail and the events.
+
+    python3 benchmarks/apply_pose.py --updates 100000
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from ptz.ptz import PTZ
+
+
+class NoopElement():
+    """Stands for rr_panorama_ptz"""
+
+    def set_property(self, name, value):
+        """Ignore the property"""
+
+
+class NoopMedia():
+    """Stands for the pipeline, with just the PTZ element"""
+
+    def __init__(self):
+        self.__element = NoopElement()
+
+    def get_element(self, element_name):  # pylint: disable=unused-argument
+        """Get the element"""
+        return self.__element
+
+
+def main():
+    """Run the benchmark
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--updates', type=int, default=100000)
+    args = parser.parse_args()
+
+    ptz = PTZ(suspend_grace=None)
+    # Replace the pipeline once the background bring-up gave up without a VST
+    time.sleep(1.0)
+    ptz._PTZ__media = NoopMedia()  # pylint: disable=protected-access
+
+    poses = [((i % 720) / 2 - 180, (i % 180) / 2 - 45, 1 + (i % 40) / 10) for i in range(1000)]
+    for pan, tilt, zoom in poses:
+        ptz.apply_pose(pan, tilt, zoom)
+
+    samples = []
+    for i in range(args.updates):
+        pan, tilt, zoom = poses[i % len(poses)]
+        start = time.perf_counter()
+        ptz.apply_pose(pan, tilt, zoom)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    for pan, tilt, zoom in poses:
+        ptz.apply_pose(pan, tilt, zoom)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    retained = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+
+    print(f'apply_pose p50 {samples[len(samples) // 2] * 1e6:.2f} us, '
+          f'p99 {samples[int(len(samples) * 0.99)] * 1e6:.2f} us, '
+          f'{retained / len(poses):.1f} bytes retained per update')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Throughput of the CPU PTZ remap
+
+Times Remapper.remap from an equirectangular input at the common output sizes, once with
+a fixed pose, where the remap table comes from the cache, and once while panning, where a
+new table is built from the cached pan 0 base on every frame. Decode, colour conversion
+and encode are not included.
+
+    python3 benchmarks/cpuptz.py --frames 200 --threads 4
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ptz.cpuptz import PAN_STEP, RemapCache, Remapper
+
+OUTPUT_SIZES = ((500, 500), (1280, 720), (1920, 1080))
+
+
+def measure(remapper, source, destination, poses):
+    """Frames per second rendering the poses"""
+    start = time.perf_counter()
+    for pan, tilt, zoom in poses:
+        remapper.remap(source, destination, pan, tilt, zoom)
+    return len(poses) / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--input', type=int, nargs=2, default=(3840, 1920),
+                        metavar=('WIDTH', 'HEIGHT'))
+    args = parser.parse_args()
+
+    in_width, in_height = args.input
+    rng = np.random.default_rng(0)
+    source = rng.integers(0, 2**32, size=(in_height, in_width), dtype=np.uint32)
+
+    print(f'{in_width}x{in_height} input, {args.threads} threads')
+    for width, height in OUTPUT_SIZES:
+        destination = np.empty((height, width), dtype=np.uint32)
+        remapper = Remapper(threads=args.threads, cache=RemapCache())
+        try:
+            fixed = [(0.0, 10.0, 1.0)] * args.frames
+            remapper.remap(source, destination, *fixed[0])
+            cached = measure(remapper, source, destination, fixed)
+
+            # One quantization step per frame, so no frame hits the table cache
+            panning = [(i * PAN_STEP + PAN_STEP, 10.0, 1.0) for i in range(args.frames)]
+            moving = measure(remapper, source, destination, panning)
+        finally:
+            remapper.shutdown()
+        print(f'{width}x{height}: {cached:.0f} fps cached, {moving:.0f} fps panning')
+
+
+if __name__ == '__main__':
+    main()
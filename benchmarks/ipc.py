@@ -0,0 +1,69 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Round-trip cost of a call to the pipeline worker
+
+Times the same PTZ calls on a PTZ in this process and through RemotePTZ, which sends
+them over a pipe to the worker process (--isolate). The calls don't need a pipeline,
+so the difference is the IPC overhead:
+
+    python3 benchmarks/ipc.py --calls 10000
+"""
+
+import argparse
+import time
+
+from ptz.ptz import PTZ
+from ptz.worker import RemotePTZ
+
+CALLS = (
+    ('get_state', ()),
+    ('get_output_stats', ()),
+    ('cancel_scheduled', (0,)),
+)
+
+
+def measure(function, args, calls):
+    """Time calls to a function
+
+    Returns:
+        tuple: median and 99th percentile in microseconds
+    """
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        function(*args)
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return samples[len(samples) // 2] * 1e6, samples[int(len(samples) * 0.99)] * 1e6
+
+
+def main():
+    """Run the benchmark
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--calls', type=int, default=10000)
+    args = parser.parse_args()
+
+    local = PTZ(suspend_grace=None)
+    remote = RemotePTZ(suspend_grace=None)
+    # Wait for the worker to be up
+    remote.get_state()
+
+    print(f'{"call":<20}{"local p50":>12}{"p99":>10}{"remote p50":>14}{"p99":>10}  (us)')
+    for method, method_args in CALLS:
+        local_p50, local_p99 = measure(getattr(local, method), method_args, args.calls)
+        remote_p50, remote_p99 = measure(getattr(remote, method), method_args, args.calls)
+        print(f'{method:<20}{local_p50:>12.1f}{local_p99:>10.1f}{remote_p50:>14.1f}{remote_p99:>10.1f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Per-frame cost of the PTZ at each level of detail
+
+For a range of zooms, times the CPU PTZ remap of a frame from every level of detail and marks
+the level LevelOfDetail selects, coming from the full input as the service does. Only the PTZ
+stage is measured: the scaling to the level, done by nvvidconv or videoscale before the PTZ
+element, is not.
+
+    python3 benchmarks/lod.py --input 7680 3840 --window 500
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from ptz.cpuptz import Remapper
+from ptz.lod import LevelOfDetail
+
+ZOOMS = (0.5, 1.0, 2.0, 4.0, 8.0)
+
+
+def measure(remapper, source, destination, zoom, frames):
+    """Milliseconds per frame rendering a fixed pose"""
+    remapper.remap(source, destination, 0.0, 10.0, zoom)
+    start = time.perf_counter()
+    for _ in range(frames):
+        remapper.remap(source, destination, 0.0, 10.0, zoom)
+    return (time.perf_counter() - start) / frames * 1e3
+
+
+def main():
+    """Run the benchmark
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--input', type=int, nargs=2, default=(3840, 1920),
+                        metavar=('WIDTH', 'HEIGHT'))
+    parser.add_argument('--window', type=int, default=500)
+    parser.add_argument('--levels', type=int, default=4)
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    lod = LevelOfDetail(*args.input, args.window, levels=args.levels)
+    rng = np.random.default_rng(0)
+    sources = {size: rng.integers(0, 2**32, size=(size[1], size[0]), dtype=np.uint32)
+               for size in lod.get_levels()}
+    destination = np.empty((args.window, args.window), dtype=np.uint32)
+    remapper = Remapper(threads=args.threads)
+
+    print(f'{args.input[0]}x{args.input[1]} input, {args.window}x{args.window} window, ms/frame '
+          f'at {", ".join(f"{w}x{h}" for w, h in lod.get_levels())}, * selected')
+    try:
+        for zoom in ZOOMS:
+            selected = LevelOfDetail(*args.input, args.window, levels=args.levels)
+            selected.select(zoom)
+            costs = []
+            for size, source in sources.items():
+                cost = measure(remapper, source, destination, zoom, args.frames)
+                costs.append(f'{cost:6.2f}{"*" if size == selected.get_size() else " "}')
+            print(f'zoom {zoom:4.1f}, needs {lod.required_width(zoom):6.0f} px: {" ".join(costs)}')
+    finally:
+        remapper.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Cost of the controllers' request and response serialization
+
+Compares, per request, the ways the controllers have parsed and serialized bodies: a dict
+from the JSON body validated with model_validate (the original controllers), a pydantic
+TypeAdapter, held or looked up per call as the shared serialization layer did, and the
+model methods used now. The ApiResponse error bodies are timed built per request and from
+the cache of constant messages.
+
+    python3 benchmarks/serialization.py --iterations 100000
+"""
+
+import argparse
+import json
+import time
+
+from pydantic import TypeAdapter
+from rrmsutils.models.apiresponse import ApiResponse
+from rrmsutils.models.ptz.position import Position
+
+from ptz.controllers.serialization import adapter as cached_adapter
+from ptz.controllers.serialization import api_response_body
+
+BODY = b'{"pan": 12.5, "tilt": -30.25}'
+MESSAGE = 'Error scheduling Position'
+
+
+def measure(function, iterations):
+    """Median time of a call in microseconds, over batches of 100 calls"""
+    batches = []
+    for _ in range(max(iterations // 100, 1)):
+        start = time.perf_counter()
+        for _ in range(100):
+            function()
+        batches.append((time.perf_counter() - start) / 100)
+    batches.sort()
+    return batches[len(batches) // 2] * 1e6
+
+
+def main():
+    """Run the benchmark
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=100000)
+    args = parser.parse_args()
+
+    position = Position.model_validate_json(BODY)
+    adapter = TypeAdapter(Position)
+
+    cases = {
+        'parse': {
+            'json.loads + model_validate': lambda: Position.model_validate(json.loads(BODY)),
+            'TypeAdapter.validate_json': lambda: adapter.validate_json(BODY),
+            'adapter(model).validate_json': lambda: cached_adapter(Position).validate_json(BODY),
+            'model_validate_json': lambda: Position.model_validate_json(BODY),
+        },
+        'dump': {
+            'TypeAdapter.dump_json': lambda: adapter.dump_json(position),
+            'adapter(type).dump_json': lambda: cached_adapter(type(position)).dump_json(position),
+            'model_dump_json': position.model_dump_json,
+        },
+        'error body': {
+            'built per request': lambda: ApiResponse(code=1, message=MESSAGE).model_dump_json(),
+            'cached': lambda: api_response_body(MESSAGE),
+        },
+    }
+
+    for name, functions in cases.items():
+        for label, function in functions.items():
+            print(f'{name:<10} {label:<28} {measure(function, args.iterations):6.2f} us')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class NodeAgent
+"""
+
+import os
+import uuid
+from threading import Event, Thread
+
+import requests
+
+from ptz.logger import Logger
+from ptz.models.node import Node
+
+logger = Logger.get_logger()
+
+
+class NodeAgent():
+    """Class NodeAgent, registers this service as a node in a coordinator and keeps the registration alive.
+    """
+
+    def __init__(self, coordinator_uri: str, node_uri: str, interval: float = 3.0):
+        """NodeAgent object. It sends a heartbeat with the current load (load average per CPU)
+        to the coordinator every interval seconds. The node runs a single pipeline, so it takes
+        one session.
+
+        Args:
+            coordinator_uri (str): The URL of the coordinator, for example "http://127.0.0.1:5000"
+            node_uri (str): The URL the coordinator uses to reach this node
+            interval (float, optional): Seconds between heartbeats. Defaults to 3.0.
+        """
+        self.__coordinator_uri = coordinator_uri.rstrip('/')
+        self.__node_uri = node_uri.rstrip('/')
+        self.__interval = interval
+        self.__node_id = uuid.uuid4().hex
+        self.__stop = Event()
+        self.__thread = Thread(target=self.__loop, daemon=True)
+
+    def start(self):
+        """Start sending heartbeats in the background
+        """
+        self.__thread.start()
+
+    def stop(self):
+        """Stop sending heartbeats and unregister from the coordinator
+        """
+        self.__stop.set()
+        try:
+            requests.delete(f'{self.__coordinator_uri}/nodes/{self.__node_id}',
+                            timeout=self.__interval)
+        except requests.RequestException as e:
+            logger.warning(f'Error unregistering from the coordinator: {repr(e)}')
+
+    def __load(self):
+        try:
+            return os.getloadavg()[0] / (os.cpu_count() or 1)
+        except OSError:
+            return 0.0
+
+    def __loop(self):
+        registered = False
+        while not self.__stop.is_set():
+            node = Node(url=self.__node_uri, load=self.__load())
+            try:
+                response = requests.put(f'{self.__coordinator_uri}/nodes/{self.__node_id}',
+                                        data=node.model_dump_json(),
+                                        headers={'Content-Type': 'application/json'},
+                                        timeout=self.__interval)
+                response.raise_for_status()
+                if not registered:
+                    logger.info(
+                        f'Registered as node {self.__node_id} in {self.__coordinator_uri}')
+                registered = True
+            except requests.RequestException as e:
+                logger.warning(f'Error sending heartbeat to the coordinator: {repr(e)}')
+                registered = False
+
+            self.__stop.wait(self.__interval)
@@ -0,0 +1,44 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Output client tracking
+"""
+
+TCP_TABLES = ('/proc/net/tcp', '/proc/net/tcp6')
+ESTABLISHED = '01'
+
+
+def count_clients(port: int):
+    """Count the established TCP connections on a local port. Every RTSP client keeps its
+    control connection open for the whole session, also when the media goes over UDP, so
+    this is the number of clients of an rtsp output.
+
+    Args:
+        port (int): Local port
+
+    Returns:
+        int, None: the number of connections, None if the kernel tables can't be read.
+    """
+    local_port = f':{port:04X}'
+    count = 0
+    readable = False
+    for table in TCP_TABLES:
+        try:
+            with open(table, encoding='ascii') as connections:
+                next(connections, None)
+                for connection in connections:
+                    fields = connection.split(None, 4)
+                    if fields[1].endswith(local_port) and fields[3] == ESTABLISHED:
+                        count += 1
+            readable = True
+        except OSError:
+            continue
+    return count if readable else None
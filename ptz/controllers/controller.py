@@ -13,7 +13,13 @@
 
 from abc import ABC, abstractmethod
 
-from flask import Response
+from flask import Response, request
+from rrmsutils.models.apiresponse import ApiResponse
+
+from ptz.controllers.serialization import api_response_body
+
+# Longest time in seconds a long-poll request may wait
+MAX_WAIT = 60.0
 
 
 class Controller(ABC):
@@ -24,15 +30,94 @@ class Controller(ABC):
         """Add rules to flask server
         """
 
-    def response(self, data, code: int = 200, mimetype: str = "application/json"):
+    def response(self, data, code: int = 200, mimetype: str = "application/json", headers: dict = None):
         """Builds and returns Response for a request
 
         Args:
             data: the data to be sent
             code (int, optional): HTTPStatus code. Defaults to 200.
             mimetype (str, optional): Response mimetype. Defaults to "application/json".
+            headers (dict, optional): Additional response headers. Defaults to None.
 
         Returns:
             Flask.Response: A Flask Response object with the given data.
         """
-        return Response(data, code, mimetype=mimetype)
+        return Response(data, code, mimetype=mimetype, headers=headers)
+
+    def wait_for_change(self, events, kinds):
+        """Long-poll support for GET requests. With ?wait=SECONDS the request blocks until
+        there is a change of the given kinds newer than ?version=N (the current version if
+        not given) or the time runs out.
+
+        Args:
+            events (EventHub): Hub with the state versions, None disables long-polling
+            kinds (iterable): Kinds of changes to wait for
+
+        Returns:
+            dict: headers with the version to be returned in the response.
+        """
+        if events is None:
+            return None
+
+        wait = request.args.get('wait', type=float)
+        if wait is None:
+            version = events.get_version()
+        else:
+            since = request.args.get('version', default=events.get_version(), type=int)
+            version = events.wait(since, min(max(wait, 0.0), MAX_WAIT), kinds)
+        return {'X-Version': str(version)}
+
+    def scheduled_target(self):
+        """Get the target of a scheduled command from the request: ?frame=N or ?at=RUNNING_TIME_NS
+
+        Returns:
+            tuple: (frame, running_time), both None for immediate commands.
+        """
+        return request.args.get('frame', type=int), request.args.get('at', type=int)
+
+    def parse_request(self, model):
+        """Validate the JSON body of the current request into a model
+
+        Args:
+            model (type): pydantic model class
+
+        Returns:
+            The model instance. Raises an exception if the body is not valid.
+        """
+        return model.model_validate_json(request.get_data())
+
+    def model_response(self, value, code: int = 200):
+        """Builds and returns a JSON Response with a serialized model
+
+        Args:
+            value (BaseModel): the model to be sent
+            code (int, optional): HTTPStatus code. Defaults to 200.
+
+        Returns:
+            Flask.Response: A Flask Response object with the given model.
+        """
+        return self.response(value.model_dump_json(), code)
+
+    def error_response(self, message: str, code: int = 400, error: Exception = None,
+                       cache: bool = True):
+        """Builds and returns an ApiResponse error. The bodies of constant messages are
+        formatted once and cached; messages built from request data and messages with an
+        error are formatted for this response only.
+
+        Args:
+            message (str): Error message
+            code (int, optional): HTTPStatus code. Defaults to 400.
+            error (Exception, optional): Exception to report in the message. Defaults to None.
+            cache (bool, optional): Whether the message is constant and its body can be
+            cached. Pass False for messages that depend on the request. Defaults to True.
+
+        Returns:
+            Flask.Response: A Flask Response object with the ApiResponse.
+        """
+        if error is None and cache:
+            return self.response(api_response_body(message), code)
+
+        if error is not None:
+            message = f'{message}, error: {repr(error)}'
+        data = ApiResponse(code=1, message=message).model_dump_json()
+        return self.response(data, code)
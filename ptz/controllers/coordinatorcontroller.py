@@ -0,0 +1,157 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for the coordinator
+"""
+
+import json
+
+from flask import redirect, request
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.controllers.serialization import api_response_body
+from ptz.coordinator import Coordinator
+from ptz.logger import Logger
+from ptz.models.node import Node
+from ptz.models.stream import Stream
+
+logger = Logger.get_logger()
+
+
+class CoordinatorController(Controller):
+    """Controller for the coordinator
+    """
+
+    RESOURCES = ('position', 'zoom', 'stream')
+
+    def __init__(self, coordinator: Coordinator):
+        """Constructor of the Class CoordinatorController
+
+        Args:
+            coordinator (Coordinator): a Coordinator Class instance
+        """
+        self.__coordinator = coordinator
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/nodes', 'nodes',
+                         self.nodes, methods=['GET'])
+        app.add_url_rule('/nodes/<node_id>', 'node',
+                         self.node, methods=['PUT', 'DELETE'])
+        app.add_url_rule('/sessions', 'sessions',
+                         self.sessions, methods=['GET', 'POST'])
+        app.add_url_rule('/sessions/<session_id>', 'session',
+                         self.session, methods=['GET', 'DELETE'])
+        app.add_url_rule('/sessions/<session_id>/<resource>', 'session_resource',
+                         self.session_resource, methods=['GET', 'PUT'])
+
+    @cross_origin()
+    def nodes(self):
+        """Get the registered nodes
+
+        Returns:
+            json: json object with the node identifiers as keys.
+        """
+        nodes = {node_id: node.model_dump()
+                 for node_id, node in self.__coordinator.get_nodes().items()}
+        return self.response(json.dumps(nodes), 200)
+
+    @cross_origin()
+    def node(self, node_id):
+        """Register (heartbeat) or unregister a node
+
+        Returns:
+            json: json with the node as seen by the coordinator, or json with an error.
+        """
+        if request.method == 'DELETE':
+            if self.__coordinator.unregister(node_id) is False:
+                return self.error_response('Node not found', 404)
+            return self.response(api_response_body('Node removed', code=0), 200)
+
+        try:
+            node = self.parse_request(Node)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return self.error_response('Error registering node', error=e)
+
+        node = self.__coordinator.register(node_id, node)
+        return self.model_response(node)
+
+    @cross_origin()
+    def sessions(self):
+        """List the sessions or place a new one
+
+        Returns:
+            json: json with the session list or the created session, or json with an error.
+        """
+        if request.method == 'GET':
+            sessions = [session.model_dump()
+                        for session in self.__coordinator.get_sessions()]
+            return self.response(json.dumps(sessions), 200)
+
+        try:
+            stream = self.parse_request(Stream)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return self.error_response('Error creating session', error=e)
+
+        session = self.__coordinator.create_session(stream)
+        if session is None:
+            return self.error_response('There is no node available for the session', 503)
+
+        return self.model_response(session)
+
+    @cross_origin()
+    def session(self, session_id):
+        """Get or delete a session
+
+        Returns:
+            json: json with the session, or json with an error.
+        """
+        if request.method == 'DELETE':
+            if self.__coordinator.delete_session(session_id) is False:
+                return self.error_response('Session not found', 404)
+            return self.response(api_response_body('Session removed', code=0), 200)
+
+        session = self.__coordinator.get_session(session_id)
+        if session is None:
+            return self.error_response('Session not found', 404)
+
+        return self.model_response(session)
+
+    @cross_origin()
+    def session_resource(self, session_id, resource):
+        """Proxy a control request to the node that owns the session. With ?redirect=true
+        the client is redirected to the node instead.
+
+        Returns:
+            json: the node response, or json with an error.
+        """
+        if resource not in self.RESOURCES:
+            return self.error_response('Resource not supported', 404)
+
+        session = self.__coordinator.get_session(session_id)
+        if session is None:
+            return self.error_response('Session not found', 404)
+
+        if request.args.get('redirect', 'false').lower() == 'true':
+            return redirect(f'{session.url}/{resource}', 307)
+
+        result = self.__coordinator.forward(
+            session_id, request.method, resource, request.get_data())
+        if result is None:
+            return self.error_response('Node not reachable', 502)
+
+        data, code = result
+        return self.response(data, code)
@@ -0,0 +1,79 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for on-demand profiling
+"""
+
+import hmac
+import time
+
+from flask import request
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.logger import Logger
+from ptz.ptz import PTZ
+
+logger = Logger.get_logger()
+
+DEFAULT_SECONDS = 5.0
+
+
+class DebugController(Controller):
+    """Controller for on-demand profiling
+    """
+
+    def __init__(self, ptz: PTZ, token: str):
+        """Constructor of the Class DebugController
+
+        Args:
+            ptz (PTZ): a PTZ Class instance
+            token (str): token expected in the Authorization: Bearer header
+        """
+        self.__ptz = ptz
+        self.__token = token
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/debug/profile', 'debug_profile',
+                         self.profile, methods=['GET'])
+
+    def __authorized(self):
+        scheme, _, token = request.headers.get('Authorization', '').partition(' ')
+        return scheme.lower() == 'bearer' and hmac.compare_digest(token.encode(), self.__token.encode())
+
+    @cross_origin()
+    def profile(self):
+        """Capture a profile for ?seconds=N and return it as a tar.gz archive with the
+        GStreamer tracer logs, the sampled Python stacks and the pipeline graph.
+
+        Returns:
+            application/gzip: the archive, or json with an error.
+        """
+        if not self.__authorized():
+            return self.error_response('Invalid debug token', code=401)
+
+        seconds = request.args.get('seconds', default=DEFAULT_SECONDS, type=float)
+        if seconds <= 0:
+            return self.error_response('Invalid profile duration')
+
+        archive = self.__ptz.profile(seconds)
+        if archive is None:
+            return self.error_response('Profile capture not available, try again later', code=409)
+
+        name = time.strftime('ptz-profile-%Y%m%d-%H%M%S.tar.gz')
+        logger.info(f'Sending profile {name}')
+        return self.response(archive, 200, mimetype='application/gzip',
+                             headers={'Content-Disposition': f'attachment; filename={name}'})
@@ -0,0 +1,79 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for state change events
+"""
+
+import time
+
+from flask import request
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.events import EventHub
+from ptz.logger import Logger
+
+logger = Logger.get_logger()
+
+# Seconds between keep-alive comments on idle streams
+KEEPALIVE = 15.0
+
+
+class EventsController(Controller):
+    """Controller for state change events
+    """
+
+    def __init__(self, events: EventHub, max_rate: float = 10.0):
+        """Constructor of the Class EventsController
+
+        Args:
+            events (EventHub): Hub where the state changes are published
+            max_rate (float, optional): Maximum events per second sent to each observer, changes in between are coalesced. Defaults to 10.0.
+        """
+        self.__events = events
+        self.__min_interval = 1.0 / max_rate if max_rate > 0 else 0.0
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/events', 'events',
+                         self.events, methods=['GET'])
+
+    def __stream(self, since, kinds):
+        last = since
+        while True:
+            if self.__events.wait(last, KEEPALIVE, kinds) == last:
+                yield b': keepalive\n\n'
+                continue
+
+            last, data = self.__events.changes(last, kinds)
+            yield data
+            time.sleep(self.__min_interval)
+
+    @cross_origin()
+    def events(self):
+        """Server-Sent Events stream with the position, zoom, stream, latency mode, output
+        clients and pipeline state changes. The current state is sent first, unless the client
+        resumes with Last-Event-ID. The kinds of events can be selected with ?kinds=position,zoom
+
+        Returns:
+            text/event-stream: the stream of events.
+        """
+        kinds = request.args.get('kinds')
+        kinds = None if kinds is None else tuple(kinds.split(','))
+        since = request.headers.get('Last-Event-ID', default=0, type=int)
+
+        logger.info(f'New events observer for {kinds or "all events"}')
+        return self.response(self.__stream(since, kinds), 200, mimetype='text/event-stream',
+                             headers={'Cache-Control': 'no-cache'})
@@ -0,0 +1,75 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for service health
+"""
+
+import time
+
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.logger import Logger
+from ptz.models.health import Health
+from ptz.ptz import PTZ
+
+logger = Logger.get_logger()
+
+
+class HealthController(Controller):
+    """Controller for service health
+    """
+
+    def __init__(self, ptz: PTZ, start_time: float = None):
+        """Constructor of the Class HealthController
+
+        Args:
+            ptz (PTZ): a PTZ Class instance
+            start_time (float, optional): time.monotonic() value used as reference to measure the time to first request. Defaults to the construction time.
+        """
+        self.__ptz = ptz
+        self.__start_time = time.monotonic() if start_time is None else start_time
+        self.__time_to_first_request = None
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.before_request(self.__on_request)
+        app.add_url_rule('/health', 'health',
+                         self.health, methods=['GET'])
+
+    def __on_request(self):
+        if self.__time_to_first_request is None:
+            self.__time_to_first_request = time.monotonic() - self.__start_time
+            logger.info(
+                f'Time to first request: {self.__time_to_first_request * 1000:.1f} ms')
+
+    @cross_origin()
+    def health(self):
+        """Get the service readiness
+
+        Returns:
+            json: json with the pipeline state, the startup times in seconds and the output usage.
+            The state is PTZ.DOWN, with code 503, if the pipeline worker doesn't answer.
+        """
+        state = self.__ptz.get_state()
+        if state is None:
+            return self.model_response(Health(state=PTZ.DOWN,
+                                              time_to_first_request=self.__time_to_first_request), 503)
+
+        health = Health(state=state,
+                        time_to_first_request=self.__time_to_first_request,
+                        time_to_first_frame=self.__ptz.get_time_to_first_frame(),
+                        output=self.__ptz.get_output_stats())
+        return self.model_response(health)
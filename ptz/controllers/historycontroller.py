@@ -0,0 +1,90 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for the pose history
+"""
+
+from flask import request
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.logger import Logger
+from ptz.ptz import PTZ
+
+logger = Logger.get_logger()
+
+# Limits of the query arguments, they bound the size of the responses
+MAX_POINTS = 10000
+MAX_BINS = 720
+
+
+class HistoryController(Controller):
+    """Controller for the pose history
+    """
+
+    def __init__(self, ptz: PTZ):
+        """Constructor of the Class HistoryController
+
+        Args:
+            ptz (PTZ): a PTZ Class instance
+        """
+        self.__ptz = ptz
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/history', 'history',
+                         self.history, methods=['GET'])
+        app.add_url_rule('/history/heatmap', 'history_heatmap',
+                         self.heatmap, methods=['GET'])
+
+    @cross_origin()
+    def history(self):
+        """Get the poses applied between ?start= and ?end= (seconds since the epoch),
+        downsampled to ?points=N
+
+        Returns:
+            json: json with the poses, or json with an error.
+        """
+        points = request.args.get('points', default=500, type=int)
+        if not 0 < points <= MAX_POINTS:
+            return self.error_response(f'points must be between 1 and {MAX_POINTS}')
+
+        history = self.__ptz.get_history(request.args.get('start', type=float),
+                                         request.args.get('end', type=float), points)
+        if history is None:
+            return self.error_response('Error getting the pose history')
+
+        logger.info(f'Getting {len(history.samples)} of {history.total} poses')
+        return self.model_response(history)
+
+    @cross_origin()
+    def heatmap(self):
+        """Get the seconds spent looking at each region of the sphere between ?start= and
+        ?end=, in ?pan_bins=N by ?tilt_bins=M bins
+
+        Returns:
+            json: json with the heatmap, or json with an error.
+        """
+        pan_bins = request.args.get('pan_bins', default=36, type=int)
+        tilt_bins = request.args.get('tilt_bins', default=18, type=int)
+        if not (0 < pan_bins <= MAX_BINS and 0 < tilt_bins <= MAX_BINS):
+            return self.error_response(f'The number of bins must be between 1 and {MAX_BINS}')
+
+        heatmap = self.__ptz.get_heatmap(request.args.get('start', type=float),
+                                         request.args.get('end', type=float), pan_bins, tilt_bins)
+        if heatmap is None:
+            return self.error_response('Error getting the heatmap')
+
+        return self.model_response(heatmap)
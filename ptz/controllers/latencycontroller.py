@@ -0,0 +1,98 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for the latency mode
+"""
+
+from flask import request
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.events import EventHub
+from ptz.logger import Logger
+from ptz.models.latency import Latency
+from ptz.ptz import PTZ
+
+logger = Logger.get_logger()
+
+
+class LatencyController(Controller):
+    """Controller for the latency mode
+    """
+
+    def __init__(self, ptz: PTZ, events: EventHub = None):
+        """Constructor of the Class LatencyController
+
+        Args:
+            ptz (PTZ): a PTZ Class instance
+            events (EventHub, optional): Hub with the state versions, enables long-polling with ?wait=. Defaults to None.
+        """
+        self.__ptz = ptz
+        self.__events = events
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/latency', 'latency',
+                         self.latency, methods=['GET', 'PUT'])
+
+    @cross_origin()
+    def latency(self):
+        """Defines the action based in the type of method in the request
+
+        Returns:
+            method: get or put latency
+        """
+        if request.method == 'PUT':
+            return self.put_latency()
+        if request.method == 'GET':
+            return self.get_latency()
+
+        return self.error_response(f'Method {request.method} not supported', cache=False)
+
+    def get_latency(self):
+        """Get the current latency mode
+
+        With ?wait=SECONDS it waits for a change newer than ?version=N before answering.
+
+        Returns:
+            json: json with the latency mode, or json with an error.
+        """
+        headers = self.wait_for_change(self.__events, ('latency',))
+
+        mode = self.__ptz.get_latency_mode()
+        if mode is None:
+            return self.error_response('Error getting the latency mode')
+
+        return self.response(Latency(mode=mode).model_dump_json(), 200, headers=headers)
+
+    def put_latency(self):
+        """Set the latency mode according to the json included in request content. The
+        queue limits and the jitter buffer latency change on the running pipeline, the
+        output stream is not interrupted.
+
+        Returns:
+            json: json with the latency mode set, or with an error message.
+        """
+        try:
+            latency = self.parse_request(Latency)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return self.error_response('Error setting the latency mode', error=e)
+
+        if self.__ptz.set_latency_mode(latency.mode) is not True:
+            return self.error_response('Error setting the latency mode')
+
+        data = latency.model_dump_json()
+        logger.info(f'Setting latency mode to {data}')
+        return self.response(data, 200)
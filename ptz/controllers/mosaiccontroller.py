@@ -0,0 +1,125 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for the mosaic output
+"""
+
+from flask import request
+from flask_cors import cross_origin
+from rrmsutils.models.ptz.position import Position
+from rrmsutils.models.ptz.zoom import Zoom
+
+from ptz.controllers.controller import Controller
+from ptz.controllers.serialization import api_response_body
+from ptz.logger import Logger
+from ptz.models.layout import Layout
+from ptz.mosaic import Mosaic
+
+logger = Logger.get_logger()
+
+
+class MosaicController(Controller):
+    """Controller for the mosaic output
+    """
+
+    def __init__(self, mosaic: Mosaic):
+        """Constructor of the Class MosaicController
+
+        Args:
+            mosaic (Mosaic): a Mosaic Class instance
+        """
+        self.__mosaic = mosaic
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/mosaic', 'mosaic',
+                         self.mosaic, methods=['GET', 'PUT', 'DELETE'])
+        app.add_url_rule('/mosaic/tiles/<int:tile>/position', 'mosaic_position',
+                         self.position, methods=['GET', 'PUT'])
+        app.add_url_rule('/mosaic/tiles/<int:tile>/zoom', 'mosaic_zoom',
+                         self.zoom, methods=['GET', 'PUT'])
+
+    @cross_origin()
+    def mosaic(self):
+        """Get, set or stop the mosaic layout
+
+        Returns:
+            json: json with the layout, or json with an error.
+        """
+        if request.method == 'DELETE':
+            if self.__mosaic.stop() is not True:
+                return self.error_response('There is no mosaic running')
+            return self.response(api_response_body('Mosaic stopped', code=0), 200)
+
+        if request.method == 'GET':
+            layout = self.__mosaic.get_layout()
+            if layout is None:
+                return self.error_response('There is no mosaic running')
+            return self.model_response(layout)
+
+        try:
+            layout = self.parse_request(Layout)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return self.error_response('Error setting the mosaic layout', error=e)
+
+        if self.__mosaic.set_layout(layout) is not True:
+            return self.error_response('Error setting the mosaic layout')
+
+        logger.info(f'Setting mosaic layout to {layout}')
+        return self.model_response(layout)
+
+    @cross_origin()
+    def position(self, tile):
+        """Get or set the position of a tile
+
+        Returns:
+            json: json with the tile position, or json with an error.
+        """
+        if request.method == 'GET':
+            position = self.__mosaic.get_position(tile)
+            if position is None:
+                return self.error_response('Error getting tile Position from the pipeline')
+            return self.model_response(position)
+
+        try:
+            position = self.parse_request(Position)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return self.error_response('Error setting tile Position in the pipeline', error=e)
+
+        if self.__mosaic.set_position(tile, position) is not True:
+            return self.error_response('Error setting tile Position in the pipeline')
+        return self.model_response(position)
+
+    @cross_origin()
+    def zoom(self, tile):
+        """Get or set the zoom of a tile
+
+        Returns:
+            json: json with the tile zoom, or json with an error.
+        """
+        if request.method == 'GET':
+            zoom = self.__mosaic.get_zoom(tile)
+            if zoom is None:
+                return self.error_response('Error getting tile Zoom from the pipeline')
+            return self.model_response(zoom)
+
+        try:
+            zoom = self.parse_request(Zoom)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return self.error_response('Error setting tile Zoom in the pipeline', error=e)
+
+        if self.__mosaic.set_zoom(tile, zoom) is not True:
+            return self.error_response('Error setting tile Zoom in the pipeline')
+        return self.model_response(zoom)
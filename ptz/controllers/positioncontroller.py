@@ -13,10 +13,10 @@
 
 from flask import request
 from flask_cors import cross_origin
-from rrmsutils.models.apiresponse import ApiResponse
 from rrmsutils.models.ptz.position import Position
 
 from ptz.controllers.controller import Controller
+from ptz.events import EventHub
 from ptz.logger import Logger
 from ptz.ptz import PTZ
 
@@ -27,13 +27,15 @@ class PositionController(Controller):
     """Controller for PTZ position
     """
 
-    def __init__(self, ptz: PTZ):
+    def __init__(self, ptz: PTZ, events: EventHub = None):
         """Constructor of the Class PositionController
 
         Args:
             ptz (PTZ): a PTZ Class instaance
+            events (EventHub, optional): Hub with the state versions, enables long-polling with ?wait=. Defaults to None.
         """
         self.__ptz = ptz
+        self.__events = events
 
     def add_rules(self, app):
         """Add rules
@@ -56,58 +58,59 @@ class PositionController(Controller):
         if request.method == 'GET':
             return self.get_position()
 
-        data = ApiResponse(
-            code=1, message=f'Method {request.method} not supported').model_dump_json()
-        return self.response(data, 400)
+        return self.error_response(f'Method {request.method} not supported', cache=False)
 
     def get_position(self):
         """Get the current PTZ position
 
+        With ?wait=SECONDS it waits for a change newer than ?version=N before answering.
+
         Returns:
             json: json with the current position, or json with an error if there is an exception.
         """
+        headers = self.wait_for_change(self.__events, ('position',))
 
         set_position_result = self.__ptz.get_position()
 
         if set_position_result is None:
-            response = ApiResponse(
-                code=1, message='Error getting Position from the pipeline')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error getting Position from the pipeline')
 
         try:
             data = set_position_result.model_dump_json()
         except Exception as e:  # pylint: disable=broad-exception-caught
-            response = ApiResponse(
-                code=1, message=f'Error getting Position from the pipeline, error: {repr(e)}')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error getting Position from the pipeline', error=e)
         logger.info(f'Getting Position {data}')
-        return self.response(data, 200)
+        return self.response(data, 200, headers=headers)
 
     def put_position(self):
-        """Set the current position according to the json included in request content
+        """Set the current position according to the json included in request content. With
+        ?frame=N or ?at=RUNNING_TIME_NS the position is scheduled for that frame instead.
 
         Returns:
             json: json with the position to set in the pipeline, or with an error if there is an exception.
         """
-        data = request.json
         try:
-            position = Position.model_validate(data)
+            position = self.parse_request(Position)
         except Exception as e:  # pylint: disable=broad-exception-caught
-            response = ApiResponse(
-                code=1, message=f'Error setting Position in the pipeline, error: {repr(e)}')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error setting Position in the pipeline', error=e)
+
+        frame, running_time = self.scheduled_target()
+        if frame is not None or running_time is not None:
+            command = self.__ptz.schedule_pose(pan=position.pan, tilt=position.tilt,
+                                               frame=frame, running_time=running_time)
+            if command is None:
+                return self.error_response('Error scheduling Position')
+            return self.model_response(command)
 
         set_position_result = self.__ptz.set_position(position)
 
-        if set_position_result is False:
+        if set_position_result is not True:
             logger.error('Error setting position')
-            response = ApiResponse(
-                code=1, message='Error setting Position in the pipeline')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error setting Position in the pipeline')
 
         data = position.model_dump_json()
         logger.info(f'Setting Position to {data}')
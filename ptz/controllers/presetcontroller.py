@@ -0,0 +1,137 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for presets
+"""
+
+from typing import List
+
+from flask import request
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.controllers.serialization import adapter, api_response_body
+from ptz.logger import Logger
+from ptz.models.preset import MAX_TRANSITION, Preset
+from ptz.presets import PresetStore
+from ptz.ptz import PTZ
+
+logger = Logger.get_logger()
+
+
+class PresetController(Controller):
+    """Controller for presets
+    """
+
+    def __init__(self, store: PresetStore, ptz: PTZ):
+        """Constructor of the Class PresetController
+
+        Args:
+            store (PresetStore): Store with the presets
+            ptz (PTZ): a PTZ Class instance
+        """
+        self.__store = store
+        self.__ptz = ptz
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/presets', 'presets',
+                         self.presets, methods=['GET', 'POST'])
+        app.add_url_rule('/presets/<name>', 'preset',
+                         self.preset, methods=['GET', 'DELETE'])
+        app.add_url_rule('/presets/<name>/recall', 'recall_preset',
+                         self.recall, methods=['POST'])
+
+    @cross_origin()
+    def presets(self):
+        """Defines the action based in the type of method in the request
+
+        Returns:
+            method: get or post presets
+        """
+        if request.method == 'POST':
+            return self.post_preset()
+        if request.method == 'GET':
+            return self.get_presets()
+
+        return self.error_response(f'Method {request.method} not supported', cache=False)
+
+    def get_presets(self):
+        """Get all the presets
+
+        Returns:
+            json: json with the list of presets.
+        """
+        return self.response(adapter(List[Preset]).dump_json(self.__store.get_presets()), 200)
+
+    def post_preset(self):
+        """Create or replace a preset according to the json included in request content
+
+        Returns:
+            json: json with the preset saved, or with an error message.
+        """
+        try:
+            preset = self.parse_request(Preset)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return self.error_response('Error saving the preset', error=e)
+
+        if self.__store.put_preset(preset) is False:
+            return self.error_response('Error writing the presets', 500)
+
+        logger.info(f'Saved preset {preset.name}')
+        return self.model_response(preset)
+
+    @cross_origin()
+    def preset(self, name):
+        """Get or delete a preset
+
+        Returns:
+            json: json with the preset, ApiResponse with the result of a deletion, or json with an error.
+        """
+        if request.method == 'DELETE':
+            deleted = self.__store.delete_preset(name)
+            if deleted is None:
+                return self.error_response('Preset not found', 404)
+            if deleted is False:
+                return self.error_response('Error writing the presets', 500)
+
+            logger.info(f'Deleted preset {name}')
+            return self.response(api_response_body('Preset removed', code=0), 200)
+
+        preset = self.__store.get_preset(name)
+        if preset is None:
+            return self.error_response('Preset not found', 404)
+        return self.model_response(preset)
+
+    @cross_origin()
+    def recall(self, name):
+        """Move to a preset. The pose is applied on the next frame, or reached in
+        ?transition=SECONDS easing from the current pose.
+
+        Returns:
+            json: json with the preset recalled, or json with an error.
+        """
+        preset = self.__store.get_preset(name)
+        if preset is None:
+            return self.error_response('Preset not found', 404)
+
+        transition = request.args.get('transition', default=0.0, type=float)
+        if not 0.0 <= transition <= MAX_TRANSITION:
+            return self.error_response(f'The transition must be between 0 and {MAX_TRANSITION} seconds')
+
+        if self.__ptz.recall(preset, transition) is not True:
+            return self.error_response('Error recalling the preset')
+
+        return self.model_response(preset)
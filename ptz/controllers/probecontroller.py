@@ -0,0 +1,66 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for input probing
+"""
+
+from typing import List
+
+from flask import request
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.controllers.serialization import adapter
+from ptz.logger import Logger
+from ptz.models.probe import ProbeRequest, ProbeResult
+from ptz.probe import StreamProber
+
+logger = Logger.get_logger()
+
+
+class ProbeController(Controller):
+    """Controller for input probing
+    """
+
+    def __init__(self, prober: StreamProber):
+        """Constructor of the Class ProbeController
+
+        Args:
+            prober (StreamProber): a StreamProber Class instance
+        """
+        self.__prober = prober
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/streams/probe', 'streams_probe',
+                         self.probe, methods=['POST'])
+
+    @cross_origin()
+    def probe(self):
+        """Probe the given input URIs in parallel. Cached results are reused unless ?refresh=true
+
+        Returns:
+            json: json list with the capabilities of each input, or json with an error.
+        """
+        try:
+            probe_request = self.parse_request(ProbeRequest)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return self.error_response('Error probing the streams', error=e)
+
+        refresh = request.args.get('refresh', 'false').lower() == 'true'
+        results = self.__prober.probe(probe_request.uris, refresh)
+
+        logger.info(f'Probed {len(results)} streams')
+        return self.response(adapter(List[ProbeResult]).dump_json(results), 200)
@@ -0,0 +1,71 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for scheduled commands
+"""
+
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.controllers.serialization import api_response_body
+from ptz.logger import Logger
+from ptz.ptz import PTZ
+
+logger = Logger.get_logger()
+
+
+class ScheduleController(Controller):
+    """Controller for scheduled commands
+    """
+
+    def __init__(self, ptz: PTZ):
+        """Constructor of the Class ScheduleController
+
+        Args:
+            ptz (PTZ): a PTZ Class instance
+        """
+        self.__ptz = ptz
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/schedule', 'schedule',
+                         self.schedule, methods=['GET'])
+        app.add_url_rule('/schedule/<int:command_id>', 'scheduled_command',
+                         self.cancel, methods=['DELETE'])
+
+    @cross_origin()
+    def schedule(self):
+        """Get the current frame and running time of the PTZ element and the pending commands
+
+        Returns:
+            json: json with the schedule, or json with an error.
+        """
+        schedule = self.__ptz.get_schedule()
+        if schedule is None:
+            return self.error_response('Error getting the schedule')
+        return self.model_response(schedule)
+
+    @cross_origin()
+    def cancel(self, command_id):
+        """Cancel a scheduled command
+
+        Returns:
+            json: ApiResponse with the result.
+        """
+        if self.__ptz.cancel_scheduled(command_id) is not True:
+            return self.error_response('Command not found', 404)
+
+        logger.info(f'Cancelled scheduled command {command_id}')
+        return self.response(api_response_body('Command cancelled', code=0), 200)
@@ -0,0 +1,48 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Request and response serialization shared by the controllers
+"""
+
+from functools import lru_cache
+
+from pydantic import TypeAdapter
+from rrmsutils.models.apiresponse import ApiResponse
+
+
+@lru_cache(maxsize=None)
+def adapter(model):
+    """Get the serializer of a type that is not a model, such as List[Model] response bodies.
+    Models are serialized with model_dump_json(), which is faster than an adapter. Adapters
+    are built once per type.
+
+    Args:
+        model (type): type to serialize, for example List[Preset]
+
+    Returns:
+        TypeAdapter: the adapter for the type
+    """
+    return TypeAdapter(model)
+
+
+@lru_cache(maxsize=256)
+def api_response_body(message: str, code: int = 1) -> str:
+    """Get the ApiResponse body for a constant message. The body is formatted
+    once and reused for every request.
+
+    Args:
+        message (str): Response message
+        code (int, optional): ApiResponse code, 1 for errors. Defaults to 1.
+
+    Returns:
+        str: the serialized ApiResponse
+    """
+    return ApiResponse(code=code, message=message).model_dump_json()
@@ -13,11 +13,11 @@
 
 from flask import request
 from flask_cors import cross_origin
-from rrmsutils.models.apiresponse import ApiResponse
-from rrmsutils.models.ptz.stream import Stream
 
 from ptz.controllers.controller import Controller
+from ptz.events import EventHub
 from ptz.logger import Logger
+from ptz.models.stream import Stream
 from ptz.ptz import PTZ
 
 logger = Logger.get_logger()
@@ -27,13 +27,15 @@ class StreamController(Controller):
     """Controller for input stream
     """
 
-    def __init__(self, ptz: PTZ):
+    def __init__(self, ptz: PTZ, events: EventHub = None):
         """Constructor of the Class StreamController
 
         Args:
             ptz (PTZ): a PTZ Class instaance
+            events (EventHub, optional): Hub with the state versions, enables long-polling with ?wait=. Defaults to None.
         """
         self.__ptz = ptz
+        self.__events = events
 
     def add_rules(self, app):
         """Add rules
@@ -43,6 +45,8 @@ class StreamController(Controller):
         """
         app.add_url_rule('/stream', 'stream',
                          self.stream, methods=['GET', 'PUT'])
+        app.add_url_rule('/stream/stats', 'stream_stats',
+                         self.stats, methods=['GET'])
 
     @cross_origin()
     def stream(self):
@@ -56,35 +60,32 @@ class StreamController(Controller):
         if request.method == 'GET':
             return self.get_stream()
 
-        data = ApiResponse(
-            code=1, message=f'Method {request.method} not supported').model_dump_json()
-        return self.response(data, 400)
+        return self.error_response(f'Method {request.method} not supported', cache=False)
 
     def get_stream(self):
         """Get the current stream
 
+        With ?wait=SECONDS it waits for a change newer than ?version=N before answering.
+
         Returns:
             json: json with the current in_uri, out_port, and out_mapping, or json with error if there is an exception.
         """
+        headers = self.wait_for_change(self.__events, ('stream',))
 
         get_stream_result = self.__ptz.get_stream()
 
         if get_stream_result is None:
-            response = ApiResponse(
-                code=1, message='Error getting: in_uri, out_port and out_mapping; in the pipeline')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error getting: in_uri, out_port and out_mapping; in the pipeline')
 
         try:
             data = get_stream_result.model_dump_json()
         except Exception as e:  # pylint: disable=broad-exception-caught
-            response = ApiResponse(
-                code=1, message=f'Error getting: in_uri, out_port and out_mapping; in the pipeline, error: {repr(e)}')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error getting: in_uri, out_port and out_mapping; in the pipeline', error=e)
         logger.info(
             f'Getting: in_uri, port_out and mapping_out: {data}')
-        return self.response(data, 200)
+        return self.response(data, 200, headers=headers)
 
     def put_stream(self):
         """Set the current stream according to the json included in request content
@@ -92,28 +93,34 @@ class StreamController(Controller):
         Returns:
             json: json with the in_uri, out_port, and out_mapping to set in the pipeline, or json with error if there is an exception.
         """
-        data = request.json
-
         try:
-            stream = Stream.model_validate(data)
+            stream = self.parse_request(Stream)
         except Exception as e:  # pylint: disable=broad-exception-caught
-            response = ApiResponse(
-                code=1, message=f'Error setting the in_uri, out_por and out_mapping, error: {repr(e)}')
-            data = response.model_dump_json()
             logger.error(
                 f'Error setting the in_uri, out_por and out_mapping, error: {repr(e)}')
-            return self.response(data, 400)
+            return self.error_response(
+                'Error setting the in_uri, out_por and out_mapping', error=e)
 
         set_stream_result = self.__ptz.set_stream(stream)
 
-        if set_stream_result is False:
+        if set_stream_result is not True:
             logger.error(
                 'Error setting the in_uri, out_por and out_mapping')
-            response = ApiResponse(
-                code=1, message='Error settin in_uri, out_port, out_mapping')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error settin in_uri, out_port, out_mapping')
 
         data = stream.model_dump_json()
         logger.info(f'Setting in_uri, out_port, out_mapping to {data}')
         return self.response(data, 200)
+
+    @cross_origin()
+    def stats(self):
+        """Get the RTP statistics of the input, its transport and the jitter buffer latency
+
+        Returns:
+            json: json with the input statistics, or json with an error.
+        """
+        stats = self.__ptz.get_input_stats()
+        if stats is None:
+            return self.error_response('Error getting the input statistics')
+        return self.model_response(stats)
@@ -0,0 +1,110 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for preset tours
+"""
+
+from flask import request
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.controllers.serialization import api_response_body
+from ptz.logger import Logger
+from ptz.models.preset import Tour
+from ptz.presets import PresetStore
+from ptz.ptz import PTZ
+
+logger = Logger.get_logger()
+
+
+class TourController(Controller):
+    """Controller for preset tours
+    """
+
+    def __init__(self, store: PresetStore, ptz: PTZ):
+        """Constructor of the Class TourController
+
+        Args:
+            store (PresetStore): Store with the presets
+            ptz (PTZ): a PTZ Class instance
+        """
+        self.__store = store
+        self.__ptz = ptz
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/tour', 'tour',
+                         self.tour, methods=['GET', 'PUT', 'DELETE'])
+
+    @cross_origin()
+    def tour(self):
+        """Defines the action based in the type of method in the request
+
+        Returns:
+            method: get, put or delete the tour
+        """
+        if request.method == 'PUT':
+            return self.put_tour()
+        if request.method == 'DELETE':
+            return self.delete_tour()
+        if request.method == 'GET':
+            return self.get_tour()
+
+        return self.error_response(f'Method {request.method} not supported', cache=False)
+
+    def get_tour(self):
+        """Get the current tour and the preset it is on
+
+        Returns:
+            json: json with the tour status, or json with an error.
+        """
+        status = self.__ptz.get_tour()
+        if status is None:
+            return self.error_response('Error getting the tour')
+        return self.model_response(status)
+
+    def put_tour(self):
+        """Start a tour according to the json included in request content, replacing the
+        current one. The presets are resolved when the tour starts, later changes to them
+        don't affect it.
+
+        Returns:
+            json: json with the tour status, or with an error message.
+        """
+        try:
+            tour = self.parse_request(Tour)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            return self.error_response('Error starting the tour', error=e)
+
+        presets = [self.__store.get_preset(name) for name in tour.presets]
+        missing = [name for name, preset in zip(tour.presets, presets) if preset is None]
+        if missing:
+            return self.error_response(f'Presets not found: {", ".join(missing)}', 404,
+                                       cache=False)
+
+        if self.__ptz.start_tour(tour, presets) is not True:
+            return self.error_response('Error starting the tour')
+
+        return self.get_tour()
+
+    def delete_tour(self):
+        """Stop the current tour
+
+        Returns:
+            json: ApiResponse with the result.
+        """
+        if self.__ptz.stop_tour() is not True:
+            return self.error_response('There is no tour running', 404)
+        return self.response(api_response_body('Tour stopped', code=0), 200)
@@ -0,0 +1,83 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Controller for WebRTC signaling
+"""
+
+from flask import request
+from flask_cors import cross_origin
+
+from ptz.controllers.controller import Controller
+from ptz.controllers.serialization import api_response_body
+from ptz.logger import Logger
+from ptz.ptz import PTZ
+
+logger = Logger.get_logger()
+
+
+class WebRTCController(Controller):
+    """Controller for WebRTC signaling
+    """
+
+    def __init__(self, ptz: PTZ):
+        """Constructor of the Class WebRTCController
+
+        Args:
+            ptz (PTZ): a PTZ Class instance
+        """
+        self.__ptz = ptz
+
+    def add_rules(self, app):
+        """Add rules
+
+        Args:
+            app (Flask): Flask application
+        """
+        app.add_url_rule('/webrtc', 'webrtc',
+                         self.add_peer, methods=['POST'])
+        app.add_url_rule('/webrtc/<peer_id>', 'webrtc_peer',
+                         self.remove_peer, methods=['DELETE'])
+
+    @cross_origin(expose_headers=['Location'])
+    def add_peer(self):
+        """Add a WebRTC peer, WHEP style: the body is the SDP offer of the peer and the
+        response is the complete SDP answer, with the peer resource in Location.
+
+        Returns:
+            application/sdp: the SDP answer, or json with an error.
+        """
+        if request.mimetype != 'application/sdp':
+            return self.error_response('The offer must be sent as application/sdp', code=415)
+
+        result = self.__ptz.add_webrtc_peer(request.get_data(as_text=True))
+        if result is None:
+            return self.error_response('Error adding the WebRTC peer')
+
+        peer_id, answer = result
+        logger.info(f'Added WebRTC peer {peer_id}')
+        return self.response(answer, 201, mimetype='application/sdp',
+                             headers={'Location': f'/webrtc/{peer_id}'})
+
+    @cross_origin()
+    def remove_peer(self, peer_id):
+        """Remove a WebRTC peer
+
+        Args:
+            peer_id (str): Id of the peer, from the Location of its answer
+
+        Returns:
+            json: json with the result.
+        """
+        if self.__ptz.remove_webrtc_peer(peer_id) is not True:
+            return self.error_response('Peer not found', 404)
+
+        logger.info(f'Removed WebRTC peer {peer_id}')
+        return self.response(api_response_body('Peer removed', code=0), 200)
@@ -13,10 +13,10 @@
 
 from flask import request
 from flask_cors import cross_origin
-from rrmsutils.models.apiresponse import ApiResponse
 from rrmsutils.models.ptz.zoom import Zoom
 
 from ptz.controllers.controller import Controller
+from ptz.events import EventHub
 from ptz.logger import Logger
 from ptz.ptz import PTZ
 
@@ -27,13 +27,15 @@ class ZoomController(Controller):
     """Controller for Zoom
     """
 
-    def __init__(self, ptz: PTZ):
+    def __init__(self, ptz: PTZ, events: EventHub = None):
         """Constructor of the Class ZoomController
 
         Args:
             ptz (PTZ): a PTZ Class instaance
+            events (EventHub, optional): Hub with the state versions, enables long-polling with ?wait=. Defaults to None.
         """
         self.__ptz = ptz
+        self.__events = events
 
     def add_rules(self, app):
         """Add rules
@@ -56,58 +58,59 @@ class ZoomController(Controller):
         if request.method == 'GET':
             return self.get_zoom()
 
-        data = ApiResponse(
-            code=1, message=f'Method {request.method} not supported').model_dump_json()
-        return self.response(data, 400)
+        return self.error_response(f'Method {request.method} not supported', cache=False)
 
     def get_zoom(self):
         """Get the current Zoom
 
+        With ?wait=SECONDS it waits for a change newer than ?version=N before answering.
+
         Returns:
             json: json with the current zoom, or json with an error if there is an exception.
         """
+        headers = self.wait_for_change(self.__events, ('zoom',))
 
         get_zoom_result = self.__ptz.get_zoom()
 
         if get_zoom_result is None:
-            response = ApiResponse(
-                code=1, message='Error getting Zoom in the pipeline')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error getting Zoom in the pipeline')
 
         try:
             data = get_zoom_result.model_dump_json()
         except Exception as e:  # pylint: disable=broad-exception-caught
-            response = ApiResponse(
-                code=1, message=f'Error getting Zoom from the pipeline, error: {repr(e)}')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error getting Zoom from the pipeline', error=e)
         logger.info(f'Getting Zomm {data}')
-        return self.response(data, 200)
+        return self.response(data, 200, headers=headers)
 
     def put_zoom(self):
-        """Set the current Zoom according to the json included in request content
+        """Set the current Zoom according to the json included in request content. With
+        ?frame=N or ?at=RUNNING_TIME_NS the zoom is scheduled for that frame instead.
 
         Returns:
             json : json with the zoom to set in the pipeline, or with an error message.
         """
-        data = request.json
         try:
-            zoom = Zoom.model_validate(data)
+            zoom = self.parse_request(Zoom)
         except Exception as e:  # pylint: disable=broad-exception-caught
-            response = ApiResponse(
-                code=1, message=f'Error setting Zoom, error: {repr(e)}')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error setting Zoom', error=e)
+
+        frame, running_time = self.scheduled_target()
+        if frame is not None or running_time is not None:
+            command = self.__ptz.schedule_pose(zoom=zoom.zoom,
+                                               frame=frame, running_time=running_time)
+            if command is None:
+                return self.error_response('Error scheduling Zoom')
+            return self.model_response(command)
 
         set_zoom_result = self.__ptz.set_zoom(zoom)
 
-        if set_zoom_result is False:
+        if set_zoom_result is not True:
             logger.error('Error setting zoom')
-            response = ApiResponse(
-                code=1, message='Error setting Zoom in the pipeline')
-            data = response.model_dump_json()
-            return self.response(data, 400)
+            return self.error_response(
+                'Error setting Zoom in the pipeline')
 
         data = zoom.model_dump_json()
         logger.info(f'Setting Zoom to {data}')
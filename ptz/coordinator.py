@@ -0,0 +1,244 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class Coordinator
+"""
+
+import time
+import uuid
+from threading import Lock, Thread
+
+import requests
+
+from ptz.logger import Logger
+from ptz.models.node import Node
+from ptz.models.session import Session
+from ptz.models.stream import Stream
+
+logger = Logger.get_logger()
+
+
+class Coordinator():
+    """Class Coordinator, keeps track of the PTZ service nodes and places PTZ sessions on them.
+    """
+
+    def __init__(self, heartbeat_timeout: float = 10.0, request_timeout: float = 5.0):
+        """Coordinator object. Nodes register themselves periodically with their capacity and
+        current load. A node runs a single pipeline, so it takes at most one session: capacity is 1,
+        or 0 for a node that takes none. New sessions are placed on the free node with the lowest
+        load. Sessions of a node that stops sending heartbeats are moved to a free node, or removed
+        if there is none.
+
+        Args:
+            heartbeat_timeout (float, optional): Seconds without a heartbeat after which a node is considered dead. Defaults to 10.0.
+            request_timeout (float, optional): Timeout in seconds of the requests sent to the nodes. Defaults to 5.0.
+        """
+        self.__heartbeat_timeout = heartbeat_timeout
+        self.__request_timeout = request_timeout
+        self.__lock = Lock()
+        self.__nodes = {}
+        self.__last_seen = {}
+        self.__sessions = {}
+        Thread(target=self.__watch_nodes, daemon=True).start()
+
+    def __is_alive(self, node_id, now):
+        return now - self.__last_seen[node_id] < self.__heartbeat_timeout
+
+    def __count_sessions(self, node_id):
+        return sum(1 for session in self.__sessions.values() if session.node == node_id)
+
+    def __describe(self, node_id, now):
+        return self.__nodes[node_id].model_copy(update={
+            'sessions': self.__count_sessions(node_id),
+            'alive': self.__is_alive(node_id, now)})
+
+    def register(self, node_id: str, node: Node):
+        """Register a node or refresh its heartbeat
+
+        Args:
+            node_id (str): Unique identifier of the node
+            node (Node): Node information: URL, capacity and current load
+
+        Returns:
+            Node: the node as seen by the coordinator
+        """
+        with self.__lock:
+            if node_id not in self.__nodes:
+                logger.info(f'Registering node {node_id} at {node.url}')
+            now = time.monotonic()
+            self.__nodes[node_id] = node
+            self.__last_seen[node_id] = now
+            return self.__describe(node_id, now)
+
+    def unregister(self, node_id: str):
+        """Remove a node and the sessions placed on it
+
+        Args:
+            node_id (str): Unique identifier of the node
+
+        Returns:
+            True or False: True if the node was removed, False if it wasn't registered
+        """
+        with self.__lock:
+            if node_id not in self.__nodes:
+                return False
+
+            del self.__nodes[node_id]
+            del self.__last_seen[node_id]
+            for session_id in [session_id for session_id, session in self.__sessions.items()
+                               if session.node == node_id]:
+                del self.__sessions[session_id]
+
+        logger.info(f'Unregistered node {node_id}')
+        return True
+
+    def get_nodes(self):
+        """Get the registered nodes
+
+        Returns:
+            dict: node identifiers mapped to Node objects
+        """
+        with self.__lock:
+            now = time.monotonic()
+            return {node_id: self.__describe(node_id, now) for node_id in self.__nodes}
+
+    def __candidates(self):
+        now = time.monotonic()
+        candidates = []
+        for node_id, node in self.__nodes.items():
+            sessions = self.__count_sessions(node_id)
+            if not self.__is_alive(node_id, now) or sessions >= node.capacity:
+                continue
+            candidates.append((sessions / node.capacity, node.load, node_id))
+
+        return [node_id for _, _, node_id in sorted(candidates)]
+
+    def create_session(self, stream: Stream):
+        """Place a new session on the least loaded free node and set its stream
+
+        Args:
+            stream (Stream): Stream to be set in the selected node
+
+        Returns:
+            Session, None: the created session, None if no node could take it.
+        """
+        session = self.__place(uuid.uuid4().hex, stream)
+        if session is None:
+            logger.error('There is no node available for the session')
+        return session
+
+    def __place(self, session_id, stream):
+        with self.__lock:
+            candidates = self.__candidates()
+            # Reserve the slot before releasing the lock so that concurrent
+            # placements don't pick the same node.
+            if candidates:
+                self.__sessions[session_id] = Session(
+                    id=session_id, node=candidates[0], url=self.__nodes[candidates[0]].url, stream=stream)
+
+        for node_id in candidates:
+            with self.__lock:
+                if node_id not in self.__nodes:
+                    continue
+                session = Session(id=session_id, node=node_id,
+                                  url=self.__nodes[node_id].url, stream=stream)
+                self.__sessions[session_id] = session
+
+            result = self.__request(session.url, 'PUT', 'stream', stream.model_dump_json())
+            if result is not None and result[1] == 200:
+                logger.info(f'Placed session {session_id} on node {node_id}')
+                return session
+
+            logger.warning(f'Node {node_id} rejected session {session_id}')
+
+        with self.__lock:
+            self.__sessions.pop(session_id, None)
+        return None
+
+    def __watch_nodes(self):
+        while True:
+            time.sleep(self.__heartbeat_timeout / 2)
+            with self.__lock:
+                now = time.monotonic()
+                orphans = [session for session in self.__sessions.values()
+                           if not self.__is_alive(session.node, now)]
+
+            for session in orphans:
+                with self.__lock:
+                    # It may have been deleted in the meantime
+                    if self.__sessions.get(session.id) is not session:
+                        continue
+                logger.warning(f'Node {session.node} stopped sending heartbeats, moving session {session.id}')
+                if self.__place(session.id, session.stream) is None:
+                    logger.error(f'There is no node to move session {session.id} to, removing it')
+
+    def get_session(self, session_id: str):
+        """Get a session
+
+        Args:
+            session_id (str): Session identifier
+
+        Returns:
+            Session, None: the session, None if it doesn't exist.
+        """
+        with self.__lock:
+            return self.__sessions.get(session_id)
+
+    def get_sessions(self):
+        """Get all the sessions
+
+        Returns:
+            list: list of Session objects
+        """
+        with self.__lock:
+            return list(self.__sessions.values())
+
+    def delete_session(self, session_id: str):
+        """Remove a session, freeing its slot in the owning node
+
+        Args:
+            session_id (str): Session identifier
+
+        Returns:
+            True or False: True if the session was removed, False if it doesn't exist
+        """
+        with self.__lock:
+            return self.__sessions.pop(session_id, None) is not None
+
+    def __request(self, url, method, resource, data=None):
+        try:
+            response = requests.request(method, f'{url}/{resource}', data=data,
+                                        headers={'Content-Type': 'application/json'},
+                                        timeout=self.__request_timeout)
+        except requests.RequestException as e:
+            logger.error(f'Error sending {method} /{resource} to {url}: {repr(e)}')
+            return None
+
+        return response.content, response.status_code
+
+    def forward(self, session_id: str, method: str, resource: str, data=None):
+        """Forward a control request to the node that owns the session
+
+        Args:
+            session_id (str): Session identifier
+            method (str): HTTP method
+            resource (str): Node resource, for example 'position'
+            data (bytes, optional): Request body. Defaults to None.
+
+        Returns:
+            tuple, None: (content, status code) of the node response, None if the session doesn't exist or the node didn't answer.
+        """
+        session = self.get_session(session_id)
+        if session is None:
+            logger.warning(f'There is no session {session_id}')
+            return None
+
+        return self.__request(session.url, method, resource, data)
@@ -0,0 +1,330 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""CPU PTZ element
+"""
+
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+import numpy as np
+
+from ptz import media
+from ptz.logger import Logger
+
+logger = Logger.get_logger()
+
+ELEMENT_NAME = 'rrpanoramaptzcpu'
+
+# Poses are quantized to these steps to key the remap cache
+PAN_STEP = 0.05
+TILT_STEP = 0.05
+ZOOM_STEP = 0.01
+
+
+class RemapCache():
+    """Class RemapCache, builds and caches the equirectangular to rectilinear remap tables.
+    """
+
+    def __init__(self, capacity: int = 32, base_capacity: int = 16):
+        """RemapCache object. A remap table holds, for each output pixel, the index of the input
+        pixel it samples. Tables are kept in an LRU keyed by the quantized pose and sizes.
+
+        Building a table is done in two steps: the input longitude (in input columns) and row
+        of each output pixel are computed for pan 0 and kept in a second LRU keyed by tilt and
+        zoom. Since pan is a rotation around the vertical axis, the table for any pan is that
+        base plus a column offset, so moving the camera horizontally only costs an add and a
+        modulo per pixel instead of the full trigonometry.
+
+        Args:
+            capacity (int, optional): Maximum number of remap tables kept. Defaults to 32.
+            base_capacity (int, optional): Maximum number of pan 0 bases kept. Defaults to 16.
+        """
+        self.__capacity = capacity
+        self.__base_capacity = base_capacity
+        self.__tables = OrderedDict()
+        self.__bases = OrderedDict()
+        self.__lock = Lock()
+
+    @staticmethod
+    def __lru_get(cache, key):
+        value = cache.get(key)
+        if value is not None:
+            cache.move_to_end(key)
+        return value
+
+    @staticmethod
+    def __lru_put(cache, key, value, capacity):
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > capacity:
+            cache.popitem(last=False)
+
+    @staticmethod
+    def build_base(tilt: float, zoom: float, out_size: tuple, in_size: tuple):
+        """Compute the input column (as float) and row sampled by each output pixel for pan 0
+
+        Args:
+            tilt (float): Tilt in degrees, positive looks up
+            zoom (float): Zoom, 1.0 is a 90 degrees horizontal field of view
+            out_size (tuple): Output (width, height)
+            in_size (tuple): Input (width, height)
+
+        Returns:
+            tuple: (columns, rows) arrays of shape (height, width)
+        """
+        out_width, out_height = out_size
+        in_width, in_height = in_size
+        focal = zoom * out_width / 2.0
+
+        x = (np.arange(out_width, dtype=np.float32) + 0.5 - out_width / 2.0) / focal
+        y = (np.arange(out_height, dtype=np.float32) + 0.5 - out_height / 2.0) / focal
+        x, y = np.meshgrid(x, y)
+
+        # Rotate the rays (x right, y down, z forward) around the x axis by the tilt
+        angle = math.radians(tilt)
+        cos_t, sin_t = math.cos(angle), math.sin(angle)
+        y_rot = y * cos_t - sin_t
+        z_rot = y * sin_t + cos_t
+
+        longitude = np.arctan2(x, z_rot)
+        latitude = np.arctan2(-y_rot, np.hypot(x, z_rot))
+
+        columns = (longitude / (2 * math.pi) + 0.5) * in_width
+        rows = np.clip(((0.5 - latitude / math.pi) * in_height).astype(np.int32), 0, in_height - 1)
+        return columns.astype(np.float32), rows
+
+    def get(self, pan: float, tilt: float, zoom: float, out_size: tuple, in_size: tuple):
+        """Get the remap table for a pose
+
+        Args:
+            pan (float): Pan in degrees, positive looks right
+            tilt (float): Tilt in degrees, positive looks up
+            zoom (float): Zoom, 1.0 is a 90 degrees horizontal field of view
+            out_size (tuple): Output (width, height)
+            in_size (tuple): Input (width, height)
+
+        Returns:
+            numpy.ndarray: int32 array of shape (height, width) with input pixel indices
+        """
+        pan_q = round(pan / PAN_STEP)
+        tilt_q = round(tilt / TILT_STEP)
+        zoom_q = max(round(zoom / ZOOM_STEP), 1)
+        key = (pan_q, tilt_q, zoom_q, out_size, in_size)
+
+        with self.__lock:
+            table = self.__lru_get(self.__tables, key)
+            if table is not None:
+                return table
+            base = self.__lru_get(self.__bases, key[1:])
+
+        if base is None:
+            base = self.build_base(tilt_q * TILT_STEP, zoom_q * ZOOM_STEP, out_size, in_size)
+
+        in_width = in_size[0]
+        columns, rows = base
+        # Keep the shift in [0, in_width) so the columns stay positive and truncate as floor
+        shift = (pan_q * PAN_STEP / 360.0) % 1.0 * in_width
+        table = np.mod((columns + shift).astype(np.int32), in_width)
+        table += rows * in_width
+
+        with self.__lock:
+            self.__lru_put(self.__bases, key[1:], base, self.__base_capacity)
+            self.__lru_put(self.__tables, key, table, self.__capacity)
+        return table
+
+
+class Remapper():
+    """Class Remapper, applies remap tables to RGBA frames in parallel horizontal bands.
+    """
+
+    def __init__(self, threads: int = 4, cache: RemapCache = None):
+        """Remapper object
+
+        Args:
+            threads (int, optional): Number of bands processed in parallel. Defaults to 4.
+            cache (RemapCache, optional): Remap table cache. Defaults to a new cache.
+        """
+        self.__threads = max(threads, 1)
+        self.__cache = RemapCache() if cache is None else cache
+        self.__executor = ThreadPoolExecutor(max_workers=self.__threads,
+                                             thread_name_prefix='cpuptz')
+
+    def remap(self, source, destination, pan: float, tilt: float, zoom: float):
+        """Render the PTZ view of an equirectangular frame
+
+        Args:
+            source (numpy.ndarray): uint32 array of shape (height, width), one RGBA pixel per element
+            destination (numpy.ndarray): uint32 array of shape (height, width) to write the view to
+            pan (float): Pan in degrees
+            tilt (float): Tilt in degrees
+            zoom (float): Zoom
+        """
+        in_size = (source.shape[1], source.shape[0])
+        out_size = (destination.shape[1], destination.shape[0])
+        table = self.__cache.get(pan, tilt, zoom, out_size, in_size)
+        pixels = source.reshape(-1)
+
+        bands = np.array_split(np.arange(out_size[1]), self.__threads)
+
+        # numpy releases the GIL while taking, so bands run concurrently
+        def band(rows):
+            if len(rows):
+                np.take(pixels, table[rows[0]:rows[-1] + 1],
+                        out=destination[rows[0]:rows[-1] + 1])
+
+        list(self.__executor.map(band, bands))
+
+    def shutdown(self):
+        """Stop the band threads
+        """
+        self.__executor.shutdown(wait=True)
+
+
+_registered = False
+_register_lock = Lock()
+
+
+def register():
+    """Register the rrpanoramaptzcpu element in GStreamer. Safe to call several times.
+
+    The element takes RGBA equirectangular frames and outputs the RGBA rectilinear view
+    with the size negotiated downstream. It has the same pan, tilt and zoom properties as
+    rrpanoramaptz.
+    """
+    global _registered  # pylint: disable=global-statement
+
+    with _register_lock:
+        if _registered:
+            return
+
+        media.init()
+        _register()
+        _registered = True
+
+
+def _register():
+    # pylint: disable=import-outside-toplevel,too-many-locals
+    import gi
+    gi.require_version('GstBase', '1.0')
+    gi.require_version('GstVideo', '1.0')
+    from gi.repository import GObject, GstBase, GstVideo
+
+    Gst = media.Gst  # pylint: disable=invalid-name
+    caps = Gst.Caps.from_string(
+        'video/x-raw,format=RGBA,width=[1,32767],height=[1,32767],framerate=[0/1,2147483647/1]')
+
+    class PanoramaPTZCpu(GstBase.BaseTransform):
+        """Equirectangular to rectilinear PTZ on CPU"""
+
+        __gstmetadata__ = ('Panorama PTZ (CPU)', 'Filter/Effect/Video',
+                           'Pan, tilt and zoom over an equirectangular video on CPU', 'RidgeRun')
+        __gsttemplates__ = (Gst.PadTemplate.new('src', Gst.PadDirection.SRC, Gst.PadPresence.ALWAYS, caps),
+                            Gst.PadTemplate.new('sink', Gst.PadDirection.SINK, Gst.PadPresence.ALWAYS, caps))
+        __gproperties__ = {
+            'pan': (float, 'Pan', 'Pan in degrees', -360.0, 360.0, 0.0, GObject.ParamFlags.READWRITE),
+            'tilt': (float, 'Tilt', 'Tilt in degrees', -180.0, 180.0, 0.0, GObject.ParamFlags.READWRITE),
+            'zoom': (float, 'Zoom', 'Zoom, 1.0 is a 90 degrees field of view', 0.01, 100.0, 1.0,
+                     GObject.ParamFlags.READWRITE),
+            'threads': (int, 'Threads', 'Number of bands processed in parallel, read when the element starts', 1, 64, 4,
+                        GObject.ParamFlags.READWRITE),
+        }
+
+        def __init__(self):
+            super().__init__()
+            self.pan = 0.0
+            self.tilt = 0.0
+            self.zoom = 1.0
+            self.threads = 4
+            self.remapper = None
+            self.in_info = None
+            self.out_info = None
+
+        def do_get_property(self, prop):
+            return getattr(self, prop.name)
+
+        def do_set_property(self, prop, value):
+            setattr(self, prop.name, value)
+
+        def do_transform_caps(self, direction, caps, filter_):  # pylint: disable=unused-argument
+            result = Gst.Caps.new_empty()
+            for i in range(caps.get_size()):
+                structure = caps.get_structure(i).copy()
+                structure.set_value('width', Gst.IntRange(range(1, 32768)))
+                structure.set_value('height', Gst.IntRange(range(1, 32768)))
+                structure.remove_field('pixel-aspect-ratio')
+                result.append_structure(structure)
+
+            if filter_:
+                result = filter_.intersect(result, Gst.CapsIntersectMode.FIRST)
+            return result
+
+        def do_set_caps(self, incaps, outcaps):
+            self.in_info = GstVideo.VideoInfo.new_from_caps(incaps)
+            self.out_info = GstVideo.VideoInfo.new_from_caps(outcaps)
+            # Caps change at runtime with the level of detail. The tables are keyed by the
+            # sizes, so the remapper and its cache are kept and only the new tables are built
+            if self.remapper is None:
+                self.remapper = Remapper(threads=self.threads)
+            return True
+
+        def do_stop(self):
+            if self.remapper is not None:
+                self.remapper.shutdown()
+                self.remapper = None
+            return True
+
+        def do_transform_size(self, direction, caps, size, othercaps):  # pylint: disable=unused-argument
+            return True, GstVideo.VideoInfo.new_from_caps(othercaps).size
+
+        @staticmethod
+        def frame_array(data, info):
+            stride = info.stride[0]
+            rows = np.ndarray((info.height, stride // 4), dtype=np.uint32, buffer=data)
+            return rows[:, :info.width]
+
+        def do_transform(self, inbuf, outbuf):
+            success, inmap = inbuf.map(Gst.MapFlags.READ)
+            if not success:
+                return Gst.FlowReturn.ERROR
+            success, outmap = outbuf.map(Gst.MapFlags.WRITE)
+            if not success:
+                inbuf.unmap(inmap)
+                return Gst.FlowReturn.ERROR
+
+            copy = None
+            try:
+                source = self.frame_array(inmap.data, self.in_info)
+                if not source.flags.c_contiguous:
+                    # Rows are padded to the stride, the tables index packed rows
+                    source = np.ascontiguousarray(source)
+                destination = self.frame_array(outmap.data, self.out_info)
+                if not destination.flags.writeable:
+                    # Older bindings map buffers as read-only bytes
+                    copy = np.empty((self.out_info.height, self.out_info.stride[0] // 4), dtype=np.uint32)
+                    destination = copy[:, :self.out_info.width]
+                self.remapper.remap(source, destination, self.pan, self.tilt, self.zoom)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error(f'Error in {ELEMENT_NAME}: {e}')
+                return Gst.FlowReturn.ERROR
+            finally:
+                outbuf.unmap(outmap)
+                inbuf.unmap(inmap)
+
+            if copy is not None:
+                outbuf.fill(0, copy.tobytes())
+            return Gst.FlowReturn.OK
+
+    GObject.type_register(PanoramaPTZCpu)
+    Gst.Element.register(None, ELEMENT_NAME, Gst.Rank.NONE, PanoramaPTZCpu)
+    logger.info(f'Registered {ELEMENT_NAME}')
@@ -0,0 +1,112 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class EventHub
+"""
+
+import json
+from threading import Condition
+
+
+class EventHub():
+    """Class EventHub, keeps the latest state of each kind of event (position, zoom, stream,
+    pipeline) with a version counter, and wakes up the observers waiting for changes.
+    """
+
+    def __init__(self):
+        """EventHub object. Observers block in wait() until the version moves past the one
+        they saw last, so idle observers don't cost anything. Publishing only stores the
+        state: it is encoded when an observer asks for it, once per change, and the encoded
+        event is shared by all the observers.
+        """
+        self.__condition = Condition()
+        self.__version = 0
+        self.__states = {}
+        self.__encoded = {}
+
+    def publish(self, kind: str, data: dict):
+        """Publish a state change
+
+        Args:
+            kind (str): Kind of state, for example 'position'
+            data (dict): The new state, it must be JSON serializable and not be modified afterwards
+        """
+        with self.__condition:
+            self.__version += 1
+            self.__states[kind] = (self.__version, data)
+            self.__condition.notify_all()
+
+    def get_version(self):
+        """Get the current version
+
+        Returns:
+            int: the version counter, incremented on every change
+        """
+        return self.__version
+
+    def __latest(self, kinds):
+        if kinds is None:
+            return self.__version
+        return max((self.__states[kind][0] for kind in kinds if kind in self.__states), default=0)
+
+    def wait(self, since: int, timeout: float, kinds=None):
+        """Wait until there is a change newer than a version
+
+        Args:
+            since (int): Last version seen by the observer
+            timeout (float): Maximum time to wait in seconds
+            kinds (iterable, optional): Only wait for changes of these kinds. Defaults to None (any kind).
+
+        Returns:
+            int: the current version, equal to since on timeout.
+        """
+        with self.__condition:
+            self.__condition.wait_for(lambda: self.__latest(kinds) > since, timeout)
+            return self.__version if self.__latest(kinds) > since else since
+
+    def states(self, since: int, kinds=None):
+        """Get the states changed after a version. Only the latest state of each kind is
+        returned, so intermediate changes are coalesced.
+
+        Args:
+            since (int): Last version seen by the observer
+            kinds (iterable, optional): Only report these kinds. Defaults to None (all kinds).
+
+        Returns:
+            tuple: (version, changes) the current version and a list of (kind, version, data).
+        """
+        with self.__condition:
+            return self.__version, [(kind, changed, data) for kind, (changed, data) in self.__states.items()
+                                    if changed > since and (kinds is None or kind in kinds)]
+
+    def __encode(self, kind, changed, data):
+        encoded = self.__encoded.get(kind)
+        if encoded is not None and encoded[0] == changed:
+            return encoded[1]
+
+        event = f'id: {changed}\nevent: {kind}\ndata: {json.dumps(data)}\n\n'.encode()
+        # Concurrent observers may encode the same change, either result is the same
+        self.__encoded[kind] = (changed, event)
+        return event
+
+    def changes(self, since: int, kinds=None):
+        """Get the encoded Server-Sent Events for the states changed after a version. Only the
+        latest state of each kind is returned, so intermediate changes are coalesced.
+
+        Args:
+            since (int): Last version seen by the observer
+            kinds (iterable, optional): Only report these kinds. Defaults to None (all kinds).
+
+        Returns:
+            tuple: (version, events) the current version and the concatenated events as bytes, empty if nothing changed.
+        """
+        version, states = self.states(since, kinds)
+        return version, b''.join(self.__encode(*state) for state in states)
@@ -0,0 +1,139 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class PoseHistory
+"""
+
+import math
+import time
+from array import array
+from threading import Lock
+
+# Values of a sample: time, pan, tilt and zoom
+FIELDS = 4
+
+
+class PoseHistory():
+    """Class PoseHistory, fixed-capacity ring buffer with the poses applied to the PTZ.
+    """
+
+    def __init__(self, capacity: int = 100000):
+        """PoseHistory object. Samples are stored in a flat array of doubles, so recording
+        a pose doesn't create any Python object, and the queries operate on a NumPy view of
+        it. Once full, the oldest samples are overwritten.
+
+        Args:
+            capacity (int, optional): Maximum number of samples kept. Defaults to 100000.
+        """
+        self.__capacity = capacity
+        self.__samples = array('d', bytes(8 * FIELDS * capacity))
+        self.__written = 0
+        self.__lock = Lock()
+
+    def record(self, pan: float = None, tilt: float = None, zoom: float = None):
+        """Record a pose at the current time. Unknown values are stored as NaN
+
+        Args:
+            pan (float, optional): Pan in degrees. Defaults to None.
+            tilt (float, optional): Tilt in degrees. Defaults to None.
+            zoom (float, optional): Zoom. Defaults to None.
+        """
+        now = time.time()
+        with self.__lock:
+            offset = (self.__written % self.__capacity) * FIELDS
+            samples = self.__samples
+            samples[offset] = now
+            samples[offset + 1] = math.nan if pan is None else pan
+            samples[offset + 2] = math.nan if tilt is None else tilt
+            samples[offset + 3] = math.nan if zoom is None else zoom
+            self.__written += 1
+
+    def __range(self, start, end):
+        # pylint: disable=import-outside-toplevel
+        import numpy as np
+
+        with self.__lock:
+            stored = np.frombuffer(self.__samples, dtype=np.float64).reshape(-1, FIELDS)
+            count = min(self.__written, self.__capacity)
+            first = self.__written % self.__capacity if self.__written > self.__capacity else 0
+            # Copied in chronological order so that recording can go on while querying
+            samples = np.concatenate((stored[first:count], stored[:first]))
+
+        times = samples[:, 0]
+        lower = 0
+        if start is not None:
+            # The pose active at start was set by the last sample before it
+            lower = max(np.searchsorted(times, start, side='right') - 1, 0)
+        upper = len(times) if end is None else np.searchsorted(times, end, side='right')
+        return samples[lower:upper]
+
+    def query(self, start: float = None, end: float = None, points: int = 500):
+        """Get the poses recorded in a time range, downsampled to at most the given number
+        of points. The range is split in equal time buckets and the last pose of each one is
+        kept, so the result follows the pose that was active at each time.
+
+        Args:
+            start (float, optional): Start of the range, seconds since the epoch. Defaults to the oldest sample.
+            end (float, optional): End of the range, seconds since the epoch. Defaults to the newest sample.
+            points (int, optional): Maximum number of samples returned. Defaults to 500.
+
+        Returns:
+            tuple: (samples, total), samples is a (N, 4) array of time, pan, tilt and zoom
+            and total the number of samples in the range before downsampling.
+        """
+        # pylint: disable=import-outside-toplevel
+        import numpy as np
+
+        samples = self.__range(start, end)
+        total = len(samples)
+        if total <= points:
+            return samples, total
+
+        times = samples[:, 0]
+        edges = np.linspace(times[0], times[-1], points + 1)[1:]
+        last = np.unique(np.searchsorted(times, edges, side='right') - 1)
+        return samples[last], total
+
+    def heatmap(self, start: float = None, end: float = None, pan_bins: int = 36, tilt_bins: int = 18):
+        """Get the time spent looking at each region of the sphere. Each pose is weighted
+        by the time until the next one (or the end of the range) and binned by pan, wrapped to
+        [-180, 180), and tilt in [-90, 90].
+
+        Args:
+            start (float, optional): Start of the range, seconds since the epoch. Defaults to the oldest sample.
+            end (float, optional): End of the range, seconds since the epoch. Defaults to now.
+            pan_bins (int, optional): Number of pan bins. Defaults to 36.
+            tilt_bins (int, optional): Number of tilt bins. Defaults to 18.
+
+        Returns:
+            numpy.ndarray: (tilt_bins, pan_bins) array with the seconds spent in each bin, tilt
+            increasing with the row and pan with the column.
+        """
+        # pylint: disable=import-outside-toplevel
+        import numpy as np
+
+        end = time.time() if end is None else end
+        samples = self.__range(start, end)
+        if len(samples) == 0:
+            return np.zeros((tilt_bins, pan_bins))
+
+        times = samples[:, 0].copy()
+        if start is not None:
+            times[0] = max(times[0], start)
+        dwell = np.diff(np.append(times, end))
+
+        pan = (samples[:, 1] + 180.0) % 360.0 - 180.0
+        tilt = samples[:, 2]
+        known = ~(np.isnan(pan) | np.isnan(tilt))
+        dwell_map, _, _ = np.histogram2d(tilt[known], pan[known], bins=(tilt_bins, pan_bins),
+                                         range=((-90.0, 90.0), (-180.0, 180.0)),
+                                         weights=dwell[known])
+        return dwell_map
@@ -0,0 +1,177 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class JitterTuner
+"""
+
+from threading import Lock
+
+from ptz import pipeline
+from ptz.logger import Logger
+from ptz.models.input import InputStats
+
+logger = Logger.get_logger()
+
+# The latency target is this many times the average jitter
+JITTER_FACTOR = 4.0
+# Growth of the latency when packets arrive too late
+GROWTH = 1.5
+# Smallest latency increase in milliseconds
+MIN_STEP = 10
+# Reduction of the latency after CALM_INTERVALS without late packets
+SHRINK = 0.9
+CALM_INTERVALS = 10
+# Consecutive updates above the loss threshold before falling back to TCP
+LOSSY_INTERVALS = 5
+
+
+class JitterTuner():
+    """Class JitterTuner, adapts the jitter buffer latency of an rtsp input to its RTP statistics.
+    """
+
+    def __init__(self, media, transport: str, min_latency: int = 0, max_latency: int = 1000,
+                 tcp_loss: float = None):
+        """JitterTuner object. The jitter buffers rtspsrc creates for its streams are collected
+        from its RTP manager. Each update reads their statistics: when packets arrive too late
+        the latency grows at once, and after a while without late packets it shrinks slowly
+        toward a multiple of the measured jitter, always within the bounds. The loss of each
+        update is compared with tcp_loss to decide when the input should fall back to TCP.
+
+        Args:
+            media (Media): Pipeline with an rtspsrc named src
+            transport (str): Transport of the input, reported in the statistics
+            min_latency (int, optional): Lowest jitter buffer latency in milliseconds. Defaults to 0.
+            max_latency (int, optional): Highest jitter buffer latency in milliseconds. Defaults to 1000.
+            tcp_loss (float, optional): Fraction of lost packets above which a pipeline.AUTO input
+                falls back to TCP, None to never fall back. Defaults to None.
+        """
+        self.__transport = transport
+        self.__min_latency = min_latency
+        self.__max_latency = max_latency
+        self.__tcp_loss = None if transport == pipeline.TCP else tcp_loss
+        self.__lossy = 0
+        self.__fall_back = False
+        self.__lock = Lock()
+        self.__jitterbuffers = []
+        self.__latency = None
+        self.__totals = (0, 0, 0, 0)
+        self.__calm = 0
+        self.__stats = InputStats(transport=transport, min_latency=min_latency, max_latency=max_latency)
+        media.add_signal_handler('src', 'new-manager', self.__on_manager)
+
+    def __on_manager(self, src, manager):  # pylint: disable=unused-argument
+        with self.__lock:
+            # A new manager means a new connection, the previous jitter buffers are gone
+            self.__jitterbuffers = []
+            self.__totals = (0, 0, 0, 0)
+        manager.connect('new-jitterbuffer', self.__on_jitterbuffer)
+
+    def __on_jitterbuffer(self, manager, jitterbuffer, session, ssrc):  # pylint: disable=unused-argument
+        with self.__lock:
+            if self.__latency is None:
+                # Start from the latency of the latency mode
+                self.__latency = self.__clamp(jitterbuffer.get_property('latency'))
+            jitterbuffer.set_property('latency', self.__latency)
+            self.__jitterbuffers.append(jitterbuffer)
+
+    def __clamp(self, latency):
+        return int(min(max(latency, self.__min_latency), self.__max_latency))
+
+    @staticmethod
+    def __read(jitterbuffer):
+        stats = jitterbuffer.get_property('stats')
+        return (stats.get_value('num-pushed'), stats.get_value('num-lost'),
+                stats.get_value('num-late'), stats.get_value('num-duplicates'),
+                stats.get_value('avg-jitter'))
+
+    def update(self):
+        """Read the statistics of the jitter buffers and adapt their latency. Meant to be
+        called periodically, the loss is measured since the previous call.
+
+        Returns:
+            InputStats: the statistics, also returned by get_stats() until the next update.
+        """
+        with self.__lock:
+            if not self.__jitterbuffers:
+                return self.__stats
+
+            readings = [self.__read(jitterbuffer) for jitterbuffer in self.__jitterbuffers]
+            pushed, lost, late, duplicates = (sum(reading[i] for reading in readings) for i in range(4))
+            jitter = max(reading[4] for reading in readings) / 1e6
+            last_pushed, last_lost, last_late, _ = self.__totals
+            self.__totals = (pushed, lost, late, duplicates)
+            new_pushed, new_lost = pushed - last_pushed, lost - last_lost
+            loss = new_lost / (new_pushed + new_lost) if new_pushed + new_lost > 0 else 0.0
+            if self.__tcp_loss is not None:
+                self.__lossy = self.__lossy + 1 if loss > self.__tcp_loss else 0
+                if self.__lossy >= LOSSY_INTERVALS:
+                    self.__fall_back = True
+                    # Asked once, the input is rebuilt with a new tuner
+                    self.__tcp_loss = None
+
+            latency = self.__latency
+            if late > last_late:
+                latency = max(latency * GROWTH, latency + MIN_STEP)
+                self.__calm = 0
+            else:
+                self.__calm += 1
+                if self.__calm >= CALM_INTERVALS:
+                    latency = max(latency * SHRINK, JITTER_FACTOR * jitter)
+                    self.__calm = 0
+            latency = self.__clamp(latency)
+            if latency != self.__latency:
+                logger.info(f'Input jitter {jitter:.1f} ms, {late - last_late} late packets, '
+                            f'jitter buffer latency {self.__latency} -> {latency} ms')
+                self.__latency = latency
+                for jitterbuffer in self.__jitterbuffers:
+                    jitterbuffer.set_property('latency', latency)
+
+            self.__stats = InputStats(transport=self.__transport, latency=latency,
+                                      min_latency=self.__min_latency, max_latency=self.__max_latency,
+                                      jitter=jitter, packets=pushed, lost=lost, late=late,
+                                      duplicates=duplicates, loss=loss)
+            return self.__stats
+
+    def reset(self, latency: int, drop_on_latency: bool):
+        """Restart the adaptation from the latency of a new latency mode, applied at once to
+        the current jitter buffers. The jitter buffers of later connections take their
+        settings from rtspsrc.
+
+        Args:
+            latency (int): Jitter buffer latency in milliseconds, clamped to the bounds
+            drop_on_latency (bool): Whether the jitter buffers drop the packets that exceed the latency
+        """
+        with self.__lock:
+            self.__latency = self.__clamp(latency)
+            self.__calm = 0
+            for jitterbuffer in self.__jitterbuffers:
+                jitterbuffer.set_property('latency', self.__latency)
+                jitterbuffer.set_property('drop-on-latency', drop_on_latency)
+
+    def fall_back(self):
+        """Whether the input should be rebuilt with TCP transport. Returns True only once,
+        after LOSSY_INTERVALS consecutive updates above the loss threshold, and never for
+        inputs that already use TCP.
+
+        Returns:
+            bool: True if the input should fall back to TCP.
+        """
+        with self.__lock:
+            fall_back, self.__fall_back = self.__fall_back, False
+            return fall_back
+
+    def get_stats(self):
+        """Get the statistics of the last update
+
+        Returns:
+            InputStats: the statistics
+        """
+        return self.__stats
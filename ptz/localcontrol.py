@@ -0,0 +1,112 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Local control interface
+"""
+
+import math
+import os
+import socket
+import struct
+from threading import Thread
+
+from rrmsutils.models.ptz.position import Position
+from rrmsutils.models.ptz.zoom import Zoom
+
+from ptz.logger import Logger
+
+logger = Logger.get_logger()
+
+# Fixed-size little endian message: sequence (uint32), flags (uint32), pan,
+# tilt and zoom (float64). Fields not selected in flags are ignored.
+MESSAGE = struct.Struct('<IIddd')
+FLAG_POSITION = 0x1
+FLAG_ZOOM = 0x2
+
+
+def _bounds(model, field):
+    """Get the (ge, gt, le, lt) limits declared in a model field"""
+    ge, gt, le, lt = -math.inf, -math.inf, math.inf, math.inf
+    for constraint in model.model_fields[field].metadata:
+        ge = getattr(constraint, 'ge', ge)
+        gt = getattr(constraint, 'gt', gt)
+        le = getattr(constraint, 'le', le)
+        lt = getattr(constraint, 'lt', lt)
+    return ge, gt, le, lt
+
+
+def _valid(value, bounds):
+    ge, gt, le, lt = bounds
+    # NaN fails every comparison, so it is rejected too
+    return ge <= value <= le and gt < value < lt
+
+
+class LocalControl():
+    """Class LocalControl, receives pose updates from co-located clients through a Unix datagram socket.
+    """
+
+    def __init__(self, ptz, path: str):
+        """LocalControl object. Each datagram is a MESSAGE with the pose, validated with the same
+        ranges as the Position and Zoom models and applied to the pipeline without going
+        through HTTP nor JSON.
+
+        Args:
+            ptz (PTZ): a PTZ Class instance
+            path (str): Path of the Unix socket
+        """
+        self.__ptz = ptz
+        self.__path = path
+        self.__pan_bounds = _bounds(Position, 'pan')
+        self.__tilt_bounds = _bounds(Position, 'tilt')
+        self.__zoom_bounds = _bounds(Zoom, 'zoom')
+        self.__buffer = bytearray(MESSAGE.size)
+        self.__socket = None
+
+    def start(self):
+        """Bind the socket and start serving updates in the background
+        """
+        if os.path.exists(self.__path):
+            os.unlink(self.__path)
+
+        self.__socket = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        self.__socket.bind(self.__path)
+        Thread(target=self.__loop, daemon=True).start()
+        logger.info(f'Listening for local pose updates in {self.__path}')
+
+    def __loop(self):
+        buffer = self.__buffer
+        last_seq = None
+        while True:
+            size = self.__socket.recv_into(buffer)
+            if size != MESSAGE.size:
+                logger.warning(f'Discarding local update of {size} bytes')
+                continue
+
+            seq, flags, pan, tilt, zoom = MESSAGE.unpack_from(buffer)
+            if seq == last_seq:
+                continue
+            last_seq = seq
+
+            if flags & FLAG_POSITION:
+                if not _valid(pan, self.__pan_bounds) or not _valid(tilt, self.__tilt_bounds):
+                    logger.warning(f'Discarding local update {seq}: invalid position')
+                    continue
+            else:
+                pan = tilt = None
+
+            if flags & FLAG_ZOOM:
+                if not _valid(zoom, self.__zoom_bounds):
+                    logger.warning(f'Discarding local update {seq}: invalid zoom')
+                    continue
+            else:
+                zoom = None
+
+            self.__ptz.apply_pose(pan, tilt, zoom)
@@ -0,0 +1,106 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class LevelOfDetail
+"""
+
+import math
+
+
+class LevelOfDetail():
+    """Class LevelOfDetail, chooses the resolution the input is scaled to before the PTZ.
+    """
+
+    def __init__(self, in_width: int, in_height: int, window_size: int, levels: int = 4,
+                 headroom: float = 0.1, hysteresis: float = 0.2):
+        """LevelOfDetail object. The levels are the input resolution halved successively,
+        as long as the width stays above the output window. A level is enough for a zoom
+        when it has at least one input pixel per output pixel at the edges of the view,
+        where the view is densest, see required_width().
+
+        Args:
+            in_width (int): Input width
+            in_height (int): Input height
+            window_size (int): The size in pixels of the output PTZ window
+            levels (int, optional): Maximum number of levels, including the input resolution. Defaults to 4.
+            headroom (float, optional): Fraction of the level width kept free, so that a zoom in
+                is covered while the level switches. Defaults to 0.1.
+            hysteresis (float, optional): Extra fraction the zoom has to go down before switching
+                to a lower level. Defaults to 0.2.
+        """
+        self.__window_size = window_size
+        self.__headroom = headroom
+        self.__hysteresis = hysteresis
+        self.__levels = [(in_width, in_height)]
+        while len(self.__levels) < levels:
+            width, height = self.__levels[-1]
+            # Even sizes, required by most video formats
+            width, height = width // 4 * 2, height // 4 * 2
+            if width < window_size:
+                break
+            self.__levels.append((width, height))
+        self.__level = 0
+
+    def get_levels(self):
+        """Get the resolutions of the levels, from the input resolution down
+
+        Returns:
+            list: (width, height) of each level
+        """
+        return list(self.__levels)
+
+    def required_width(self, zoom: float):
+        """Input width needed for a zoom. The view has a focal length of zoom * window_size / 2
+        pixels, so at an angle theta from its center it has focal / cos(theta)^2 pixels per
+        radian, the most at the edges, where tan(theta) = 1 / zoom. An equirectangular input
+        has width / (2 * pi) pixels per radian, so covering the edges takes
+        pi * window_size * zoom * (1 + 1 / zoom^2).
+
+        Args:
+            zoom (float): Zoom, 1.0 is a 90 degrees horizontal field of view
+
+        Returns:
+            float: the width in pixels
+        """
+        return math.pi * self.__window_size * (zoom + 1 / zoom)
+
+    def select(self, zoom: float):
+        """Select the level for a zoom. Higher levels are selected as soon as they are needed,
+        lower levels only when the zoom is below the threshold by the hysteresis margin.
+
+        Args:
+            zoom (float): Zoom
+
+        Returns:
+            tuple, None: (width, height) of the new level, None if the level doesn't change.
+        """
+        required = self.required_width(zoom)
+        level = self.__level
+
+        while level > 0 and required > self.__levels[level][0] * (1 - self.__headroom):
+            level -= 1
+
+        lower = (1 - self.__headroom) * (1 - self.__hysteresis)
+        while level + 1 < len(self.__levels) and required <= self.__levels[level + 1][0] * lower:
+            level += 1
+
+        if level == self.__level:
+            return None
+        self.__level = level
+        return self.__levels[level]
+
+    def get_size(self):
+        """Get the resolution of the current level
+
+        Returns:
+            tuple: (width, height)
+        """
+        return self.__levels[self.__level]
@@ -12,13 +12,37 @@
 """
 
 import argparse
+import os
+import time
 
+from ptz import pipeline
+from ptz.agent import NodeAgent
+from ptz.controllers.coordinatorcontroller import CoordinatorController
+from ptz.controllers.debugcontroller import DebugController
+from ptz.controllers.eventscontroller import EventsController
+from ptz.controllers.healthcontroller import HealthController
+from ptz.controllers.historycontroller import HistoryController
+from ptz.controllers.latencycontroller import LatencyController
+from ptz.controllers.mosaiccontroller import MosaicController
 from ptz.controllers.positioncontroller import PositionController
+from ptz.controllers.presetcontroller import PresetController
+from ptz.controllers.probecontroller import ProbeController
+from ptz.controllers.schedulecontroller import ScheduleController
 from ptz.controllers.streamcontroller import StreamController
+from ptz.controllers.tourcontroller import TourController
+from ptz.controllers.webrtccontroller import WebRTCController
 from ptz.controllers.zoomcontroller import ZoomController
+from ptz.coordinator import Coordinator
+from ptz.events import EventHub
+from ptz.localcontrol import LocalControl
 from ptz.logger import Logger
+from ptz.mosaic import Mosaic
+from ptz.presets import PresetStore
+from ptz.probe import StreamProber
 from ptz.ptz import PTZ
+from ptz.publisher import InputPublisher
 from ptz.server import Server
+from ptz.worker import RemoteMosaic, RemotePTZ
 
 
 def parse_args():
@@ -30,6 +54,40 @@ def parse_args():
                         help="Server ip address")
     parser.add_argument("--ptz-window-size", type=int, default=500,
                         help="Size of the PTZ output window in pixels. The final resolution will be (Size x Size)")
+    parser.add_argument("--ptz-backend", type=str, default=pipeline.GPU, choices=pipeline.BACKENDS,
+                        help="PTZ implementation: gpu uses rrpanoramaptz and NVIDIA codecs, cpu uses the NumPy rrpanoramaptzcpu element and software codecs")
+    parser.add_argument("--latency-mode", type=str, default=pipeline.BALANCED, choices=list(pipeline.LATENCY_MODES),
+                        help="Initial latency mode: ultra-low drops frames to keep the delay minimal, smooth buffers to avoid drops, balanced sits in between")
+    parser.add_argument("--lod-levels", type=int, default=4,
+                        help="Number of resolutions the input is scaled to before the PTZ depending on the zoom, 1 to never scale")
+    parser.add_argument("--jitter-min-latency", type=int, default=0,
+                        help="Lowest latency in milliseconds of the rtsp input jitter buffer, which is adapted to the measured jitter")
+    parser.add_argument("--jitter-max-latency", type=int, default=1000,
+                        help="Highest latency in milliseconds of the rtsp input jitter buffer")
+    parser.add_argument("--tcp-loss", type=float, default=0.05,
+                        help="Fraction of lost input packets that switches the rtsp input to TCP interleaved transport, negative to never switch")
+    parser.add_argument("--suspend-grace", type=float, default=10.0,
+                        help="Seconds without RTSP clients before the PTZ and encoding are suspended, negative to never suspend")
+    parser.add_argument("--events-max-rate", type=float, default=10.0,
+                        help="Maximum number of state change events per second sent to each /events observer")
+    parser.add_argument("--isolate", action="store_true",
+                        help="Run the pipeline and the mosaic in supervised worker processes, restarted automatically if they die")
+    parser.add_argument("--local-socket", type=str, default=None,
+                        help="Path of a Unix socket to receive binary pose updates from local clients")
+    parser.add_argument("--coordinator", action="store_true",
+                        help="Run as coordinator: place sessions on the registered nodes instead of running a pipeline")
+    parser.add_argument("--coordinator-uri", type=str, default=None,
+                        help="URL of the coordinator to register this node in, for example http://127.0.0.1:5000")
+    parser.add_argument("--node-uri", type=str, default=None,
+                        help="URL the coordinator uses to reach this node. Defaults to http://HOST:PORT")
+    parser.add_argument("--publish-input", type=str, default=None,
+                        help="Run as decoder-publisher: decode this rtsp input once and publish the frames in shared memory, for other instances to use as shm://SHM_SOCKET")
+    parser.add_argument("--shm-socket", type=str, default='/tmp/ptz-input',
+                        help="Path of the shared memory socket used with --publish-input")
+    parser.add_argument("--debug-token", type=str, default=os.environ.get('PTZ_DEBUG_TOKEN'),
+                        help="Token required to capture profiles from /debug/profile, disabled if not given. Defaults to $PTZ_DEBUG_TOKEN")
+    parser.add_argument("--presets-file", type=str, default=os.path.expanduser('~/.config/ptz/presets.json'),
+                        help="JSON file where the presets are stored")
     args = parser.parse_args()
 
     return args
@@ -38,17 +96,74 @@ def parse_args():
 def main():
     """main application
     """
+    start_time = time.monotonic()
     Logger.init()
 
     args_m = parse_args()
     controllers = []
-    ptz = PTZ(window_size=args_m.ptz_window_size)
-    controllers.append(PositionController(ptz))
-    controllers.append(ZoomController(ptz))
-    controllers.append(StreamController(ptz))
+
+    if args_m.coordinator:
+        controllers.append(CoordinatorController(Coordinator()))
+        server = Server(controllers, host=args_m.host, port=args_m.port)
+        server.run()
+        return
+
+    if args_m.publish_input is not None:
+        InputPublisher(args_m.publish_input, args_m.shm_socket, backend=args_m.ptz_backend,
+                       latency_mode=args_m.latency_mode).run()
+        return
+
+    events = EventHub()
+    prober = StreamProber()
+    suspend_grace = None if args_m.suspend_grace < 0 else args_m.suspend_grace
+    tcp_loss = None if args_m.tcp_loss < 0 else args_m.tcp_loss
+    if args_m.isolate:
+        ptz = RemotePTZ(local_socket=args_m.local_socket,
+                        window_size=args_m.ptz_window_size, start_time=start_time, events=events,
+                        backend=args_m.ptz_backend, latency_mode=args_m.latency_mode,
+                        suspend_grace=suspend_grace, lod_levels=args_m.lod_levels,
+                        min_latency=args_m.jitter_min_latency, max_latency=args_m.jitter_max_latency,
+                        tcp_loss=tcp_loss)
+        mosaic = RemoteMosaic(backend=args_m.ptz_backend, latency_mode=args_m.latency_mode)
+    else:
+        ptz = PTZ(window_size=args_m.ptz_window_size, start_time=start_time, events=events,
+                  prober=prober, backend=args_m.ptz_backend, latency_mode=args_m.latency_mode,
+                  suspend_grace=suspend_grace, lod_levels=args_m.lod_levels,
+                  min_latency=args_m.jitter_min_latency, max_latency=args_m.jitter_max_latency,
+                  tcp_loss=tcp_loss)
+        mosaic = Mosaic(prober=prober, backend=args_m.ptz_backend, latency_mode=args_m.latency_mode)
+    controllers.append(HealthController(ptz, start_time=start_time))
+    controllers.append(PositionController(ptz, events))
+    controllers.append(ZoomController(ptz, events))
+    controllers.append(StreamController(ptz, events))
+    controllers.append(LatencyController(ptz, events))
+    controllers.append(WebRTCController(ptz))
+    controllers.append(EventsController(events, max_rate=args_m.events_max_rate))
+    controllers.append(MosaicController(mosaic))
+    controllers.append(ProbeController(prober))
+    controllers.append(ScheduleController(ptz))
+    controllers.append(HistoryController(ptz))
+    presets = PresetStore(args_m.presets_file)
+    controllers.append(PresetController(presets, ptz))
+    controllers.append(TourController(presets, ptz))
+    if args_m.debug_token:
+        controllers.append(DebugController(ptz, args_m.debug_token))
     server = Server(controllers, host=args_m.host, port=args_m.port)
+
+    if args_m.local_socket is not None and not args_m.isolate:
+        LocalControl(ptz, args_m.local_socket).start()
+
+    agent = None
+    if args_m.coordinator_uri is not None:
+        node_uri = args_m.node_uri or f'http://{args_m.host}:{args_m.port}'
+        agent = NodeAgent(args_m.coordinator_uri, node_uri)
+        agent.start()
+
     server.run()
 
+    if agent is not None:
+        agent.stop()
+
 
 if __name__ == "__main__":
     main()
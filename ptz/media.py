@@ -11,18 +11,43 @@
 """Media Class
 """
 import time
-from threading import Thread
-
-import gi
-from gi.repository import GLib, GObject, Gst
+from threading import Event, Lock, Thread, current_thread
 
 from ptz.logger import Logger
 
-gi.require_version('Gst', '1.0')
-Gst.init(None)
-
 logger = Logger.get_logger()
 
+# GStreamer is imported and initialized on first use, so that importing this
+# module (and starting the API server) doesn't pay for the gi bindings.
+GLib = None
+GObject = None
+Gst = None
+_init_lock = Lock()
+
+
+def init():
+    """Import and initialize GStreamer. Safe to call several times and from
+    several threads, only the first call does the actual work.
+    """
+    global GLib, GObject, Gst  # pylint: disable=global-statement
+
+    with _init_lock:
+        if Gst is not None:
+            return
+
+        import gi  # pylint: disable=import-outside-toplevel
+        gi.require_version('Gst', '1.0')
+        from gi.repository import GLib as _GLib  # pylint: disable=import-outside-toplevel
+        from gi.repository import GObject as _GObject  # pylint: disable=import-outside-toplevel
+        from gi.repository import Gst as _Gst  # pylint: disable=import-outside-toplevel
+
+        start = time.monotonic()
+        _Gst.init(None)
+        logger.info(
+            f'GStreamer initialized in {(time.monotonic() - start) * 1000:.1f} ms')
+
+        GLib, GObject, Gst = _GLib, _GObject, _Gst
+
 
 class Media():
     """Media Class, sets a Gstreamer pipeline, change its status, updates and gets the properties of the element specified
@@ -36,15 +61,32 @@ class Media():
             retry (bool, optional): Whether or not to try to reconnect in case of any error. Defaults to True.
             retry_delay (int, optional): Time in seconds to wait before trying to reconnect (valid only if retry is True). Defaults to 5.
         """
+        init()
+
         self.__description = description
         self.__retry = retry
         self.__retry_delay = retry_delay
+        self.__pipeline = None
+        self.__probes = []
+        self.__signals = []
+        self.__error_handlers = []
+        self.__arguments = {}
+        self.__elements = {}
+        self.__branches = {}
+        self.__closed = False
         self.__mainloop = GObject.MainLoop()
         self.__thread = Thread(target=self.__loop)
         self.__thread.start()
-        self.__create()
+        try:
+            self.__create()
+        except Exception:
+            self.close()
+            raise
 
     def __create(self):
+        self.__elements = {}
+        # Branches belong to the pipeline they were added to
+        self.__branches = {}
         try:
             self.__pipeline = Gst.parse_launch(self.__description)
         except Exception as e:  # pylint: disable=broad-exception-caught
@@ -55,23 +97,180 @@ class Media():
             bus = self.__pipeline.get_bus()
             bus.add_watch(GLib.PRIORITY_DEFAULT, self.__bus_callback)
 
+        for probe in self.__probes:
+            self.__attach_probe(*probe)
+        for signal in self.__signals:
+            self.__connect(*signal)
+        for element_name, arguments in self.__arguments.items():
+            self.__set_arguments(element_name, arguments)
+
+    def __attach_probe(self, element_name, pad_name, callback):
+        element = self.__pipeline.get_by_name(element_name)
+        if element is None:
+            logger.warning(f'There is no {element_name} in the pipeline')
+            return False
+
+        pad = element.get_static_pad(pad_name)
+        if pad is None:
+            logger.warning(f'{element_name} has no {pad_name} pad')
+            return False
+
+        def probe(pad, info):
+            if callback(pad, info.get_buffer()) is False:
+                return Gst.PadProbeReturn.DROP
+            return Gst.PadProbeReturn.OK
+
+        pad.add_probe(Gst.PadProbeType.BUFFER, probe)
+        return True
+
+    def add_buffer_probe(self, element_name, pad_name, callback):
+        """Install a callback on every buffer going through the given pad. The probe
+        is installed again each time the pipeline is recreated after an error.
+
+        Args:
+            element_name (str): Pipeline element that owns the pad
+            pad_name (str): Name of the static pad, typically 'sink' or 'src'
+            callback (callable): Called as callback(pad, buffer) from the streaming thread.
+                Returning False drops the buffer, any other value lets it through.
+
+        Returns:
+            True, False: True if the probe was installed, False if the element or pad doesn't exist.
+        """
+        self.__probes.append((element_name, pad_name, callback))
+        return self.__attach_probe(element_name, pad_name, callback)
+
+    def __connect(self, element_name, signal_name, callback):
+        element = self.__pipeline.get_by_name(element_name)
+        if element is None:
+            logger.warning(f'There is no {element_name} in the pipeline')
+            return False
+
+        element.connect(signal_name, callback)
+        return True
+
+    def add_signal_handler(self, element_name, signal_name, callback):
+        """Connect a callback to a signal of a pipeline element. The handler is connected
+        again each time the pipeline is recreated after an error.
+
+        Args:
+            element_name (str): Pipeline element that emits the signal
+            signal_name (str): Name of the signal
+            callback (callable): Called with the signal arguments, typically from a streaming thread
+
+        Returns:
+            True, False: True if the handler was connected, False if the element doesn't exist.
+        """
+        self.__signals.append((element_name, signal_name, callback))
+        return self.__connect(element_name, signal_name, callback)
+
+    def add_error_handler(self, callback):
+        """Install a callback for the pipeline errors. With retry it is called before the
+        pipeline is stopped and scheduled to be recreated, and it stays installed for the
+        recreated pipeline.
+
+        Args:
+            callback (callable): Called as callback(message) from the main loop thread
+        """
+        self.__error_handlers.append(callback)
+
+    def add_branch(self, tee_name, description):
+        """Add a bin to the running pipeline, fed by a new pad of a tee
+
+        Args:
+            tee_name (str): Name of the tee
+            description (str): Description of the bin, its first element is linked to the tee
+
+        Returns:
+            Gst.Bin, None: the bin, None if it couldn't be added.
+        """
+        tee = self.get_element(tee_name)
+        if tee is None:
+            logger.warning(f"Element {tee_name} doesn't exist in the pipeline")
+            return None
+
+        try:
+            branch = Gst.parse_bin_from_description(description, True)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error(f'Error creating branch: {e}')
+            return None
+
+        self.__pipeline.add(branch)
+        tee_pad = tee.request_pad_simple('src_%u') if hasattr(tee, 'request_pad_simple') \
+            else tee.get_request_pad('src_%u')
+        if tee_pad.link(branch.get_static_pad('sink')) != Gst.PadLinkReturn.OK:
+            logger.error(f'Error linking branch to {tee_name}')
+            tee.release_request_pad(tee_pad)
+            self.__pipeline.remove(branch)
+            return None
+
+        self.__branches[branch] = (tee, tee_pad)
+        branch.sync_state_with_parent()
+        return branch
+
+    def remove_branch(self, branch):
+        """Remove a bin added with add_branch. The tee pad is unlinked once it is idle, so
+        no buffer is lost in the middle of the bin.
+
+        Args:
+            branch (Gst.Bin): The bin
+
+        Returns:
+            bool: True if the bin was removed, False if it is not a branch of this pipeline.
+        """
+        tee, tee_pad = self.__branches.pop(branch, (None, None))
+        if tee is None:
+            return False
+
+        unlinked = Event()
+
+        def unlink(pad, info):  # pylint: disable=unused-argument
+            pad.unlink(branch.get_static_pad('sink'))
+            unlinked.set()
+            return Gst.PadProbeReturn.REMOVE
+
+        tee_pad.add_probe(Gst.PadProbeType.IDLE, unlink)
+        unlinked.wait(1.0)
+        branch.set_state(Gst.State.NULL)
+        self.__pipeline.remove(branch)
+        tee.release_request_pad(tee_pad)
+        return True
+
     def __del__(self):
-        self.stop()
+        self.close()
+
+    def close(self):
+        """Stop the pipeline and its main loop and cancel any pending reconnection. A pipeline
+        being replaced must be closed: its main loop thread keeps it alive, so otherwise it
+        keeps playing and holding its input session and output port.
+        """
+        if self.__closed:
+            return
+
+        self.__closed = True
+        if self.__pipeline is not None:
+            self.stop()
         self.__mainloop.quit()
-        self.__thread.join()
+        # The loop may be closing itself from one of its callbacks
+        if current_thread() is not self.__thread:
+            self.__thread.join()
 
     def __loop(self):
         self.__mainloop.run()
 
     def __delayed_start(self):
         time.sleep(self.__retry_delay)
+        if self.__closed:
+            return
         logger.info("Reconecting ...")
         self.__create()
         self.play()
 
     def __bus_callback(self, bus, message):  # pylint: disable=unused-argument
         if message.type == Gst.MessageType.ERROR:
+            error, _ = message.parse_error()
             logger.warning(f"Something went wrong: {message.parse_error()}")
+            for callback in self.__error_handlers:
+                callback(error.message)
             logger.info("Scheduling stream reconnection...")
             self.stop()
             t = Thread(target=self.__delayed_start)
@@ -113,6 +312,94 @@ class Media():
         logger.info(f'Playing {self.__description}')
         return True
 
+    @staticmethod
+    def running_time(pad, buffer):
+        """Get the running time of a buffer, according to the segment of the pad it goes through
+
+        Args:
+            pad (Gst.Pad): Pad where the buffer was probed
+            buffer (Gst.Buffer): The buffer
+
+        Returns:
+            int, None: running time in nanoseconds, None if the buffer has no timestamp or there is no time segment yet.
+        """
+        if buffer.pts == Gst.CLOCK_TIME_NONE:
+            return None
+
+        event = pad.get_sticky_event(Gst.EventType.SEGMENT, 0)
+        if event is None:
+            return None
+
+        segment = event.parse_segment()
+        running_time = segment.to_running_time(Gst.Format.TIME, buffer.pts)
+        return None if running_time == Gst.CLOCK_TIME_NONE else running_time
+
+    @staticmethod
+    def is_delta_unit(buffer):
+        """Whether an encoded buffer depends on previous ones, that is, it is not a keyframe
+
+        Args:
+            buffer (Gst.Buffer): The buffer
+
+        Returns:
+            bool: True for delta units, False for keyframes.
+        """
+        return buffer.has_flags(Gst.BufferFlags.DELTA_UNIT)
+
+    def dot_graph(self):
+        """Get the pipeline graph in DOT format
+
+        Returns:
+            str, None: the graph, None if there is no pipeline.
+        """
+        if self.__pipeline is None:
+            return None
+        return Gst.debug_bin_to_dot_data(self.__pipeline, Gst.DebugGraphDetails.ALL)
+
+    def force_key_unit(self, element_name):
+        """Ask an encoder for a keyframe with the stream headers
+
+        Args:
+            element_name (str): Name of the encoder
+
+        Returns:
+            bool: True if the request was handled, False otherwise.
+        """
+        element = self.get_element(element_name)
+        if element is None:
+            logger.warning(f"Element {element_name} doesn't exist in the pipeline")
+            return False
+
+        structure = Gst.Structure.new_from_string('GstForceKeyUnit, all-headers=(boolean)true')
+        return element.send_event(Gst.Event.new_custom(Gst.EventType.CUSTOM_UPSTREAM, structure))
+
+    def get_elements(self):
+        """Get every element of the pipeline, including the ones inside bins
+
+        Returns:
+            list: the elements, empty if there is no pipeline.
+        """
+        if self.__pipeline is None:
+            return []
+        return list(self.__pipeline.iterate_recurse())
+
+    def get_element(self, element_name):
+        """Get a pipeline element by name. Lookups are cached until the pipeline is recreated,
+        so this is suitable for paths that run on every update.
+
+        Args:
+            element_name (str): Pipeline element name
+
+        Returns:
+            Gst.Element, None: the element, None if it doesn't exist in the pipeline.
+        """
+        element = self.__elements.get(element_name)
+        if element is None and self.__pipeline is not None:
+            element = self.__pipeline.get_by_name(element_name)
+            if element is not None:
+                self.__elements[element_name] = element
+        return element
+
     def set_property(self, element_name, property_name, value):
         """Set the 'property_name' in the pipeline 'element_name' to the specified 'value'
 
@@ -139,6 +426,53 @@ class Media():
         logger.info(f'Setting {property_name} to {value}')
         return True
 
+    def set_caps(self, element_name, caps):
+        """Set the caps property of an element, typically a capsfilter, from a string
+
+        Args:
+            element_name (str): Name of the element
+            caps (str): The caps
+
+        Returns:
+            bool: True if the caps were set, False otherwise.
+        """
+        element = self.get_element(element_name)
+        if element is None:
+            logger.warning(f"Element {element_name} doesn't exist in the pipeline")
+            return False
+
+        element.set_property('caps', Gst.Caps.from_string(caps))
+        return True
+
+    def __set_arguments(self, element_name, arguments):
+        element = self.get_element(element_name)
+        if element is None:
+            logger.warning(f"Element {element_name} doesn't exist in the pipeline")
+            return False
+
+        for argument in arguments.split():
+            name, _, value = argument.partition('=')
+            Gst.util_set_object_arg(element, name, value)
+        return True
+
+    def set_arguments(self, element_name, arguments: str):
+        """Set properties of an element from their text form, as in a pipeline description,
+        for example 'max-size-buffers=1 leaky=downstream'. Enums and numbers are converted to
+        the type of each property. The properties are set again each time the pipeline is
+        recreated after an error.
+
+        Args:
+            element_name (str): Name of the element
+            arguments (str): Space separated name=value pairs
+
+        Returns:
+            bool: True if the properties were set, False if the element doesn't exist.
+        """
+        if not self.__set_arguments(element_name, arguments):
+            return False
+        self.__arguments[element_name] = arguments
+        return True
+
     def get_property(self, element_name, property_name):
         """Gets the value of an elements property in the pipeline
 
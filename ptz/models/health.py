@@ -0,0 +1,29 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Health model
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+from ptz.models.output import OutputStats
+
+
+class Health(BaseModel):
+    """Service readiness information. The server is ready as soon as it answers,
+    the pipeline bring-up is reported separately in state.
+    """
+    state: str
+    time_to_first_request: Optional[float] = None
+    time_to_first_frame: Optional[float] = None
+    output: Optional[OutputStats] = None
@@ -0,0 +1,43 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Pose history models
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class PoseSample(BaseModel):
+    """A pose applied to the PTZ, time in seconds since the epoch
+    """
+    time: float
+    pan: Optional[float] = None
+    tilt: Optional[float] = None
+    zoom: Optional[float] = None
+
+
+class History(BaseModel):
+    """Downsampled poses of a time range, total is the number of poses in the range
+    """
+    total: int
+    samples: List[PoseSample]
+
+
+class Heatmap(BaseModel):
+    """Seconds spent looking at each region of the sphere. dwell has tilt_bins rows from
+    tilt -90 to 90 and pan_bins columns from pan -180 to 180
+    """
+    pan_bins: int
+    tilt_bins: int
+    total_time: float
+    dwell: List[List[float]]
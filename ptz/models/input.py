@@ -0,0 +1,36 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Input statistics model
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class InputStats(BaseModel):
+    """RTP statistics of the rtsp input and the jitter buffer settings adapted to them.
+    Counters are totals since the input connected, loss is the fraction of packets lost
+    in the last measurement interval and jitter is the average interarrival jitter in
+    milliseconds. Late packets arrived after their turn, out of order or delayed beyond
+    the jitter buffer latency. Empty for inputs that are not rtsp.
+    """
+    transport: Optional[str] = None
+    latency: Optional[int] = None
+    min_latency: Optional[int] = None
+    max_latency: Optional[int] = None
+    jitter: Optional[float] = None
+    packets: int = 0
+    lost: int = 0
+    late: int = 0
+    duplicates: int = 0
+    loss: float = 0.0
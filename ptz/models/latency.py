@@ -0,0 +1,24 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Latency mode model
+"""
+
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class Latency(BaseModel):
+    """Latency mode of the pipeline: ultra-low drops frames to keep the delay minimal,
+    smooth buffers to avoid drops, balanced sits in between
+    """
+    mode: Literal['ultra-low', 'balanced', 'smooth']
@@ -0,0 +1,65 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Mosaic layout models
+"""
+
+from typing import Annotated, List
+
+from pydantic import BaseModel, Field, model_validator
+from rrmsutils.models.ptz.position import Position
+from rrmsutils.models.ptz.zoom import Zoom
+
+
+def _constrained(model, field):
+    """Type of a float field with the constraints it has in model"""
+    return Annotated[(float, *model.model_fields[field].metadata)]
+
+
+# A tile accepts the same poses as the PTZ
+Pan = _constrained(Position, 'pan')
+Tilt = _constrained(Position, 'tilt')
+ZoomLevel = _constrained(Zoom, 'zoom')
+
+# Largest grid side, each tile costs a PTZ element and a compositor pad
+MAX_GRID = 8
+# Smallest tile side in pixels, tile sizes are rounded down to even for the NV12 conversions
+MIN_TILE = 2
+
+
+class Tile(BaseModel):
+    """A tile of the mosaic: the input it shows and its PTZ pose
+    """
+    input: int = Field(default=0, ge=0)
+    pan: Pan = 0.0
+    tilt: Tilt = 0.0
+    zoom: ZoomLevel = 1.0
+
+
+class Layout(BaseModel):
+    """Grid of PTZ views composited into a single output. Tiles are placed row by
+    row, tiles not listed show the first input with the default pose.
+    """
+    inputs: List[str] = Field(min_length=1)
+    rows: int = Field(default=2, ge=1, le=MAX_GRID)
+    cols: int = Field(default=2, ge=1, le=MAX_GRID)
+    width: int = Field(default=1920, gt=0)
+    height: int = Field(default=1080, gt=0)
+    tiles: List[Tile] = []
+    out_port: int
+    out_mapping: str
+
+    @model_validator(mode='after')
+    def check_tile_size(self):
+        """Every tile must be at least MIN_TILE pixels wide and high"""
+        if self.width // self.cols < MIN_TILE or self.height // self.rows < MIN_TILE:
+            raise ValueError(f'{self.width}x{self.height} is too small for a {self.rows}x{self.cols} grid')
+        return self
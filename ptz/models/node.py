@@ -0,0 +1,26 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Node model
+"""
+
+from pydantic import BaseModel, Field
+
+
+class Node(BaseModel):
+    """A PTZ service node as registered in the coordinator. A node runs a single pipeline,
+    its capacity is 1 session, or 0 to take none.
+    """
+    url: str
+    capacity: int = Field(default=1, ge=0, le=1)
+    load: float = Field(default=0.0, ge=0.0)
+    sessions: int = 0
+    alive: bool = True
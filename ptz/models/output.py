@@ -0,0 +1,26 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Output statistics model
+"""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+
+class OutputStats(BaseModel):
+    """RTSP output usage. While suspended the input is still decoded but the PTZ
+    transform and the encoder are idle.
+    """
+    clients: Optional[int] = None
+    suspended: bool = False
+    time_suspended: float = 0.0
@@ -0,0 +1,49 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Preset and tour models
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+from rrmsutils.models.ptz.position import Position
+from rrmsutils.models.ptz.zoom import Zoom
+
+# Longest transition in seconds to a recalled preset
+MAX_TRANSITION = 60.0
+
+
+class Preset(BaseModel):
+    """A named pose
+    """
+    name: str = Field(pattern=r'^[A-Za-z0-9_.-]{1,64}$')
+    position: Position
+    zoom: Zoom
+
+
+class Tour(BaseModel):
+    """Presets recalled in order, staying dwell seconds on each one. Each recall moves to
+    the preset in transition seconds, 0 to jump to it on the next frame
+    """
+    presets: List[str] = Field(min_length=1)
+    dwell: float = Field(gt=0)
+    transition: float = Field(default=0.0, ge=0, le=MAX_TRANSITION)
+    loop: bool = True
+
+
+class TourStatus(BaseModel):
+    """The tour being run, if any, and the preset it is on
+    """
+    running: bool
+    tour: Optional[Tour] = None
+    index: Optional[int] = None
+    preset: Optional[str] = None
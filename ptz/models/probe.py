@@ -0,0 +1,35 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Stream probe models
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel, Field
+
+
+class ProbeRequest(BaseModel):
+    """Input URIs to be probed
+    """
+    uris: List[str] = Field(min_length=1)
+
+
+class ProbeResult(BaseModel):
+    """Capabilities of a probed input
+    """
+    uri: str
+    reachable: bool
+    codec: Optional[str] = None
+    width: Optional[int] = None
+    height: Optional[int] = None
+    framerate: Optional[str] = None
+    error: Optional[str] = None
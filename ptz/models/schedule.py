@@ -0,0 +1,37 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Scheduled command models
+"""
+
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class ScheduledCommand(BaseModel):
+    """A pose change to be applied on a given frame or pipeline running time.
+    Pose fields left empty are not changed.
+    """
+    id: int
+    frame: Optional[int] = None
+    running_time: Optional[int] = None
+    pan: Optional[float] = None
+    tilt: Optional[float] = None
+    zoom: Optional[float] = None
+
+
+class Schedule(BaseModel):
+    """Current frame and running time of the PTZ element and the pending commands
+    """
+    frame: int
+    running_time: Optional[int] = None
+    commands: List[ScheduledCommand] = []
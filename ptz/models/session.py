@@ -0,0 +1,26 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Session model
+"""
+
+from pydantic import BaseModel
+
+from ptz.models.stream import Stream
+
+
+class Session(BaseModel):
+    """A PTZ session placed by the coordinator on one of the nodes
+    """
+    id: str
+    node: str
+    url: str
+    stream: Stream
@@ -0,0 +1,32 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Stream model
+"""
+
+from typing import Literal, Optional
+
+from pydantic import Field
+from rrmsutils.models.ptz.stream import Stream as BaseStream
+
+
+class Stream(BaseStream):
+    """Input and output of the PTZ. The input is an rtsp URI, a VST stream name or
+    shm://SOCKET_PATH for an input published by a decoder-publisher instance. The output
+    is sent over rtsp (out_port and out_mapping), to the WebRTC peers connected to
+    /webrtc, or both. framerate limits the output frames per second, dropping the extra
+    frames before the PTZ transform, so it can't be above the input frame rate.
+    keyframes_only drops every frame but the keyframes before decoding, for very low rate
+    outputs
+    """
+    output: Literal['rtsp', 'webrtc', 'both'] = 'rtsp'
+    framerate: Optional[int] = Field(default=None, gt=0)
+    keyframes_only: bool = False
@@ -0,0 +1,253 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class Mosaic
+"""
+
+from threading import Lock
+
+from rrmsutils.models.ptz.position import Position
+from rrmsutils.models.ptz.zoom import Zoom
+
+from ptz import pipeline
+from ptz.logger import Logger
+from ptz.media import Media
+from ptz.models.layout import Layout, Tile
+from ptz.probe import StreamProber
+
+logger = Logger.get_logger()
+
+
+class Mosaic():
+    """Class Mosaic, composites several PTZ views of one or more inputs into a single grid output.
+    """
+
+    def __init__(self, prober: StreamProber = None, backend: str = pipeline.GPU,
+                 latency_mode: str = pipeline.BALANCED, layout: Layout = None):
+        """Mosaic object. Each input is decoded once and shared by all its tiles, each tile has
+        its own PTZ element and the grid is composited and encoded once into a single rtsp
+        output.
+
+        Args:
+            prober (StreamProber, optional): Prober used to validate the inputs and get their frame rates. Defaults to a new prober.
+            backend (str, optional): GPU or CPU, see pipeline.describe. Defaults to GPU.
+            latency_mode (str, optional): One of pipeline.LATENCY_MODES. Defaults to BALANCED.
+            layout (Layout, optional): Layout to start with. Defaults to None (no mosaic).
+        """
+        self.__prober = StreamProber() if prober is None else prober
+        self.__backend = backend
+        self.__latency_mode = latency_mode
+        self.__media = None
+        self.__layout = None
+        self.__lock = Lock()
+
+        if layout is not None:
+            self.set_layout(layout)
+
+    def __pipeline(self, layout: Layout):
+        framerates = []
+        for probe in self.__prober.probe(layout.inputs):
+            if not probe.reachable:
+                logger.error(f'Mosaic input {probe.uri} is not reachable: {probe.error}')
+                return None
+            if probe.codec != 'video/x-h264':
+                logger.error(f'Mosaic input {probe.uri} is {probe.codec}, only video/x-h264 is supported')
+                return None
+            framerate = probe.framerate
+            if framerate is None or framerate.startswith('0/'):
+                framerate = '30/1'
+            framerates.append(framerate)
+
+        tiles = [self.__tile(layout, t) for t in range(layout.rows * layout.cols)]
+        return pipeline.describe_mosaic(layout.inputs, framerates,
+                                        [(tile.input, tile.pan, tile.tilt, tile.zoom) for tile in tiles],
+                                        layout.rows, layout.cols, layout.width, layout.height,
+                                        layout.out_port, layout.out_mapping, self.__backend,
+                                        self.__latency_mode)
+
+    def __tile(self, layout: Layout, index: int):
+        if index < len(layout.tiles):
+            return layout.tiles[index]
+        return Tile()
+
+    def get_layout(self):
+        """Get the current layout, with the tile poses currently in the pipeline
+
+        Returns:
+            Layout, None: the layout, None if there is no mosaic running.
+        """
+        with self.__lock:
+            if self.__media is None:
+                return None
+
+            tiles = []
+            for t in range(self.__layout.rows * self.__layout.cols):
+                tile = self.__tile(self.__layout, t)
+                pan = self.__media.get_property(f'tile{t}', 'pan')
+                tilt = self.__media.get_property(f'tile{t}', 'tilt')
+                zoom = self.__media.get_property(f'tile{t}', 'zoom')
+                tiles.append(Tile(input=tile.input,
+                                  pan=tile.pan if pan is None else pan,
+                                  tilt=tile.tilt if tilt is None else tilt,
+                                  zoom=tile.zoom if zoom is None else zoom))
+            return self.__layout.model_copy(update={'tiles': tiles})
+
+    def set_layout(self, layout: Layout):
+        """Build and play the mosaic pipeline for a layout, replacing the current one
+
+        Args:
+            layout (Layout): Inputs, grid, output size, tile poses and output port and mapping
+
+        Returns:
+            True or False: True if the mosaic is playing, False if the layout is not valid or the pipeline failed
+        """
+        for tile in layout.tiles:
+            if tile.input >= len(layout.inputs):
+                logger.error(f'Tile input {tile.input} out of range')
+                return False
+
+        if len(layout.tiles) > layout.rows * layout.cols:
+            logger.error('There are more tiles than cells in the grid')
+            return False
+
+        description = self.__pipeline(layout)
+        if description is None:
+            return False
+
+        with self.__lock:
+            self.__stop()
+            try:
+                if self.__backend == pipeline.CPU:
+                    # Imported here so that numpy is only loaded when the CPU element is used
+                    from ptz import cpuptz  # pylint: disable=import-outside-toplevel
+                    cpuptz.register()
+                self.__media = Media(description)
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error(f'Error parsing the mosaic pipeline, error: {repr(e)}')
+                self.__media = None
+                return False
+
+            self.__layout = layout
+            if self.__media.play() is False:
+                logger.error('Error playing the mosaic pipeline')
+                return False
+
+        logger.info(f'Mosaic {layout.rows}x{layout.cols} playing')
+        return True
+
+    def __stop(self):
+        if self.__media is not None:
+            self.__media.close()
+            self.__media = None
+            self.__layout = None
+
+    def stop(self):
+        """Stop the mosaic pipeline
+
+        Returns:
+            True or False: True if the mosaic was stopped, False if there was no mosaic running
+        """
+        with self.__lock:
+            if self.__media is None:
+                return False
+            self.__stop()
+        return True
+
+    def __tile_element(self, index):
+        if self.__media is None:
+            logger.warning('There is no mosaic created yet')
+            return None
+        if not 0 <= index < self.__layout.rows * self.__layout.cols:
+            logger.warning(f'There is no tile {index}')
+            return None
+        return f'tile{index}'
+
+    def get_position(self, index: int):
+        """Get the position of a tile
+
+        Args:
+            index (int): Tile index, row by row
+
+        Returns:
+            Position, None: the position, None if the tile doesn't exist.
+        """
+        element = self.__tile_element(index)
+        if element is None:
+            return None
+
+        pan = self.__media.get_property(element, 'pan')
+        tilt = self.__media.get_property(element, 'tilt')
+        if pan is None or tilt is None:
+            logger.error(f'Error getting position of tile {index}')
+            return None
+        return Position(pan=pan, tilt=tilt)
+
+    def set_position(self, index: int, position: Position):
+        """Set the position of a tile
+
+        Args:
+            index (int): Tile index, row by row
+            position (Position): pan and tilt to set
+
+        Returns:
+            True or False: True if the position is successfully set, False if the tile doesn't exist
+        """
+        element = self.__tile_element(index)
+        if element is None:
+            return False
+
+        if self.__media.set_property(element, 'pan', position.pan) is False or \
+                self.__media.set_property(element, 'tilt', position.tilt) is False:
+            logger.error(f'Error setting position of tile {index}')
+            return False
+
+        logger.info(f'Setting tile {index} position to {position}')
+        return True
+
+    def get_zoom(self, index: int):
+        """Get the zoom of a tile
+
+        Args:
+            index (int): Tile index, row by row
+
+        Returns:
+            Zoom, None: the zoom, None if the tile doesn't exist.
+        """
+        element = self.__tile_element(index)
+        if element is None:
+            return None
+
+        zoom = self.__media.get_property(element, 'zoom')
+        if zoom is None:
+            logger.error(f'Error getting zoom of tile {index}')
+            return None
+        return Zoom(zoom=zoom)
+
+    def set_zoom(self, index: int, zoom: Zoom):
+        """Set the zoom of a tile
+
+        Args:
+            index (int): Tile index, row by row
+            zoom (Zoom): zoom to set
+
+        Returns:
+            True or False: True if the zoom is successfully set, False if the tile doesn't exist
+        """
+        element = self.__tile_element(index)
+        if element is None:
+            return False
+
+        if self.__media.set_property(element, 'zoom', zoom.zoom) is False:
+            logger.error(f'Error setting zoom of tile {index}')
+            return False
+
+        logger.info(f'Setting tile {index} zoom to {zoom}')
+        return True
@@ -0,0 +1,276 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Pipeline descriptions
+"""
+
+from fractions import Fraction
+
+GPU = 'gpu'
+CPU = 'cpu'
+BACKENDS = (GPU, CPU)
+
+RTSP = 'rtsp'
+WEBRTC = 'webrtc'
+BOTH = 'both'
+OUTPUTS = (RTSP, WEBRTC, BOTH)
+
+# RTSP input transports: the rtspsrc default negotiation, or RTP interleaved in the TCP connection
+AUTO = 'auto'
+TCP = 'tcp'
+TRANSPORTS = (AUTO, TCP)
+
+# Scheme of the inputs published in shared memory, followed by the socket path
+SHM = 'shm://'
+
+ULTRA_LOW = 'ultra-low'
+BALANCED = 'balanced'
+SMOOTH = 'smooth'
+
+# Element properties of each latency mode. In ultra-low the raw video queues keep a single
+# frame and drop the oldest one when a stage falls behind, balanced keeps a few, and smooth
+# keeps the default queue limits and a larger jitter buffer so that no frame is dropped.
+# Queues with encoded data are only bounded in time, never leaky: dropping RTP packets or
+# encoded frames would corrupt the video until the next keyframe.
+# The queue and rtspsrc properties are all given, defaults included, because they are applied
+# to the running pipeline when the mode changes; see LIVE_LATENCY_ELEMENTS.
+LATENCY_MODES = {
+    ULTRA_LOW: {
+        'queue': 'max-size-buffers=1 max-size-bytes=0 max-size-time=0 leaky=downstream',
+        'encoded_queue': 'max-size-buffers=0 max-size-bytes=0 max-size-time=50000000 leaky=no',
+        'rtspsrc': 'latency=0 drop-on-latency=true',
+        'nvv4l2decoder': 'disable-dpb=true enable-max-performance=true',
+        'nvv4l2h264enc': 'maxperf-enable=true preset-level=1 poc-type=2',
+        'avdec_h264': 'max-threads=1',
+        'x264enc': 'tune=zerolatency speed-preset=ultrafast',
+    },
+    BALANCED: {
+        'queue': 'max-size-buffers=3 max-size-bytes=0 max-size-time=0 leaky=downstream',
+        'encoded_queue': 'max-size-buffers=0 max-size-bytes=0 max-size-time=200000000 leaky=no',
+        'rtspsrc': 'latency=50 drop-on-latency=false',
+        'nvv4l2decoder': 'enable-max-performance=true',
+        'nvv4l2h264enc': 'maxperf-enable=true',
+        'avdec_h264': '',
+        'x264enc': 'tune=zerolatency speed-preset=ultrafast',
+    },
+    SMOOTH: {
+        'queue': 'max-size-buffers=200 max-size-bytes=10485760 max-size-time=1000000000 leaky=no',
+        'encoded_queue': 'max-size-buffers=200 max-size-bytes=10485760 max-size-time=1000000000 leaky=no',
+        'rtspsrc': 'latency=200 drop-on-latency=false',
+        'nvv4l2decoder': '',
+        'nvv4l2h264enc': '',
+        'avdec_h264': '',
+        # zerolatency turns off the B-frames and the frame lookahead; B-frames are not allowed
+        # in the constrained baseline profile WebRTC peers negotiate
+        'x264enc': 'tune=zerolatency speed-preset=superfast',
+    },
+}
+
+# Queues of raw and encoded video that describe() names, with the LATENCY_MODES key of their
+# properties. The rtspsrc named src is not listed, its latency is handled with the jitter buffers.
+RAW_QUEUES = tuple(f'raw_queue{i}' for i in range(4))
+ENCODED_QUEUES = ('input_queue', 'output_queue')
+LIVE_LATENCY_ELEMENTS = {**{name: 'queue' for name in RAW_QUEUES},
+                         **{name: 'encoded_queue' for name in ENCODED_QUEUES}}
+
+
+def describe(in_uri: str, out_port: int, out_mapping: str, window_size: int,
+             framerate: str = '30/1', backend: str = GPU, latency_mode: str = BALANCED,
+             output: str = RTSP, input_caps: str = None, out_framerate: int = None,
+             lod_size: tuple = None, transport: str = AUTO):
+    """Build the description of the PTZ pipeline. The PTZ element is always named
+    rr_panorama_ptz, the source src, the parser of an rtsp input parser, the encoder
+    encoder and the sink rtspsink. A valve
+    named suspend_valve between the decoder and the PTZ element stops the PTZ and
+    encoding work while it drops. With lod_size the input is scaled before the PTZ element
+    by a capsfilter named lod_caps, see lod_caps(). With WebRTC output the encoded video goes through a tee
+    named output_tee, where the branches of the WebRTC peers are attached. The queues are
+    named as listed in LIVE_LATENCY_ELEMENTS.
+
+    Args:
+        in_uri (str): Input rtsp URI, or shm://SOCKET_PATH for an input published in shared memory
+        out_port (int): Output rtsp port
+        out_mapping (str): Output rtsp mapping
+        window_size (int): The size in pixels of the output PTZ window
+        framerate (str, optional): Input frame rate as a fraction. Defaults to '30/1'.
+        backend (str, optional): GPU for NVIDIA decoding, rrpanoramaptz and encoding; CPU for
+            software decoding and encoding with the rrpanoramaptzcpu element. Defaults to GPU.
+        latency_mode (str, optional): One of LATENCY_MODES, sets the queue limits, the rtspsrc
+            latency and the decoder and encoder latency settings. Defaults to BALANCED.
+        output (str, optional): RTSP, WEBRTC or BOTH. Defaults to RTSP.
+        input_caps (str, optional): Caps of the raw frames of a shm:// input. Defaults to None.
+        out_framerate (int, optional): Output frames per second, below the input frame rate. The
+            extra input frames are dropped before the PTZ element. Defaults to None (the input
+            frame rate).
+        lod_size (tuple, optional): (width, height) the input is scaled to before the PTZ
+            element. Defaults to None (no scaling).
+        transport (str, optional): AUTO or TCP, transport of an rtsp input. Defaults to AUTO.
+
+    Returns:
+        str: the pipeline description for Gst.parse_launch
+    """
+    d = window_size
+    mode = LATENCY_MODES[latency_mode]
+    queues = [f'queue name={name} {mode["queue"]}' for name in RAW_QUEUES]
+    sink = f'queue name=output_queue {mode["encoded_queue"]} ! rtspsink name=rtspsink service={out_port}'
+    if output == WEBRTC:
+        sink = 'tee name=output_tee allow-not-linked=true'
+    elif output == BOTH:
+        sink = f'tee name=output_tee allow-not-linked=true ! {sink}'
+    rate = ''
+    encoded_framerate = framerate
+    if out_framerate is not None:
+        rate = f'videorate drop-only=true max-rate={out_framerate} ! '
+        encoded_framerate = f'{out_framerate}/1'
+    gpu_scale = cpu_scale = ''
+    if lod_size is not None:
+        gpu_scale = f'capsfilter name=lod_caps caps="{lod_caps(*lod_size)}" ! '
+        cpu_scale = f'videoscale ! {gpu_scale}'
+    if in_uri.startswith(SHM):
+        source = f'shmsrc name=src socket-path={in_uri[len(SHM):]} is-live=true do-timestamp=true ! \
+                   capsfilter caps="{input_caps}"'
+    else:
+        source = _decode(in_uri, backend, mode, transport)
+
+    if backend == CPU:
+        return f'{source} ! capssetter caps=video/x-raw,framerate={framerate} ! \
+                 valve name=suspend_valve ! {rate}{queues[0]} ! {cpu_scale}videoconvert ! video/x-raw,format=RGBA ! {queues[1]} ! \
+                 rrpanoramaptzcpu name=rr_panorama_ptz ! video/x-raw,width={d},height={d} ! \
+                 {queues[2]} ! videoconvert ! {queues[3]} ! x264enc name=encoder {mode["x264enc"]} key-int-max=30 ! \
+                 capsfilter name=capsfilter caps="video/x-h264,framerate={encoded_framerate},mapping={out_mapping}" ! \
+                 {sink}'
+
+    return f'{source} ! capssetter caps=video/x-raw,framerate={framerate} ! \
+             valve name=suspend_valve ! {rate}{queues[0]} ! nvvidconv ! {gpu_scale}{queues[1]} ! rrpanoramaptz name=rr_panorama_ptz ! video/x-raw,width={d},height={d} ! \
+             {queues[2]} ! nvvidconv !  {queues[3]} !  nvv4l2h264enc name=encoder idrinterval=30  insert-sps-pps=true {mode["nvv4l2h264enc"]} ! \
+             capsfilter name=capsfilter caps="video/x-h264,framerate={encoded_framerate},mapping={out_mapping}" !  \
+             {sink}'
+
+
+def lod_caps(width: int, height: int):
+    """Caps of the lod_caps capsfilter for a resolution. They accept any memory type, so
+    they apply to NVMM and system memory alike.
+
+    Args:
+        width (int): Width the input is scaled to
+        height (int): Height the input is scaled to
+
+    Returns:
+        str: the caps
+    """
+    return f'video/x-raw(ANY),width={width},height={height}'
+
+
+def _decode(in_uri, backend, mode, transport=AUTO, index=''):
+    encoded_queue = f'queue name=input_queue{index} {mode["encoded_queue"]}'
+    protocols = ' protocols=tcp' if transport == TCP else ''
+    if backend == CPU:
+        return f'rtspsrc name=src{index} {mode["rtspsrc"]}{protocols} location={in_uri} ! {encoded_queue} ! rtph264depay ! \
+                 h264parse name=parser{index} ! avdec_h264 {mode["avdec_h264"]}'
+
+    return f'rtspsrc name=src{index} {mode["rtspsrc"]}{protocols} location={in_uri} ! {encoded_queue} !  rtph264depay ! \
+             h264parse name=parser{index} !  nvv4l2decoder {mode["nvv4l2decoder"]}'
+
+
+def describe_publisher(in_uri: str, socket_path: str, shm_size: int, backend: str = GPU,
+                       latency_mode: str = BALANCED):
+    """Build the description of a pipeline that decodes an input once and publishes the raw
+    frames in shared memory, for PTZ pipelines with a shm:// input. The sink is named shmsink,
+    it doesn't wait for readers and a leaky queue in front of it keeps slow readers from
+    stalling the decoding.
+
+    Args:
+        in_uri (str): Input rtsp URI
+        socket_path (str): Path of the control socket of the shared memory
+        shm_size (int): Size in bytes of the shared memory, it must hold several frames
+        backend (str, optional): GPU for NVIDIA decoding, CPU for software decoding. Defaults to GPU.
+        latency_mode (str, optional): One of LATENCY_MODES. Defaults to BALANCED.
+
+    Returns:
+        str: the pipeline description for Gst.parse_launch
+    """
+    source = _decode(in_uri, backend, LATENCY_MODES[latency_mode])
+    if backend == GPU:
+        # Frames are copied out of NVMM memory, it can't be shared with other processes
+        source = f'{source} ! nvvidconv ! video/x-raw,format=NV12'
+
+    # shmsink blocks when the readers hold every frame of the shared memory, the leaky queue
+    # drops the oldest frames meanwhile so the decoder and the rtsp session keep running
+    return f'{source} ! queue name=publish_queue max-size-buffers=1 max-size-bytes=0 max-size-time=0 \
+             leaky=downstream ! shmsink name=shmsink socket-path={socket_path} shm-size={shm_size} \
+             wait-for-connection=false sync=false'
+
+
+def describe_mosaic(inputs: list, framerates: list, tiles: list, rows: int, cols: int, width: int,
+                    height: int, out_port: int, out_mapping: str, backend: str = GPU,
+                    latency_mode: str = BALANCED):
+    """Build the description of a mosaic pipeline. Input i is decoded once into a tee named
+    in{i}, each tile t has its own PTZ element named tile{t} and the grid is composited and
+    encoded once. The sink is named rtspsink.
+
+    Args:
+        inputs (list): Input rtsp URIs
+        framerates (list): Frame rate of each input as a fraction
+        tiles (list): (input, pan, tilt, zoom) of every tile, row by row
+        rows (int): Rows of the grid
+        cols (int): Columns of the grid
+        width (int): Output width in pixels
+        height (int): Output height in pixels
+        out_port (int): Output rtsp port
+        out_mapping (str): Output rtsp mapping
+        backend (str, optional): GPU or CPU, as in describe(). Defaults to GPU.
+        latency_mode (str, optional): One of LATENCY_MODES. Defaults to BALANCED.
+
+    Returns:
+        str: the pipeline description for Gst.parse_launch
+    """
+    mode = LATENCY_MODES[latency_mode]
+    queue = f'queue {mode["queue"]}'
+    encoded_queue = f'queue {mode["encoded_queue"]}'
+    # The output runs at the rate of the fastest input
+    framerate = max(framerates, key=Fraction)
+    tile_width = width // cols
+    tile_height = height // rows
+    # Tile sizes must be even for the NV12 conversions
+    tile_width -= tile_width % 2
+    tile_height -= tile_height % 2
+
+    description = ''
+    for i, (in_uri, in_framerate) in enumerate(zip(inputs, framerates)):
+        description += f'{_decode(in_uri, backend, mode, index=i)} ! \
+                         capssetter caps=video/x-raw,framerate={in_framerate} ! \
+                         tee name=in{i} allow-not-linked=true '
+
+    if backend == CPU:
+        convert = f'videoconvert ! video/x-raw,format=RGBA ! {queue} ! rrpanoramaptzcpu'
+        to_compositor = ''
+        compositor = 'compositor name=comp '
+        output_caps = 'video/x-raw'
+        encoder = f'videoconvert ! {queue} ! x264enc {mode["x264enc"]} key-int-max=30'
+    else:
+        convert = f'nvvidconv ! {queue} ! rrpanoramaptz'
+        to_compositor = 'nvvidconv ! video/x-raw(memory:NVMM),format=RGBA ! '
+        compositor = 'nvcompositor name=comp '
+        output_caps = 'video/x-raw(memory:NVMM)'
+        encoder = f'nvvidconv ! {queue} ! nvv4l2h264enc idrinterval=30 insert-sps-pps=true {mode["nvv4l2h264enc"]}'
+
+    for t, (in_index, pan, tilt, zoom) in enumerate(tiles):
+        x = (t % cols) * tile_width
+        y = (t // cols) * tile_height
+        description += f'in{in_index}. ! {queue} ! {convert} name=tile{t} pan={pan} tilt={tilt} zoom={zoom} ! \
+                         video/x-raw,width={tile_width},height={tile_height} ! {to_compositor}{queue} ! comp.sink_{t} '
+        compositor += f'sink_{t}::xpos={x} sink_{t}::ypos={y} \
+                        sink_{t}::width={tile_width} sink_{t}::height={tile_height} '
+
+    return description + f'{compositor}! {output_caps},width={width},height={height},framerate={framerate} ! \
+                           {encoder} ! \
+                           capsfilter name=capsfilter caps="video/x-h264,framerate={framerate},mapping={out_mapping}" ! \
+                           {encoded_queue} ! rtspsink name=rtspsink service={out_port}'
@@ -0,0 +1,126 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class PresetStore
+"""
+
+import json
+import os
+import tempfile
+from threading import Lock
+
+from ptz.logger import Logger
+from ptz.models.preset import Preset
+
+logger = Logger.get_logger()
+
+
+class PresetStore():
+    """Class PresetStore, named poses persisted in a JSON file.
+    """
+
+    def __init__(self, path: str):
+        """PresetStore object. The presets are loaded once and served from memory; every
+        change rewrites the file atomically, so a crash never leaves it half written.
+
+        Args:
+            path (str): Path of the JSON file, created on the first change if it doesn't exist
+        """
+        self.__path = path
+        self.__lock = Lock()
+        self.__presets = self.__load()
+
+    def __load(self):
+        try:
+            with open(self.__path, encoding='utf-8') as presets_file:
+                presets = [Preset.model_validate(preset) for preset in json.load(presets_file)]
+        except FileNotFoundError:
+            return {}
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error(f'Error loading the presets from {self.__path}: {repr(e)}')
+            return {}
+
+        logger.info(f'Loaded {len(presets)} presets from {self.__path}')
+        return {preset.name: preset for preset in presets}
+
+    def __save(self, presets):
+        directory = os.path.dirname(os.path.abspath(self.__path))
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=directory, prefix='.presets-')
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as presets_file:
+                json.dump([preset.model_dump() for preset in presets.values()], presets_file, indent=2)
+                presets_file.flush()
+                os.fsync(presets_file.fileno())
+            os.replace(temporary, self.__path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+    def get_presets(self):
+        """Get all the presets
+
+        Returns:
+            list: Preset objects ordered by name
+        """
+        with self.__lock:
+            return [self.__presets[name] for name in sorted(self.__presets)]
+
+    def get_preset(self, name: str):
+        """Get a preset
+
+        Args:
+            name (str): Preset name
+
+        Returns:
+            Preset, None: the preset, None if it doesn't exist.
+        """
+        return self.__presets.get(name)
+
+    def put_preset(self, preset: Preset):
+        """Create or replace a preset
+
+        Args:
+            preset (Preset): The preset
+
+        Returns:
+            bool: True if the preset was saved, False if the file couldn't be written.
+        """
+        with self.__lock:
+            presets = dict(self.__presets)
+            presets[preset.name] = preset
+            return self.__commit(presets)
+
+    def delete_preset(self, name: str):
+        """Delete a preset
+
+        Args:
+            name (str): Preset name
+
+        Returns:
+            bool, None: True if the preset was deleted, False if the file couldn't be written,
+            None if the preset doesn't exist.
+        """
+        with self.__lock:
+            if name not in self.__presets:
+                return None
+            presets = dict(self.__presets)
+            del presets[name]
+            return self.__commit(presets)
+
+    def __commit(self, presets):
+        try:
+            self.__save(presets)
+        except OSError as e:
+            logger.error(f'Error writing the presets to {self.__path}: {repr(e)}')
+            return False
+        self.__presets = presets
+        return True
@@ -0,0 +1,130 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class StreamProber
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+
+from ptz import media
+from ptz.logger import Logger
+from ptz.models.probe import ProbeResult
+
+logger = Logger.get_logger()
+
+
+class StreamProber():
+    """Class StreamProber, discovers the codec, resolution, frame rate and reachability of inputs.
+    """
+
+    def __init__(self, timeout: float = 3.0, ttl: float = 60.0, negative_ttl: float = 5.0, workers: int = 8):
+        """StreamProber object. Inputs are probed in parallel with a GStreamer discoverer and
+        the results are cached per URI, so repeated requests for the same input are answered
+        without connecting to it again.
+
+        Args:
+            timeout (float, optional): Seconds to wait for an input to be discovered. Defaults to 3.0.
+            ttl (float, optional): Seconds a probe result is kept in the cache. Defaults to 60.0.
+            negative_ttl (float, optional): Seconds the result of an unreachable input is kept in the cache. Defaults to 5.0.
+            workers (int, optional): Maximum number of inputs probed at the same time. Defaults to 8.
+        """
+        self.__timeout = timeout
+        self.__ttl = ttl
+        self.__negative_ttl = negative_ttl
+        self.__executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='probe')
+        self.__lock = Lock()
+        self.__cache = {}
+
+    def __discover(self, uri):
+        media.init()
+        # pylint: disable=import-outside-toplevel
+        import gi
+        gi.require_version('GstPbutils', '1.0')
+        from gi.repository import GstPbutils
+
+        start = time.monotonic()
+        try:
+            discoverer = GstPbutils.Discoverer.new(int(self.__timeout * media.Gst.SECOND))
+            info = discoverer.discover_uri(uri)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.warning(f'Error probing {uri}: {e}')
+            return ProbeResult(uri=uri, reachable=False, error=str(e))
+
+        if info.get_result() != GstPbutils.DiscovererResult.OK:
+            return ProbeResult(uri=uri, reachable=False, error=info.get_result().value_nick)
+
+        videos = info.get_video_streams()
+        if not videos:
+            return ProbeResult(uri=uri, reachable=True, error='no video stream')
+
+        video = videos[0]
+        caps = video.get_caps()
+        result = ProbeResult(uri=uri, reachable=True,
+                             codec=caps.get_structure(0).get_name() if caps else None,
+                             width=video.get_width(), height=video.get_height(),
+                             framerate=f'{video.get_framerate_num()}/{video.get_framerate_denom()}')
+        logger.info(
+            f'Probed {uri} in {(time.monotonic() - start) * 1000:.0f} ms: {result}')
+        return result
+
+    def __cached(self, uri):
+        with self.__lock:
+            entry = self.__cache.get(uri)
+        if entry is None:
+            return None
+
+        probed_at, result = entry
+        ttl = self.__ttl if result.reachable else self.__negative_ttl
+        return result if time.monotonic() - probed_at <= ttl else None
+
+    def __probe(self, uri):
+        result = self.__discover(uri)
+        with self.__lock:
+            self.__cache[uri] = (time.monotonic(), result)
+        return result
+
+    def probe(self, uris: list, refresh: bool = False):
+        """Probe several inputs in parallel
+
+        Args:
+            uris (list): Input URIs
+            refresh (bool, optional): Ignore the cached results. Defaults to False.
+
+        Returns:
+            list: a ProbeResult per URI, in the same order.
+        """
+        results = {}
+        pending = {}
+        for uri in uris:
+            cached = None if refresh else self.__cached(uri)
+            if cached is not None:
+                results[uri] = cached
+            elif uri not in pending:
+                pending[uri] = self.__executor.submit(self.__probe, uri)
+
+        for uri, future in pending.items():
+            results[uri] = future.result()
+
+        return [results[uri] for uri in uris]
+
+    def probe_one(self, uri: str, refresh: bool = False):
+        """Probe a single input
+
+        Args:
+            uri (str): Input URI
+            refresh (bool, optional): Ignore the cached result. Defaults to False.
+
+        Returns:
+            ProbeResult: the input capabilities.
+        """
+        return self.probe([uri], refresh)[0]
@@ -0,0 +1,211 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class Profiler
+"""
+
+import io
+import json
+import sys
+import tarfile
+import threading
+import time
+import traceback
+from collections import Counter
+
+from ptz import media
+from ptz.logger import Logger
+
+logger = Logger.get_logger()
+
+# Measurements taken during a capture. GStreamer tracers can't be removed once created, so
+# they are taken with pad probes installed for the capture and removed when it ends:
+#   proctime: time a buffer spends in an element, from its sink pad to its src pad
+#   latency: time from the first pad a timestamp is seen in to a sink element
+#   queuelevels: buffers and time held by every queue, polled with the stack samples
+TRACERS = ('proctime', 'latency', 'queuelevels')
+
+# Timestamps remembered per pad to match buffers, older ones are forgotten
+PENDING_TIMESTAMPS = 64
+
+
+class Profiler():
+    """Class Profiler, captures a bounded profile of the running service.
+    """
+
+    def __init__(self, max_seconds: float = 30.0, sample_interval: float = 0.01,
+                 max_log_lines: int = 200000, max_stacks: int = 5000):
+        """Profiler object. A capture measures the latency, processing time and queue levels
+        of the pipeline elements (see TRACERS), samples the Python stacks of every thread,
+        dumps the pipeline graph and packs everything in a tar.gz archive. Only one capture
+        runs at a time, every buffer is bounded and the pipeline is left untouched
+        afterwards, so it is safe to trigger on a loaded system.
+
+        Args:
+            max_seconds (float, optional): Longest capture allowed. Defaults to 30.0.
+            sample_interval (float, optional): Seconds between stack samples. Defaults to 0.01.
+            max_log_lines (int, optional): Maximum tracer lines kept. Defaults to 200000.
+            max_stacks (int, optional): Maximum distinct stacks kept. Defaults to 5000.
+        """
+        self.__max_seconds = max_seconds
+        self.__sample_interval = sample_interval
+        self.__max_log_lines = max_log_lines
+        self.__max_stacks = max_stacks
+        self.__lock = threading.Lock()
+
+    def __attach(self, elements, lines, probes):
+        """Install the proctime and latency probes, adding the (pad, probe id) to remove to probes"""
+        Gst = media.Gst  # pylint: disable=invalid-name
+        # Buffers are probed from several streaming threads
+        lock = threading.Lock()
+        seen = {}
+
+        def log(line):
+            if len(lines) < self.__max_log_lines:
+                lines.append(line)
+
+        def remember(times, pts, now):
+            times[pts] = now
+            if len(times) > PENDING_TIMESTAMPS:
+                del times[next(iter(times))]
+
+        def on_sink(name, entered, is_sink):
+            def probe(pad, info):  # pylint: disable=unused-argument
+                pts = info.get_buffer().pts
+                if pts == Gst.CLOCK_TIME_NONE:
+                    return Gst.PadProbeReturn.OK
+                now = time.monotonic_ns()
+                with lock:
+                    remember(entered, pts, now)
+                    first = seen.get(pts)
+                    if first is None:
+                        remember(seen, pts, now)
+                if first is not None and is_sink:
+                    log(f'latency, element=(string){name}, time=(guint64){now - first};')
+                return Gst.PadProbeReturn.OK
+            return probe
+
+        def on_src(name, entered):
+            def probe(pad, info):  # pylint: disable=unused-argument
+                pts = info.get_buffer().pts
+                if pts == Gst.CLOCK_TIME_NONE:
+                    return Gst.PadProbeReturn.OK
+                now = time.monotonic_ns()
+                with lock:
+                    start = entered.pop(pts, None)
+                    if pts not in seen:
+                        remember(seen, pts, now)
+                if start is not None:
+                    log(f'proctime, element=(string){name}, time=(guint64){now - start};')
+                return Gst.PadProbeReturn.OK
+            return probe
+
+        for element in elements:
+            if isinstance(element, Gst.Bin):
+                continue
+            name = element.get_name()
+            entered = {}
+            for pad in element.sinkpads:
+                probes.append((pad, pad.add_probe(Gst.PadProbeType.BUFFER,
+                                                  on_sink(name, entered, not element.srcpads))))
+            for pad in element.srcpads:
+                probes.append((pad, pad.add_probe(Gst.PadProbeType.BUFFER, on_src(name, entered))))
+
+    def __queue_levels(self, queues, lines):
+        for queue in queues:
+            if len(lines) >= self.__max_log_lines:
+                return
+            lines.append(f'queuelevels, element=(string){queue.get_name()}, '
+                         f'buffers=(guint){queue.get_property("current-level-buffers")}, '
+                         f'time=(guint64){queue.get_property("current-level-time")};')
+
+    def __sample(self, stop, stacks, queues, lines):
+        own = threading.get_ident()
+        while not stop.wait(self.__sample_interval):
+            self.__queue_levels(queues, lines)
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():  # pylint: disable=protected-access
+                if ident == own:
+                    continue
+                calls = [f'{entry.filename}:{entry.name}:{entry.lineno}'
+                         for entry in traceback.extract_stack(frame)]
+                stack = ';'.join([names.get(ident, str(ident))] + calls)
+                if stack in stacks or len(stacks) < self.__max_stacks:
+                    stacks[stack] += 1
+
+    def capture(self, pipeline_media, seconds: float):
+        """Capture a profile
+
+        Args:
+            pipeline_media (Media): Media with the pipeline to trace, None to only sample stacks
+            seconds (float): Capture duration, limited to max_seconds
+
+        Returns:
+            bytes, None: the tar.gz archive, None if another capture is running.
+        """
+        if not self.__lock.acquire(blocking=False):
+            logger.warning('There is a profile capture running already')
+            return None
+
+        try:
+            return self.__capture(pipeline_media, min(max(seconds, 0.1), self.__max_seconds))
+        finally:
+            self.__lock.release()
+
+    def __capture(self, pipeline_media, seconds):
+        media.init()
+        lines = []
+        elements = [] if pipeline_media is None else pipeline_media.get_elements()
+        queues = [element for element in elements if element.get_factory() is not None and
+                  element.get_factory().get_name() == 'queue']
+
+        logger.info(f'Starting a {seconds} s profile capture')
+        started = time.time()
+        stacks = Counter()
+        stop = threading.Event()
+        sampler = threading.Thread(target=self.__sample, args=(stop, stacks, queues, lines), daemon=True)
+        probes = []
+        try:
+            self.__attach(elements, lines, probes)
+            sampler.start()
+            time.sleep(seconds)
+        finally:
+            stop.set()
+            if sampler.is_alive():
+                sampler.join()
+            for pad, probe_id in probes:
+                if probe_id:
+                    pad.remove_probe(probe_id)
+
+        dot = None if pipeline_media is None else pipeline_media.dot_graph()
+        summary = {'started': started, 'seconds': seconds, 'tracer_lines': len(lines),
+                   'truncated': len(lines) >= self.__max_log_lines,
+                   'stack_samples': sum(stacks.values()), 'tracers': list(TRACERS)}
+
+        files = {
+            'summary.json': json.dumps(summary, indent=2),
+            'tracers.log': '\n'.join(lines),
+            'stacks.folded': '\n'.join(f'{stack} {count}' for stack, count in stacks.most_common()),
+        }
+        if dot is not None:
+            files['pipeline.dot'] = dot
+
+        archive = io.BytesIO()
+        with tarfile.open(fileobj=archive, mode='w:gz') as tar:
+            for name, content in files.items():
+                data = content.encode()
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                info.mtime = int(started)
+                tar.addfile(info, io.BytesIO(data))
+
+        logger.info(f'Profile capture done: {len(lines)} tracer lines, {summary["stack_samples"]} stack samples')
+        return archive.getvalue()
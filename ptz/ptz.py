@@ -11,13 +11,33 @@
 """Class PTZ
 """
 
-from mmj_utils.vst import VST
+import math
+import time
+from threading import Lock, Thread
+
 from rrmsutils.models.ptz.position import Position
-from rrmsutils.models.ptz.stream import Stream
 from rrmsutils.models.ptz.zoom import Zoom
 
+from ptz import pipeline
+from ptz.clients import count_clients
+from ptz.events import EventHub
+from ptz.history import PoseHistory
+from ptz.jitter import JitterTuner
+from ptz.lod import LevelOfDetail
 from ptz.logger import Logger
 from ptz.media import Media
+from ptz.models.history import Heatmap, History, PoseSample
+from ptz.models.input import InputStats
+from ptz.models.output import OutputStats
+from ptz.models.preset import MAX_TRANSITION, Preset, Tour
+from ptz.models.schedule import Schedule
+from ptz.models.stream import Stream
+from ptz.probe import StreamProber
+from ptz.profiler import Profiler
+from ptz.publisher import read_caps
+from ptz.scheduler import Scheduler
+from ptz.tour import TourRunner
+from ptz.webrtc import WebRTCOutput
 
 logger = Logger.get_logger()
 
@@ -26,7 +46,29 @@ class PTZ():
     """Class PTZ, defines the functions of pan, tilt, and zoom.
     """
 
-    def __init__(self, vst_uri="http://127.0.0.1:81", window_size: int = 500):
+    STARTING = 'starting'
+    PLAYING = 'playing'
+    STREAMING = 'streaming'
+    ERROR = 'error'
+    # Reported for a pipeline running in another process that doesn't answer
+    DOWN = 'down'
+
+    # Seconds between checks of the output clients
+    CLIENTS_INTERVAL = 0.2
+
+    # Seconds between updates of the input jitter buffer
+    TUNE_INTERVAL = 1.0
+
+    # Seconds without frames before a streaming pipeline goes back to PLAYING, above the
+    # keyframe interval for keyframes_only streams
+    STALL_TIMEOUT = 5.0
+
+    def __init__(self, vst_uri="http://127.0.0.1:81", window_size: int = 500, start_time: float = None,
+                 stream: Stream = None, position: Position = None, zoom: Zoom = None,
+                 events: EventHub = None, prober: StreamProber = None, backend: str = pipeline.GPU,
+                 latency_mode: str = pipeline.BALANCED, suspend_grace: float = 10.0,
+                 lod_levels: int = 4, min_latency: int = 0, max_latency: int = 1000,
+                 tcp_loss: float = 0.05):
         """PTZ object. It receives an input rtsp stream, performs pan, tilt and zoom (PTZ) operations
         on it and generates a new rtsp stream with the result. The input video can be given as a regular
         rtsp URI or an NVIDIA VST stream name.
@@ -34,15 +76,97 @@ class PTZ():
         Args:
             vst_uri (str, optional): The URL of NVIDIA VST service. Defaults to "http://127.0.0.1:81".
             window_size (int, optional): The size in pixels of the output PTZ window. The resolution in pixels will be (Size x Size). Defaults to 500.
+            start_time (float, optional): time.monotonic() value used as reference to measure the time to first frame. Defaults to the construction time.
+            stream (Stream, optional): Initial stream. Defaults to the first VST stream with output in port 5021 and mapping ptz_out.
+            position (Position, optional): Initial position, applied once the pipeline is created. Defaults to the element defaults.
+            zoom (Zoom, optional): Initial zoom, applied once the pipeline is created. Defaults to the element defaults.
+            events (EventHub, optional): Hub where position, zoom, stream, latency mode, output clients and pipeline state changes are published. Defaults to a new hub.
+            prober (StreamProber, optional): Prober used to validate the inputs before building the pipeline. Defaults to a new prober.
+            backend (str, optional): pipeline.GPU to use the rrpanoramaptz element and NVIDIA codecs, pipeline.CPU to use the rrpanoramaptzcpu element and software codecs. Defaults to pipeline.GPU.
+            latency_mode (str, optional): One of pipeline.LATENCY_MODES. Defaults to pipeline.BALANCED.
+            suspend_grace (float, optional): Seconds without output clients before the PTZ transform and the encoder are suspended, None to never suspend. Defaults to 10.0.
+            lod_levels (int, optional): Number of resolutions the input is scaled to before the PTZ depending on the zoom, 1 to never scale. Defaults to 4.
+            min_latency (int, optional): Lowest latency in milliseconds of the rtsp input jitter buffer, adapted to the measured jitter. Defaults to 0.
+            max_latency (int, optional): Highest latency in milliseconds of the rtsp input jitter buffer. Defaults to 1000.
+            tcp_loss (float, optional): Fraction of lost packets that switches an rtsp input to TCP interleaved transport, None to never switch. Defaults to 0.05.
         """
         self.__in_uri = None
         self.__out_port = None
         self.__out_mapping = None
+        self.__output = pipeline.RTSP
         self.__media = None
+        self.__webrtc = None
         self.__vst_uri = vst_uri
         self.__window_size = window_size
+        self.__backend = backend
+        self.__latency_mode = latency_mode
+        self.__stream = None
+        self.__suspend_grace = suspend_grace
+        self.__lod_levels = lod_levels
+        self.__lod = None
+        self.__min_latency = min_latency
+        self.__max_latency = max_latency
+        self.__tcp_loss = tcp_loss
+        self.__transport = pipeline.AUTO
+        self.__tuner = None
+        self.__clients = None
+        self.__suspended_since = None
+        self.__time_suspended = 0.0
+        self.__lock = Lock()
+        self.__state = PTZ.STARTING
+        self.__start_time = time.monotonic() if start_time is None else start_time
+        self.__stream_start_time = None
+        self.__time_to_first_frame = None
+        # Only the frames of this pipeline count for the state
+        self.__frame_source = None
+        self.__last_frame = None
+        # The last pose is kept as plain values, models are only built when they are needed
+        self.__pan = None if position is None else position.pan
+        self.__tilt = None if position is None else position.tilt
+        self.__zoom = None if zoom is None else zoom.zoom
+        self.__events = EventHub() if events is None else events
+        self.__prober = StreamProber() if prober is None else prober
+        self.__scheduler = Scheduler()
+        self.__profiler = Profiler()
+        self.__history = PoseHistory()
+        self.__tour = TourRunner(self.recall)
+        self.__transition = []
+        self.__recall_lock = Lock()
+        self.__fps = 30.0
+        self.__frame = 0
+        self.__running_time = None
+
+        if stream is None:
+            stream = Stream(in_uri="", out_port=5021, out_mapping="ptz_out")
+
+        # The initial pipeline is brought up in the background so that a slow
+        # or unreachable VST doesn't delay the API.
+        Thread(target=self.set_stream, args=(stream,), daemon=True).start()
+        Thread(target=self.__watch_clients, daemon=True).start()
+        Thread(target=self.__tune_input, daemon=True).start()
+
+    def __set_state(self, state):
+        if state != self.__state:
+            self.__state = state
+            self.__events.publish('pipeline', {'state': state})
+
+    def get_state(self):
+        """Get the state of the pipeline. STARTING while it is built, PLAYING until frames reach
+        the PTZ element and again after STALL_TIMEOUT without them, STREAMING while they flow,
+        and ERROR if the stream couldn't be set or the pipeline failed and is reconnecting.
 
-        self.set_stream(Stream(in_uri="", out_port=5021, out_mapping="ptz_out"))
+        Returns:
+            str: one of PTZ.STARTING, PTZ.PLAYING, PTZ.STREAMING or PTZ.ERROR
+        """
+        return self.__state
+
+    def get_time_to_first_frame(self):
+        """Get the time it took the first frame to reach the PTZ element
+
+        Returns:
+            float, None: seconds since the service start, None if no frame has been processed yet.
+        """
+        return self.__time_to_first_frame
 
     def get_position(self):
         """Get the position (pan and tilt) in the rrpanorama ptz pipeline element
@@ -97,6 +221,10 @@ class PTZ():
             logger.error('Error setting tilt in the pipeline')
             return False
 
+        self.__pan = position.pan
+        self.__tilt = position.tilt
+        self.__record_pose()
+        self.__events.publish('position', {'pan': position.pan, 'tilt': position.tilt})
         logger.info(f'Setting Position to {position}')
         return True
 
@@ -140,9 +268,245 @@ class PTZ():
             logger.error('Error setting zoom')
             return False
 
+        self.__zoom = zoom.zoom
+        self.__record_pose()
+        self.__update_lod(zoom.zoom)
+        self.__events.publish('zoom', {'zoom': zoom.zoom})
         logger.info(f'Setting zoom to {zoom}')
         return True
 
+    def apply_pose(self, pan: float = None, tilt: float = None, zoom: float = None):
+        """Fast path to set the pose in the rrpanorama ptz pipeline element. The values are
+        expected to be validated by the caller, and nothing is logged on success.
+
+        Args:
+            pan (float, optional): Pan in degrees. Defaults to None (unchanged).
+            tilt (float, optional): Tilt in degrees. Defaults to None (unchanged).
+            zoom (float, optional): Zoom. Defaults to None (unchanged).
+
+        Returns:
+            True or False: True if the pose is successfully set, False if the element doesn't exist in the pipeline
+        """
+        media = self.__media
+        element = None if media is None else media.get_element('rr_panorama_ptz')
+        if element is None:
+            return False
+
+        try:
+            if pan is not None:
+                element.set_property('pan', pan)
+            if tilt is not None:
+                element.set_property('tilt', tilt)
+            if zoom is not None:
+                element.set_property('zoom', zoom)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error(f'Error applying pose: {e}')
+            return False
+
+        if pan is not None or tilt is not None:
+            if pan is None:
+                pan = 0.0 if self.__pan is None else self.__pan
+            if tilt is None:
+                tilt = 0.0 if self.__tilt is None else self.__tilt
+            self.__pan = pan
+            self.__tilt = tilt
+            self.__events.publish('position', {'pan': pan, 'tilt': tilt})
+        if zoom is not None:
+            self.__zoom = zoom
+            self.__update_lod(zoom)
+            self.__events.publish('zoom', {'zoom': zoom})
+        self.__history.record(self.__pan, self.__tilt, self.__zoom)
+        return True
+
+    def __update_lod(self, zoom):
+        lod = self.__lod
+        size = None if lod is None else lod.select(zoom)
+        if size is None:
+            return
+
+        # The capsfilter renegotiates between two frames, none is dropped
+        media = self.__media
+        if media is not None and media.set_caps('lod_caps', pipeline.lod_caps(*size)):
+            logger.info(f'Scaling the input to {size[0]}x{size[1]} for zoom {zoom}')
+
+    def __record_pose(self):
+        self.__history.record(self.__pan, self.__tilt, self.__zoom)
+
+    def get_history(self, start: float = None, end: float = None, points: int = 500):
+        """Get the poses applied in a time range
+
+        Args:
+            start (float, optional): Start of the range, seconds since the epoch. Defaults to the oldest pose kept.
+            end (float, optional): End of the range, seconds since the epoch. Defaults to the newest pose.
+            points (int, optional): Maximum number of poses returned, the range is downsampled to it. Defaults to 500.
+
+        Returns:
+            History: the poses
+        """
+        samples, total = self.__history.query(start, end, points)
+        # Unknown values are stored as NaN
+        rows = [[None if math.isnan(value) else value for value in row] for row in samples.tolist()]
+        return History(total=total, samples=[PoseSample(time=row[0], pan=row[1], tilt=row[2], zoom=row[3])
+                                             for row in rows])
+
+    def get_heatmap(self, start: float = None, end: float = None, pan_bins: int = 36, tilt_bins: int = 18):
+        """Get the time spent looking at each region of the sphere in a time range
+
+        Args:
+            start (float, optional): Start of the range, seconds since the epoch. Defaults to the oldest pose kept.
+            end (float, optional): End of the range, seconds since the epoch. Defaults to now.
+            pan_bins (int, optional): Number of pan bins. Defaults to 36.
+            tilt_bins (int, optional): Number of tilt bins. Defaults to 18.
+
+        Returns:
+            Heatmap: the dwell time per bin
+        """
+        dwell = self.__history.heatmap(start, end, pan_bins, tilt_bins)
+        return Heatmap(pan_bins=pan_bins, tilt_bins=tilt_bins, total_time=float(dwell.sum()),
+                       dwell=dwell.tolist())
+
+    def schedule_pose(self, pan: float = None, tilt: float = None, zoom: float = None,
+                      frame: int = None, running_time: int = None):
+        """Schedule a pose change to be applied exactly on a frame. The command is applied on
+        the PTZ element sink pad, right before the frame is transformed.
+
+        Args:
+            pan (float, optional): Pan in degrees. Defaults to None (unchanged).
+            tilt (float, optional): Tilt in degrees. Defaults to None (unchanged).
+            zoom (float, optional): Zoom. Defaults to None (unchanged).
+            frame (int, optional): Frame number, counted from 0 since the stream was set. Defaults to None.
+            running_time (int, optional): Pipeline running time in nanoseconds, used if frame is None. Defaults to None.
+
+        Returns:
+            ScheduledCommand, None: the scheduled command, None if neither frame nor running_time is given.
+        """
+        try:
+            command = self.__scheduler.schedule(frame=frame, running_time=running_time,
+                                                pan=pan, tilt=tilt, zoom=zoom)
+        except ValueError as e:
+            logger.error(f'Error scheduling pose: {e}')
+            return None
+
+        logger.info(f'Scheduled {command}')
+        return command
+
+    def cancel_scheduled(self, command_id: int):
+        """Cancel a scheduled pose change
+
+        Args:
+            command_id (int): Identifier of the scheduled command
+
+        Returns:
+            True or False: True if the command was cancelled, False if it doesn't exist or was already applied
+        """
+        return self.__scheduler.cancel(command_id)
+
+    def get_schedule(self):
+        """Get the current frame and running time of the PTZ element and the pending commands
+
+        Returns:
+            Schedule: the schedule
+        """
+        return Schedule(frame=self.__frame, running_time=self.__running_time,
+                        commands=self.__scheduler.get_commands())
+
+    def recall(self, preset: Preset, transition: float = 0.0):
+        """Move to a preset. Without transition the whole pose is applied on the next frame,
+        like a position set directly. With a transition one pose per frame is scheduled,
+        easing from the current pose to the preset, with the pan taking the shortest way
+        around and the zoom changing geometrically. A new recall replaces the transition in
+        progress.
+
+        Args:
+            preset (Preset): The preset
+            transition (float, optional): Seconds to reach the preset, at most MAX_TRANSITION. Defaults to 0.0.
+
+        Returns:
+            bool: True if the pose was applied or scheduled, False if there is no pipeline.
+        """
+        pan, tilt, zoom = preset.position.pan, preset.position.tilt, preset.zoom.zoom
+        with self.__recall_lock:
+            for command_id in self.__transition:
+                self.__scheduler.cancel(command_id)
+            self.__transition = []
+
+            if self.__state != PTZ.STREAMING or self.__suspended_since is not None:
+                # No frames reach the PTZ element to apply the pose on
+                return self.apply_pose(pan, tilt, zoom)
+
+            # One command per frame, for the whole transition at the current frame rate
+            frames = int(min(transition, MAX_TRANSITION) * self.__fps)
+            start_pan, start_tilt, start_zoom = self.__pan, self.__tilt, self.__zoom
+            if start_pan is None or start_tilt is None or start_zoom is None or start_zoom <= 0:
+                frames = 0
+
+            first = self.__frame
+            commands = []
+            for step in range(1, frames):
+                t = step / frames
+                t = t * t * (3 - 2 * t)
+                pan_delta = (pan - start_pan + 180) % 360 - 180
+                commands.append(self.__scheduler.schedule(
+                    frame=first + step - 1,
+                    pan=(start_pan + pan_delta * t + 180) % 360 - 180,
+                    tilt=start_tilt + (tilt - start_tilt) * t,
+                    zoom=start_zoom * (zoom / start_zoom) ** t))
+            commands.append(self.__scheduler.schedule(frame=first + max(frames - 1, 0),
+                                                      pan=pan, tilt=tilt, zoom=zoom))
+            self.__transition = [command.id for command in commands]
+            logger.info(f'Recalling preset {preset.name} in {len(commands)} frames')
+            return True
+
+    def start_tour(self, tour: Tour, presets: list):
+        """Start recalling presets in order, replacing the current tour
+
+        Args:
+            tour (Tour): The tour
+            presets (list): Preset objects of tour.presets, in the same order
+
+        Returns:
+            bool: True
+        """
+        self.__tour.start(tour, presets)
+        return True
+
+    def stop_tour(self):
+        """Stop the current tour
+
+        Returns:
+            bool: True if a tour was stopped, False if none was running.
+        """
+        return self.__tour.stop()
+
+    def get_tour(self):
+        """Get the current tour
+
+        Returns:
+            TourStatus: the tour and the preset it is on
+        """
+        return self.__tour.get_status()
+
+    def profile(self, seconds: float):
+        """Capture a profile of the pipeline and the Python threads
+
+        Args:
+            seconds (float): Capture duration
+
+        Returns:
+            bytes, None: the tar.gz archive, None if another capture is running.
+        """
+        return self.__profiler.capture(self.__media, seconds)
+
+    def __on_ptz_input(self, pad, buffer):
+        frame = self.__frame
+        running_time = Media.running_time(pad, buffer)
+        self.__frame = frame + 1
+        self.__running_time = running_time
+
+        for command in self.__scheduler.pop_due(frame, running_time):
+            self.apply_pose(command.pan, command.tilt, command.zoom)
+        return True
+
     def get_stream(self):
         """Get the in_stream, the out_port and the out_mapping in the pipeline
 
@@ -153,14 +517,20 @@ class PTZ():
             logger.warning('There is no pipeline created yet')
             return None
 
-        in_uri_obtained = self.__media.get_property('src', 'location')
+        if self.__in_uri.startswith(pipeline.SHM):
+            in_uri_obtained = self.__in_uri
+        else:
+            in_uri_obtained = self.__media.get_property('src', 'location')
 
         if in_uri_obtained is None:
             logger.error('Error getting in_uri')
             return None
 
-        out_port_obtained = self.__media.get_property(
-            'rtspsink', 'service')
+        if self.__output == pipeline.WEBRTC:
+            out_port_obtained = self.__out_port
+        else:
+            out_port_obtained = self.__media.get_property(
+                'rtspsink', 'service')
 
         if out_port_obtained is None:
             logger.error('Error getting out_port')
@@ -173,10 +543,14 @@ class PTZ():
             return None
 
         logger.info('Getting: in_uri, out_port and out_mapping')
-        return Stream(in_uri=in_uri_obtained, out_port=out_port_obtained, out_mapping=out_mapping_obtained)
+        stream = self.__stream
+        return Stream(in_uri=in_uri_obtained, out_port=out_port_obtained, out_mapping=out_mapping_obtained,
+                      output=self.__output, framerate=stream.framerate, keyframes_only=stream.keyframes_only)
 
     def __get_vst_stream(self, name):
         try:
+            from mmj_utils.vst import VST  # pylint: disable=import-outside-toplevel
+
             vst = VST(self.__vst_uri)
 
             vst_rtsp_streams = vst.get_rtsp_streams()
@@ -207,6 +581,234 @@ class PTZ():
         Returns:
             json, False, or error: json -> contanis the obtained pan and tilt values, False if the element doesn't exist in the pipeline, or error if there is an exception.
         """
+        with self.__lock:
+            self.__set_state(PTZ.STARTING)
+            # Frames of the pipeline being replaced don't make the new one streaming
+            self.__frame_source = None
+            self.__stream_start_time = time.monotonic()
+            if self.__stream is None or stream.in_uri != self.__stream.in_uri:
+                # A new input starts with the default transport negotiation
+                self.__transport = pipeline.AUTO
+            self.__stream = stream
+
+            if self.__start_stream(stream) is False:
+                self.__set_state(PTZ.ERROR)
+                # The pipeline left running, if any, reports its frames again
+                self.__frame_source = self.__media
+                return False
+
+            if self.__state == PTZ.STARTING:
+                self.__set_state(PTZ.PLAYING)
+            self.__events.publish('stream', {'in_uri': self.__in_uri, 'out_port': self.__out_port,
+                                             'out_mapping': self.__out_mapping})
+            return True
+
+    def add_webrtc_peer(self, offer: str):
+        """Add a WebRTC peer receiving the output
+
+        Args:
+            offer (str): SDP offer of the peer
+
+        Returns:
+            tuple, None: (peer id, SDP answer), None if the output has no WebRTC or the peer couldn't be added.
+        """
+        webrtc = self.__webrtc
+        if webrtc is None:
+            logger.error("The output doesn't have WebRTC")
+            return None
+        return webrtc.add_peer(offer)
+
+    def remove_webrtc_peer(self, peer_id: str):
+        """Remove a WebRTC peer
+
+        Args:
+            peer_id (str): Id returned by add_webrtc_peer
+
+        Returns:
+            bool: True if the peer was removed, False if it doesn't exist.
+        """
+        webrtc = self.__webrtc
+        return webrtc is not None and webrtc.remove_peer(peer_id)
+
+    def get_latency_mode(self):
+        """Get the latency mode of the pipeline
+
+        Returns:
+            str: one of pipeline.LATENCY_MODES
+        """
+        return self.__latency_mode
+
+    def set_latency_mode(self, latency_mode: str):
+        """Set the latency mode. The queue limits and the input jitter buffer latency are
+        applied to the running pipeline; the decoder and encoder settings of the mode can
+        only be set when they start, they take effect the next time the pipeline is built.
+
+        Args:
+            latency_mode (str): One of pipeline.LATENCY_MODES
+
+        Returns:
+            bool: True if the mode was set, False otherwise.
+        """
+        if latency_mode not in pipeline.LATENCY_MODES:
+            logger.error(f'Unknown latency mode {latency_mode}')
+            return False
+
+        self.__latency_mode = latency_mode
+        media = self.__media
+        if media is not None:
+            self.__apply_latency_mode(media, self.__tuner, latency_mode)
+        self.__events.publish('latency', {'mode': latency_mode})
+        logger.info(f'Latency mode set to {latency_mode}')
+        return True
+
+    @staticmethod
+    def __apply_latency_mode(media, tuner, latency_mode):
+        mode = pipeline.LATENCY_MODES[latency_mode]
+        for element_name, key in pipeline.LIVE_LATENCY_ELEMENTS.items():
+            # output_queue only exists with an rtsp output
+            if media.get_element(element_name) is not None:
+                media.set_arguments(element_name, mode[key])
+
+        if tuner is not None:
+            # rtspsrc hands its settings to the jitter buffers of the next connections
+            media.set_arguments('src', mode['rtspsrc'])
+            tuner.reset(media.get_property('src', 'latency'),
+                        media.get_property('src', 'drop-on-latency'))
+
+    def get_output_stats(self):
+        """Get the number of output clients and the time spent suspended
+
+        Returns:
+            OutputStats: the output statistics
+        """
+        suspended_since = self.__suspended_since
+        time_suspended = self.__time_suspended
+        if suspended_since is not None:
+            time_suspended += time.monotonic() - suspended_since
+        return OutputStats(clients=self.__clients, suspended=suspended_since is not None,
+                           time_suspended=time_suspended)
+
+    def get_input_stats(self):
+        """Get the RTP statistics of the input and the jitter buffer settings
+
+        Returns:
+            InputStats: the input statistics
+        """
+        tuner = self.__tuner
+        if tuner is None:
+            return InputStats()
+        return tuner.get_stats()
+
+    def __tune_input(self):
+        while True:
+            time.sleep(PTZ.TUNE_INTERVAL)
+            tuner = self.__tuner
+            if tuner is None or self.__state != PTZ.STREAMING:
+                continue
+
+            stats = tuner.update()
+            # The tuner asks once; the new pipeline closes this one and gets a TCP tuner
+            if tuner.fall_back() and self.__transport == pipeline.AUTO:
+                logger.warning(f'Input loss at {stats.loss:.1%}, switching to TCP interleaved transport')
+                self.__transport = pipeline.TCP
+                self.set_stream(self.__stream)
+
+    def __watch_clients(self):
+        idle_since = time.monotonic()
+        while True:
+            time.sleep(PTZ.CLIENTS_INTERVAL)
+            clients = None
+            if self.__output != pipeline.WEBRTC and self.__out_port is not None:
+                clients = count_clients(self.__out_port)
+            webrtc = self.__webrtc
+            if webrtc is not None:
+                clients = (clients or 0) + webrtc.get_peer_count()
+            if clients != self.__clients:
+                self.__clients = clients
+                self.__publish_output()
+
+            now = time.monotonic()
+            if clients is None or clients > 0:
+                idle_since = now
+                if self.__suspended_since is not None:
+                    self.__suspend(False)
+            elif (self.__suspend_grace is not None and self.__suspended_since is None
+                  and now - idle_since >= self.__suspend_grace):
+                self.__suspend(True)
+
+            # Input loss: no frames while nothing is holding them back
+            if (self.__state == PTZ.STREAMING and self.__suspended_since is None
+                    and now - self.__last_frame >= PTZ.STALL_TIMEOUT):
+                logger.warning(f'No frames for {now - self.__last_frame:.1f} s, waiting for the input')
+                self.__set_state(PTZ.PLAYING)
+
+    def __suspend(self, suspend):
+        media = self.__media
+        if media is None or media.set_property('suspend_valve', 'drop', suspend) is False:
+            return
+
+        if suspend:
+            self.__suspended_since = time.monotonic()
+            logger.info('No output clients, suspending the PTZ and encoding')
+        else:
+            # The clients need a keyframe to start decoding
+            media.force_key_unit('encoder')
+            self.__end_suspension()
+            logger.info('Output client connected, resuming the PTZ and encoding')
+        self.__publish_output()
+
+    def __end_suspension(self):
+        suspended_since, self.__suspended_since = self.__suspended_since, None
+        if suspended_since is not None:
+            now = time.monotonic()
+            self.__time_suspended += now - suspended_since
+            # The frames held back by the valve don't count as input loss
+            self.__last_frame = now
+
+    def __publish_output(self):
+        self.__events.publish('output', {'clients': self.__clients,
+                                         'suspended': self.__suspended_since is not None})
+
+    @staticmethod
+    def __on_encoded_frame(pad, buffer):  # pylint: disable=unused-argument
+        # Only keyframes are decoded, the rest are dropped before the decoder
+        return not Media.is_delta_unit(buffer)
+
+    def __on_frame(self, media):
+        if media is not self.__frame_source:
+            return True
+
+        now = time.monotonic()
+        self.__last_frame = now
+        if self.__state == PTZ.STREAMING:
+            return True
+
+        self.__set_state(PTZ.STREAMING)
+        logger.info(
+            f'Frames flowing {(now - self.__stream_start_time) * 1000:.1f} ms after the stream was set')
+
+        if self.__time_to_first_frame is None:
+            self.__time_to_first_frame = now - self.__start_time
+            logger.info(
+                f'Time to first frame: {self.__time_to_first_frame * 1000:.1f} ms')
+        return True
+
+    def __on_error(self, media, message):
+        if media is self.__frame_source:
+            logger.error(f'Pipeline error, waiting for frames after the reconnection: {message}')
+            self.__set_state(PTZ.ERROR)
+
+    def __start_stream(self, stream: Stream):
+        if stream.in_uri.startswith(pipeline.SHM):
+            # Frames published by another process, the caps are published next to them
+            self.__in_uri = stream.in_uri
+            published = read_caps(stream.in_uri[len(pipeline.SHM):])
+            if published is None:
+                logger.error(f'There is no input published in {stream.in_uri}')
+                return False
+
+            caps, framerate, width, height = published
+            return self.__start_pipeline(stream, framerate, (width, height), caps)
 
         if stream.in_uri.startswith("rtsp://"):
             self.__in_uri = stream.in_uri
@@ -219,23 +821,91 @@ class PTZ():
             self.__in_uri = stream_uri
             logger.info(f"Using VST uri {stream} for {stream.in_uri}")
 
+        # Reject bad inputs before building the pipeline, otherwise they are
+        # only detected asynchronously on the bus and retried forever
+        probe = self.__prober.probe_one(self.__in_uri)
+        if not probe.reachable:
+            logger.error(f'Input {self.__in_uri} is not reachable: {probe.error}')
+            return False
+        if probe.codec != 'video/x-h264':
+            logger.error(f'Input {self.__in_uri} is {probe.codec}, only video/x-h264 is supported')
+            return False
+
+        return self.__start_pipeline(stream, probe.framerate, (probe.width, probe.height))
+
+    def __start_pipeline(self, stream, framerate, in_size, input_caps=None):
+        if framerate is None or framerate.startswith('0/'):
+            framerate = '30/1'
+        numerator, _, denominator = framerate.partition('/')
+        in_fps = int(numerator) / int(denominator or 1)
+        out_framerate = stream.framerate
+        if out_framerate is not None:
+            # videorate only drops frames, it can't raise the rate. The rounded up input
+            # rate is accepted, so that 30 can be requested for a 30000/1001 input
+            if out_framerate > math.ceil(in_fps):
+                logger.error(f'The output frame rate {out_framerate} is above the input frame rate {framerate}')
+                return False
+            if out_framerate >= in_fps:
+                out_framerate = None
+        self.__fps = in_fps if out_framerate is None else out_framerate
+        if stream.keyframes_only:
+            # Too few frames for a transition, recalls jump to the preset
+            self.__fps = 0.0
+
+        self.__lod = None
+        lod_size = None
+        if self.__lod_levels > 1 and None not in in_size:
+            self.__lod = LevelOfDetail(*in_size, self.__window_size, levels=self.__lod_levels)
+            self.__lod.select(1.0 if self.__zoom is None else self.__zoom)
+            lod_size = self.__lod.get_size()
+
         self.__out_port = stream.out_port
         self.__out_mapping = stream.out_mapping
+        self.__output = stream.output
 
         try:
-            d = self.__window_size
-            pipeline = f'rtspsrc name=src latency=10 location={self.__in_uri} ! queue !  rtph264depay ! \
-                         h264parse !  nvv4l2decoder ! capssetter caps=video/x-raw,framerate=30/1 ! \
-                         queue ! nvvidconv ! queue ! rrpanoramaptz name=rr_panorama_ptz ! video/x-raw,width={d},height={d} ! \
-                         queue ! nvvidconv !  queue !  nvv4l2h264enc  idrinterval=30  insert-sps-pps=true ! \
-                         capsfilter name=capsfilter caps="video/x-h264,framerate=30/1,mapping={self.__out_mapping}" !  \
-                         queue ! rtspsink name=rtspsink service={self.__out_port}'
-            self.__media = Media(pipeline)
+            if self.__backend == pipeline.CPU:
+                # Imported here so that numpy is only loaded when the CPU element is used
+                from ptz import cpuptz  # pylint: disable=import-outside-toplevel
+                cpuptz.register()
+            description = pipeline.describe(self.__in_uri, self.__out_port, self.__out_mapping,
+                                             self.__window_size, framerate, self.__backend,
+                                             self.__latency_mode, self.__output, input_caps,
+                                             out_framerate, lod_size, self.__transport)
+            self.__scheduler.clear()
+            self.__frame = 0
+            self.__running_time = None
+            # The valve of the new pipeline starts open
+            self.__end_suspension()
+            # The previous pipeline holds the input session and the output port
+            previous, self.__media = self.__media, None
+            if previous is not None:
+                previous.close()
+            media = self.__media = Media(description)
+            # Peers of the previous pipeline are gone, they have to connect again
+            self.__webrtc = None if self.__output == pipeline.RTSP else WebRTCOutput(media)
+            self.__tuner = None if input_caps is not None else \
+                JitterTuner(media, self.__transport, self.__min_latency, self.__max_latency,
+                            self.__tcp_loss)
+            media.add_buffer_probe(
+                'rr_panorama_ptz', 'sink', self.__on_ptz_input)
+            media.add_buffer_probe(
+                'rr_panorama_ptz', 'src', lambda pad, buffer: self.__on_frame(media))
+            media.add_error_handler(lambda message: self.__on_error(media, message))
+            if stream.keyframes_only and input_caps is None:
+                media.add_buffer_probe('parser', 'src', self.__on_encoded_frame)
         except Exception as e:
             logger.error(f'Error parsing the pipeline, error: {repr(e)}')
             return False
 
-        media_play_result = self.__media.play()
+        # Keep the last pose on the new pipeline
+        if self.__pan is not None and self.__tilt is not None:
+            self.set_position(Position(pan=self.__pan, tilt=self.__tilt))
+        if self.__zoom is not None:
+            self.set_zoom(Zoom(zoom=self.__zoom))
+
+        self.__frame_source = media
+        media_play_result = media.play()
 
         if media_play_result is False:
             logger.error('Error playing the pipeline')
@@ -0,0 +1,152 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class InputPublisher
+"""
+
+import os
+import re
+from threading import Event
+
+from ptz import pipeline
+from ptz.logger import Logger
+from ptz.media import Media
+from ptz.probe import StreamProber
+
+logger = Logger.get_logger()
+
+# Number of frames the shared memory holds. shmsink blocks while the readers hold all of them,
+# then the leaky queue in front of it drops the oldest frames instead of stalling the decoder
+# and the input, see pipeline.describe_publisher()
+SHM_FRAMES = 8
+# Frame size used when the input resolution can't be probed (3840x2160 NV12)
+DEFAULT_FRAME_SIZE = 3840 * 2160 * 3 // 2
+
+
+def caps_path(socket_path: str):
+    """Path of the file with the caps of the frames published in socket_path
+
+    Args:
+        socket_path (str): Path of the shared memory control socket
+
+    Returns:
+        str: the caps file path
+    """
+    return f'{socket_path}.caps'
+
+
+def read_caps(socket_path: str):
+    """Read the caps of the frames published in a shared memory
+
+    Args:
+        socket_path (str): Path of the shared memory control socket
+
+    Returns:
+        tuple, None: (caps, framerate, width, height), None if nothing is published there.
+        Unknown values are None.
+    """
+    try:
+        with open(caps_path(socket_path), encoding='utf-8') as caps_file:
+            caps = caps_file.read().strip()
+    except OSError:
+        return None
+
+    framerate = re.search(r'framerate=\(fraction\)(\d+/\d+)', caps)
+    width = re.search(r'width=\(int\)(\d+)', caps)
+    height = re.search(r'height=\(int\)(\d+)', caps)
+    return (caps, framerate.group(1) if framerate else None,
+            int(width.group(1)) if width else None, int(height.group(1)) if height else None)
+
+
+class InputPublisher():
+    """Class InputPublisher, decodes an input once and publishes the frames in shared memory.
+    """
+
+    def __init__(self, in_uri: str, socket_path: str, backend: str = pipeline.GPU,
+                 latency_mode: str = pipeline.BALANCED, prober: StreamProber = None):
+        """InputPublisher object. Several PTZ instances can read the frames with a
+        shm://SOCKET_PATH input, attaching and detaching at any time without affecting the
+        publisher or each other. The caps of the frames are written next to the socket, in
+        SOCKET_PATH.caps, since shared memory doesn't carry them.
+
+        Args:
+            in_uri (str): Input rtsp URI
+            socket_path (str): Path of the shared memory control socket
+            backend (str, optional): pipeline.GPU or pipeline.CPU decoding. Defaults to pipeline.GPU.
+            latency_mode (str, optional): One of pipeline.LATENCY_MODES. Defaults to pipeline.BALANCED.
+            prober (StreamProber, optional): Prober used to size the shared memory. Defaults to a new prober.
+        """
+        self.__in_uri = in_uri
+        self.__socket_path = socket_path
+        self.__backend = backend
+        self.__latency_mode = latency_mode
+        self.__prober = StreamProber() if prober is None else prober
+        self.__caps = None
+        self.__media = None
+
+    def start(self):
+        """Start publishing
+
+        Returns:
+            bool: True if the pipeline is playing, False otherwise.
+        """
+        probe = self.__prober.probe_one(self.__in_uri)
+        frame_size = DEFAULT_FRAME_SIZE
+        if probe.width and probe.height:
+            frame_size = probe.width * probe.height * 3 // 2
+        else:
+            logger.warning(f"Couldn't probe the resolution of {self.__in_uri}, sizing for 4K frames")
+
+        description = pipeline.describe_publisher(self.__in_uri, self.__socket_path,
+                                                  frame_size * SHM_FRAMES, self.__backend,
+                                                  self.__latency_mode)
+        try:
+            self.__media = Media(description)
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error(f'Error creating the publisher pipeline: {repr(e)}')
+            return False
+        self.__media.add_buffer_probe('shmsink', 'sink', self.__on_frame)
+
+        logger.info(f'Publishing {self.__in_uri} in {self.__socket_path}')
+        return self.__media.play()
+
+    def __on_frame(self, pad, buffer):  # pylint: disable=unused-argument
+        caps = pad.get_current_caps()
+        if caps is None:
+            return True
+
+        caps = caps.to_string()
+        if caps != self.__caps:
+            self.__caps = caps
+            # Readers must never see a partially written file
+            path = caps_path(self.__socket_path)
+            with open(f'{path}.tmp', 'w', encoding='utf-8') as caps_file:
+                caps_file.write(caps)
+            os.replace(f'{path}.tmp', path)
+            logger.info(f'Published caps {caps}')
+        return True
+
+    def run(self):
+        """Start publishing and block until interrupted
+        """
+        if self.start() is False:
+            return
+
+        try:
+            Event().wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.__media.close()
+            try:
+                os.remove(caps_path(self.__socket_path))
+            except OSError:
+                pass
@@ -0,0 +1,124 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class Scheduler
+"""
+
+import heapq
+import itertools
+from threading import Lock
+
+from ptz.models.schedule import ScheduledCommand
+
+
+class Scheduler():
+    """Class Scheduler, holds pose commands until the frame or running time they target.
+    """
+
+    def __init__(self):
+        """Scheduler object. Commands are kept in two heaps, one ordered by frame number and
+        one by running time, so finding the due commands for a frame is O(log n) per command.
+        Cancelled commands are dropped lazily when they reach the top of their heap.
+        """
+        self.__lock = Lock()
+        self.__ids = itertools.count(1)
+        self.__by_frame = []
+        self.__by_time = []
+        self.__commands = {}
+
+    def schedule(self, frame: int = None, running_time: int = None,
+                 pan: float = None, tilt: float = None, zoom: float = None):
+        """Schedule a pose change
+
+        Args:
+            frame (int, optional): Frame number on which the command is applied. Defaults to None.
+            running_time (int, optional): Pipeline running time in nanoseconds on which the command is applied, used if frame is None. Defaults to None.
+            pan (float, optional): Pan in degrees. Defaults to None (unchanged).
+            tilt (float, optional): Tilt in degrees. Defaults to None (unchanged).
+            zoom (float, optional): Zoom. Defaults to None (unchanged).
+
+        Returns:
+            ScheduledCommand: the scheduled command. Raises ValueError if neither frame nor running_time is given.
+        """
+        if frame is None and running_time is None:
+            raise ValueError('A frame or a running time is required')
+
+        with self.__lock:
+            command = ScheduledCommand(id=next(self.__ids), pan=pan, tilt=tilt, zoom=zoom,
+                                       frame=frame, running_time=None if frame is not None else running_time)
+            if frame is not None:
+                heapq.heappush(self.__by_frame, (frame, command.id))
+            else:
+                heapq.heappush(self.__by_time, (running_time, command.id))
+            self.__commands[command.id] = command
+        return command
+
+    def cancel(self, command_id: int):
+        """Cancel a pending command
+
+        Args:
+            command_id (int): Identifier returned by schedule()
+
+        Returns:
+            True or False: True if the command was cancelled, False if it doesn't exist or was already applied
+        """
+        with self.__lock:
+            return self.__commands.pop(command_id, None) is not None
+
+    def clear(self):
+        """Cancel all the pending commands
+        """
+        with self.__lock:
+            self.__commands.clear()
+            self.__by_frame.clear()
+            self.__by_time.clear()
+
+    def get_commands(self):
+        """Get the pending commands
+
+        Returns:
+            list: ScheduledCommand objects ordered by identifier
+        """
+        with self.__lock:
+            return [self.__commands[command_id] for command_id in sorted(self.__commands)]
+
+    def __pop(self, heap, target, due):
+        while heap and heap[0][0] <= target:
+            _, command_id = heapq.heappop(heap)
+            command = self.__commands.pop(command_id, None)
+            if command is not None:
+                due.append(command)
+
+    def pop_due(self, frame: int, running_time: int = None):
+        """Get and remove the commands due on a frame. Commands whose target already passed
+        are due on the first frame after they were scheduled.
+
+        Args:
+            frame (int): Current frame number
+            running_time (int, optional): Running time of the current frame in nanoseconds. Defaults to None (time commands are not checked).
+
+        Returns:
+            list: due ScheduledCommand objects, in scheduling order
+        """
+        due = []
+        with self.__lock:
+            if not self.__commands:
+                # Only cancelled entries may be left
+                self.__by_frame.clear()
+                self.__by_time.clear()
+                return due
+
+            self.__pop(self.__by_frame, frame, due)
+            if running_time is not None:
+                self.__pop(self.__by_time, running_time, due)
+
+        due.sort(key=lambda command: command.id)
+        return due
@@ -0,0 +1,124 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class TourRunner
+"""
+
+import time
+from threading import Condition, Thread
+
+from ptz.logger import Logger
+from ptz.models.preset import Tour, TourStatus
+
+logger = Logger.get_logger()
+
+
+class TourRunner():
+    """Class TourRunner, recalls the presets of a tour in order.
+    """
+
+    def __init__(self, recall):
+        """TourRunner object. Each tour is timed by its own thread, so it keeps its pace
+        without any client timer, whether a pipeline is running or not. Starting or stopping
+        a tour bumps a generation number, which wakes up and ends the thread of the previous
+        one.
+
+        Args:
+            recall (callable): Called as recall(preset, transition) for each step
+        """
+        self.__recall = recall
+        self.__changed = Condition()
+        self.__generation = 0
+        self.__tour = None
+        self.__presets = None
+        self.__index = None
+
+    def start(self, tour: Tour, presets: list):
+        """Start a tour, replacing the current one. The first preset is recalled right away.
+
+        Args:
+            tour (Tour): The tour
+            presets (list): Preset objects of tour.presets, in the same order
+        """
+        with self.__changed:
+            self.__finish()
+            generation = self.__generation
+            self.__tour = tour
+            self.__presets = presets
+            self.__index = 0
+
+        Thread(target=self.__run, args=(generation, tour.transition + tour.dwell), name='tour',
+               daemon=True).start()
+        logger.info(f'Starting tour of {len(presets)} presets every {tour.transition + tour.dwell} s')
+
+    def stop(self):
+        """Stop the current tour
+
+        Returns:
+            bool: True if a tour was stopped, False if none was running.
+        """
+        with self.__changed:
+            running = self.__tour is not None
+            self.__finish()
+        if running:
+            logger.info('Tour stopped')
+        return running
+
+    def get_status(self):
+        """Get the current tour
+
+        Returns:
+            TourStatus: the tour and the preset it is on
+        """
+        with self.__changed:
+            if self.__tour is None:
+                return TourStatus(running=False)
+            return TourStatus(running=True, tour=self.__tour, index=self.__index,
+                              preset=self.__presets[self.__index].name)
+
+    def __finish(self):
+        self.__generation += 1
+        self.__tour = None
+        self.__presets = None
+        self.__index = None
+        self.__changed.notify_all()
+
+    def __step(self, generation, advance):
+        with self.__changed:
+            if generation != self.__generation:
+                return False
+
+            if advance:
+                self.__index += 1
+                if self.__index == len(self.__presets):
+                    if not self.__tour.loop:
+                        self.__finish()
+                        logger.info('Tour finished')
+                        return False
+                    self.__index = 0
+            preset = self.__presets[self.__index]
+            transition = self.__tour.transition
+
+        self.__recall(preset, transition)
+        return True
+
+    def __run(self, generation, period):
+        # Steps are timed from the start of the tour, so slow recalls don't shift the
+        # next ones
+        deadline = time.monotonic()
+        advance = False
+        while self.__step(generation, advance):
+            advance = True
+            deadline += period
+            with self.__changed:
+                if self.__changed.wait_for(lambda: self.__generation != generation,
+                                           deadline - time.monotonic()):
+                    return
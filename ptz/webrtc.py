@@ -0,0 +1,195 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Class WebRTCOutput
+"""
+
+import re
+import uuid
+from threading import Event, Lock, Thread
+
+from ptz import media
+from ptz.logger import Logger
+
+logger = Logger.get_logger()
+
+
+def _constrained_baseline(profile_level_id: str):
+    """Whether a profile-level-id is constrained baseline: baseline with constraint_set1, or
+    main with constraint_set0 (RFC 6184 section 8.1)"""
+    try:
+        profile_idc, profile_iop = int(profile_level_id[0:2], 16), int(profile_level_id[2:4], 16)
+    except ValueError:
+        return False
+    return (profile_idc == 0x42 and profile_iop & 0x40 != 0) or \
+        (profile_idc == 0x4d and profile_iop & 0x80 != 0)
+
+
+def payload_type(offer: str):
+    """Choose the H264 payload type of an SDP offer. Browsers list several H264 variants,
+    the one with packetization-mode=1 and constrained baseline profile is preferred.
+
+    Args:
+        offer (str): SDP offer
+
+    Returns:
+        int, None: the payload type, None if the offer doesn't accept H264.
+    """
+    types = re.findall(r'^a=rtpmap:(\d+) H264/90000', offer, re.MULTILINE | re.IGNORECASE)
+    if not types:
+        return None
+
+    fmtp = {}
+    for pt, parameters in re.findall(r'^a=fmtp:(\d+) (.*?)\r?$', offer, re.MULTILINE):
+        fmtp[pt] = dict(parameter.strip().lower().partition('=')[::2]
+                        for parameter in parameters.split(';'))
+    # Mode 1 is non-interleaved: NAL units, fragmented or aggregated, in decoding order
+    non_interleaved = [pt for pt in types if fmtp.get(pt, {}).get('packetization-mode') == '1']
+    baseline = [pt for pt in non_interleaved
+                if _constrained_baseline(fmtp[pt].get('profile-level-id', ''))]
+    return int((baseline or non_interleaved or types)[0])
+
+
+class WebRTCOutput():
+    """Class WebRTCOutput, sends the encoded PTZ output to WebRTC peers.
+    """
+
+    def __init__(self, pipeline_media, tee_name: str = 'output_tee', encoder_name: str = 'encoder',
+                 gather_timeout: float = 2.0):
+        """WebRTCOutput object. Each peer gets a payloader and a webrtcbin attached to the tee
+        after the encoder, so the video is encoded once for all of them. Signaling follows
+        WHEP: the peer sends an offer and receives a complete answer, without trickle ICE.
+
+        Args:
+            pipeline_media (Media): Media with the PTZ pipeline
+            tee_name (str, optional): Tee with the encoded video. Defaults to 'output_tee'.
+            encoder_name (str, optional): Encoder asked for a keyframe when a peer joins. Defaults to 'encoder'.
+            gather_timeout (float, optional): Seconds to wait for the ICE candidates of an answer. Defaults to 2.0.
+        """
+        media.init()
+        # pylint: disable=import-outside-toplevel
+        import gi
+        gi.require_version('GstSdp', '1.0')
+        gi.require_version('GstWebRTC', '1.0')
+        from gi.repository import GstSdp, GstWebRTC
+
+        self.__sdp = GstSdp
+        self.__webrtc = GstWebRTC
+        self.__media = pipeline_media
+        self.__tee_name = tee_name
+        self.__encoder_name = encoder_name
+        self.__gather_timeout = gather_timeout
+        self.__lock = Lock()
+        self.__peers = {}
+
+    def get_peer_count(self):
+        """Get the number of connected peers
+
+        Returns:
+            int: the number of peers
+        """
+        return len(self.__peers)
+
+    def add_peer(self, offer: str):
+        """Add a peer from its SDP offer
+
+        Args:
+            offer (str): SDP offer of the peer, receiving H264 video
+
+        Returns:
+            tuple, None: (peer id, SDP answer), None if the peer couldn't be added.
+        """
+        pt = payload_type(offer)
+        if pt is None:
+            logger.error("The WebRTC offer doesn't accept H264 video")
+            return None
+
+        Gst = media.Gst  # pylint: disable=invalid-name
+        result, message = self.__sdp.SDPMessage.new_from_text(offer)
+        if result != self.__sdp.SDPResult.OK:
+            logger.error('Invalid WebRTC offer')
+            return None
+
+        # The queue is leaky so that a slow peer can't stall the tee and the other outputs,
+        # the peer recovers with the next keyframe
+        branch = self.__media.add_branch(
+            self.__tee_name,
+            'queue leaky=downstream max-size-buffers=0 max-size-bytes=0 max-size-time=200000000 ! '
+            'rtph264pay config-interval=-1 aggregate-mode=zero-latency ! '
+            f'application/x-rtp,media=video,encoding-name=H264,clock-rate=90000,payload={pt} ! '
+            'webrtcbin name=webrtc bundle-policy=max-bundle')
+        if branch is None:
+            return None
+
+        peer_id = uuid.uuid4().hex
+        webrtc = branch.get_by_name('webrtc')
+        gathered = Event()
+        webrtc.connect('notify::ice-gathering-state', self.__on_gathering_state, gathered)
+        webrtc.connect('notify::connection-state', self.__on_connection_state, peer_id)
+        with self.__lock:
+            self.__peers[peer_id] = branch
+
+        try:
+            description = self.__webrtc.WebRTCSessionDescription.new(
+                self.__webrtc.WebRTCSDPType.OFFER, message)
+            promise = Gst.Promise.new()
+            webrtc.emit('set-remote-description', description, promise)
+            promise.wait()
+
+            promise = Gst.Promise.new()
+            webrtc.emit('create-answer', None, promise)
+            promise.wait()
+            answer = promise.get_reply().get_value('answer')
+
+            promise = Gst.Promise.new()
+            webrtc.emit('set-local-description', answer, promise)
+            promise.wait()
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            logger.error(f'Error negotiating with the WebRTC peer: {repr(e)}')
+            self.remove_peer(peer_id)
+            return None
+
+        if not gathered.wait(self.__gather_timeout):
+            logger.warning('Timeout gathering ICE candidates, answering with the ones found')
+
+        self.__media.force_key_unit(self.__encoder_name)
+        logger.info(f'WebRTC peer {peer_id} added, {len(self.__peers)} peers')
+        return peer_id, webrtc.get_property('local-description').sdp.as_text()
+
+    def __on_gathering_state(self, webrtc, pspec, gathered):  # pylint: disable=unused-argument
+        if webrtc.get_property('ice-gathering-state') == self.__webrtc.WebRTCICEGatheringState.COMPLETE:
+            gathered.set()
+
+    def __on_connection_state(self, webrtc, pspec, peer_id):  # pylint: disable=unused-argument
+        state = webrtc.get_property('connection-state')
+        if state in (self.__webrtc.WebRTCPeerConnectionState.FAILED,
+                     self.__webrtc.WebRTCPeerConnectionState.CLOSED):
+            logger.info(f'WebRTC peer {peer_id} disconnected')
+            # Removing the bin from its own streaming thread would deadlock
+            Thread(target=self.remove_peer, args=(peer_id,), daemon=True).start()
+
+    def remove_peer(self, peer_id: str):
+        """Remove a peer
+
+        Args:
+            peer_id (str): Id returned by add_peer
+
+        Returns:
+            bool: True if the peer was removed, False if it doesn't exist.
+        """
+        with self.__lock:
+            branch = self.__peers.pop(peer_id, None)
+        if branch is None:
+            return False
+
+        self.__media.remove_branch(branch)
+        logger.info(f'WebRTC peer {peer_id} removed, {len(self.__peers)} peers')
+        return True
@@ -0,0 +1,305 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Pipeline worker process
+"""
+
+import itertools
+import multiprocessing
+import time
+from threading import Event, Lock, Thread
+
+from rrmsutils.models.ptz.position import Position
+from rrmsutils.models.ptz.zoom import Zoom
+
+from ptz.events import EventHub
+from ptz.logger import Logger
+
+logger = Logger.get_logger()
+
+# Objects a worker can serve
+PTZ_TARGET = 'ptz'
+MOSAIC_TARGET = 'mosaic'
+
+# State handed to a restarted worker through the constructor of the object it serves
+RESTORED = ('stream', 'position', 'zoom', 'latency_mode')
+MOSAIC_RESTORED = ('layout',)
+
+# Events of the worker that carry restored state, with the model of the argument they update.
+# They cover the poses set without a setter call: apply_pose, the local control socket, preset
+# recalls, tours and scheduled commands
+RESTORED_EVENTS = {'position': Position, 'zoom': Zoom}
+
+# Messages exchanged with the worker are small tuples:
+#   API -> worker: (seq, method, args)
+#   worker -> API: (seq, REPLY, result), (seq, FAILURE, message) or
+#                  (None, EVENT, (kind, data)) for the events published in the worker
+REPLY = 0
+FAILURE = 1
+EVENT = 2
+
+# Long running methods, served in their own thread so they don't hold the other calls
+BACKGROUND = ('profile', 'set_stream', 'set_layout')
+
+# Seconds to wait for methods that take longer than a regular call. Setting the stream looks
+# up VST, probes the input and builds the pipeline, setting a mosaic layout probes every input
+TIMEOUTS = {'set_stream': 30.0, 'set_layout': 30.0}
+
+
+def _forward_events(events, send):
+    """Send the state changes published in the worker, coalesced as the observers get them"""
+    since = 0
+    while True:
+        if events.wait(since, 60.0) == since:
+            continue
+
+        since, changes = events.states(since)
+        for kind, _, data in changes:
+            send((None, EVENT, (kind, data)))
+
+
+def _serve(conn, target, kwargs, local_socket):
+    """Worker process entry point: creates a PTZ or a Mosaic and serves the calls received on conn"""
+    # pylint: disable=import-outside-toplevel
+    from ptz.localcontrol import LocalControl
+    from ptz.logger import Logger as WorkerLogger
+    from ptz.mosaic import Mosaic
+    from ptz.ptz import PTZ
+
+    WorkerLogger.init()
+    send_lock = Lock()
+
+    def send(message):
+        with send_lock:
+            conn.send(message)
+
+    events = EventHub()
+    Thread(target=_forward_events, args=(events, send), daemon=True).start()
+    if target == MOSAIC_TARGET:
+        served = Mosaic(**kwargs)
+    else:
+        served = PTZ(events=events, **kwargs)
+        if local_socket is not None:
+            # Pose updates are applied in the process that owns the element, without a round trip
+            LocalControl(served, local_socket).start()
+
+    def serve(seq, method, args):
+        try:
+            send((seq, REPLY, getattr(served, method)(*args)))
+        except Exception as e:  # pylint: disable=broad-exception-caught
+            send((seq, FAILURE, repr(e)))
+
+    while True:
+        try:
+            seq, method, args = conn.recv()
+        except EOFError:
+            break
+
+        if method in BACKGROUND:
+            Thread(target=serve, args=(seq, method, args), daemon=True).start()
+        else:
+            serve(seq, method, args)
+
+
+class RemotePTZ():
+    """Class RemotePTZ, runs a PTZ in a supervised worker process and exposes the same methods.
+    """
+
+    target = PTZ_TARGET
+    restored = RESTORED
+
+    def __init__(self, timeout: float = 5.0, restart_delay: float = 1.0, events: EventHub = None,
+                 local_socket: str = None, **kwargs):
+        """RemotePTZ object. The pipeline, the GLib main loop and GStreamer run in a separate
+        process, so a crash in an element or a slow request can't affect each other. The worker
+        is restarted automatically when it dies, and it starts with the last stream and latency
+        mode successfully set through this object, and the last position and zoom the worker
+        reported, however they were set.
+
+        Args:
+            timeout (float, optional): Seconds to wait for the worker to answer a call, unless the method has its own in TIMEOUTS. Defaults to 5.0.
+            restart_delay (float, optional): Seconds to wait before restarting a dead worker. Defaults to 1.0.
+            events (EventHub, optional): Hub where the events published in the worker are republished. Defaults to a new hub.
+            local_socket (str, optional): Path of the local control socket, served in the worker. Defaults to None.
+            kwargs: Arguments for the PTZ constructor in the worker.
+        """
+        self.__kwargs = kwargs
+        self.__local_socket = local_socket
+        self.__timeout = timeout
+        self.__restart_delay = restart_delay
+        self.__events = EventHub() if events is None else events
+        self.__context = multiprocessing.get_context('spawn')
+        self.__seq = itertools.count()
+        self.__lock = Lock()
+        self.__pending = {}
+        self.__conn = None
+        self.__process = None
+
+        self.__start()
+        Thread(target=self.__supervise, daemon=True).start()
+
+    def __start(self):
+        with self.__lock:
+            kwargs = dict(self.__kwargs)
+        conn, worker_conn = self.__context.Pipe()
+        process = self.__context.Process(target=_serve,
+                                         args=(worker_conn, self.target, kwargs, self.__local_socket),
+                                         daemon=True)
+        process.start()
+        worker_conn.close()
+
+        self.__conn = conn
+        self.__process = process
+        Thread(target=self.__receive, args=(conn,), daemon=True).start()
+        logger.info(f'Started {self.target} pipeline worker {process.pid}')
+
+    def __receive(self, conn):
+        while True:
+            try:
+                seq, status, result = conn.recv()
+            except (EOFError, OSError):
+                break
+
+            if status == EVENT:
+                self.__restore(*result)
+                self.__events.publish(*result)
+                continue
+
+            with self.__lock:
+                pending = self.__pending.pop(seq, None)
+            if pending is None:
+                continue
+
+            done, reply = pending
+            reply.append((status, result))
+            done.set()
+
+    def __restore(self, kind, data):
+        model = RESTORED_EVENTS.get(kind)
+        if model is None or kind not in self.restored:
+            return
+
+        try:
+            value = model(**data)
+        except ValueError as e:
+            logger.warning(f'Not restoring the {kind} {data}: {repr(e)}')
+            return
+        with self.__lock:
+            self.__kwargs[kind] = value
+
+    def __supervise(self):
+        while True:
+            self.__process.join()
+            logger.error(
+                f'Pipeline worker {self.__process.pid} exited with code {self.__process.exitcode}')
+            self.__conn.close()
+            self.__fail_pending()
+
+            time.sleep(self.__restart_delay)
+            self.__start()
+
+    def __fail_pending(self):
+        with self.__lock:
+            pending, self.__pending = self.__pending, {}
+        for done, reply in pending.values():
+            reply.append((FAILURE, 'Pipeline worker exited'))
+            done.set()
+
+    def call(self, method: str, *args):
+        """Call a PTZ method in the worker
+
+        Args:
+            method (str): Name of the PTZ method
+            args: Method arguments, they must be picklable
+
+        Returns:
+            The method result, None if the worker failed or didn't answer in time.
+        """
+        return self.__call(method, args, TIMEOUTS.get(method, self.__timeout))
+
+    def profile(self, seconds: float):
+        """Capture a profile in the worker, see PTZ.profile
+
+        Args:
+            seconds (float): Capture duration
+
+        Returns:
+            bytes, None: the tar.gz archive, None if the capture couldn't run.
+        """
+        return self.__call('profile', (seconds,), seconds + self.__timeout)
+
+    def __call(self, method, args, timeout):
+        seq = next(self.__seq)
+        done = Event()
+        reply = []
+
+        with self.__lock:
+            self.__pending[seq] = (done, reply)
+            try:
+                self.__conn.send((seq, method, args))
+            except (OSError, ValueError) as e:
+                del self.__pending[seq]
+                logger.error(f'Error sending {method} to the pipeline worker: {repr(e)}')
+                return None
+
+        if not done.wait(timeout):
+            with self.__lock:
+                self.__pending.pop(seq, None)
+            logger.error(f'Timeout waiting for {method} in the pipeline worker')
+            return None
+
+        status, result = reply[0]
+        if status == FAILURE:
+            logger.error(f'Error calling {method} in the pipeline worker: {result}')
+            return None
+
+        if result is True and method.startswith('set_') and method[4:] in self.restored:
+            with self.__lock:
+                self.__kwargs[method[4:]] = args[0]
+        return result
+
+    def forget(self, name: str):
+        """Stop handing a value to the restarted workers
+
+        Args:
+            name (str): Constructor argument, one of the restored values
+        """
+        with self.__lock:
+            self.__kwargs.pop(name, None)
+
+    def __getattr__(self, method):
+        if method.startswith('_'):
+            raise AttributeError(method)
+
+        def remote(*args):
+            return self.call(method, *args)
+
+        return remote
+
+
+class RemoteMosaic(RemotePTZ):
+    """Class RemoteMosaic, runs a Mosaic in a supervised worker process and exposes the same methods.
+    A restarted worker plays the last layout successfully set, unless the mosaic was stopped.
+    """
+
+    target = MOSAIC_TARGET
+    restored = MOSAIC_RESTORED
+
+    def stop(self):
+        """Stop the mosaic in the worker, see Mosaic.stop
+
+        Returns:
+            True, False or None: True if the mosaic was stopped, False if there was no mosaic running, None if the worker failed.
+        """
+        stopped = self.call('stop')
+        if stopped is True:
+            self.forget('layout')
+        return stopped
@@ -35,6 +35,7 @@ setuptools.setup(
         'requests',
         'flask-cors',
         'pydantic',
+        'numpy',
         'PyGObject==3.42.1',
         'mmj_utils @ git+https://github.com/RidgeRun/mmj_utils',
         'sphinx',
@@ -0,0 +1,171 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+
+"""Stand-ins for the GStreamer pipeline, to run a PTZ without GStreamer
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from ptz import ptz as ptz_module
+from ptz.models.probe import ProbeResult
+from ptz.models.stream import Stream
+from ptz.ptz import PTZ
+
+
+class FakeElement():
+    """Stands for a pipeline element, only its properties"""
+
+    def __init__(self):
+        self.properties = {}
+        self.history = []
+
+    def set_property(self, name, value):
+        self.properties[name] = value
+        self.history.append((name, value))
+
+    def get_property(self, name):
+        return self.properties.get(name)
+
+
+class FakeMedia():
+    """Stands for Media: keeps the probes and error handlers the PTZ installs so that tests
+    can push frames through them and report errors
+    """
+
+    def __init__(self, description):
+        self.description = description
+        self.elements = {}
+        self.probes = {}
+        self.error_handlers = []
+        self.playing = False
+        self.closed = False
+
+    @staticmethod
+    def running_time(pad, buffer):  # pylint: disable=unused-argument
+        return buffer.running_time
+
+    @staticmethod
+    def is_delta_unit(buffer):
+        return buffer.delta
+
+    def get_element(self, element_name):
+        return self.elements.setdefault(element_name, FakeElement())
+
+    def set_property(self, element_name, property_name, value):
+        self.get_element(element_name).set_property(property_name, value)
+        return True
+
+    def set_arguments(self, element_name, arguments):
+        element = self.get_element(element_name)
+        for argument in arguments.split():
+            name, _, value = argument.partition('=')
+            if value in ('true', 'false'):
+                value = value == 'true'
+            elif value.isdigit():
+                value = int(value)
+            element.set_property(name, value)
+        return True
+
+    def get_property(self, element_name, property_name):
+        return self.get_element(element_name).get_property(property_name)
+
+    def set_caps(self, element_name, caps):
+        return self.set_property(element_name, 'caps', caps)
+
+    def add_buffer_probe(self, element_name, pad_name, callback):
+        self.probes.setdefault((element_name, pad_name), []).append(callback)
+        return True
+
+    def add_signal_handler(self, element_name, signal_name, callback):  # pylint: disable=unused-argument
+        return True
+
+    def add_error_handler(self, callback):
+        self.error_handlers.append(callback)
+
+    def force_key_unit(self, element_name):  # pylint: disable=unused-argument
+        return True
+
+    def play(self):
+        self.playing = True
+        return True
+
+    def close(self):
+        self.closed = True
+
+    def push(self, running_time=None):
+        """Push a frame through the PTZ element"""
+        buffer = SimpleNamespace(running_time=running_time, delta=False)
+        for pad_name in ('sink', 'src'):
+            for callback in self.probes.get(('rr_panorama_ptz', pad_name), []):
+                callback(pad_name, buffer)
+
+    def fail(self, message='Could not read from resource'):
+        """Post an error on the bus"""
+        for callback in self.error_handlers:
+            callback(message)
+
+
+class FakeProber():
+    """Stands for StreamProber, every input is a reachable H264 stream"""
+
+    def __init__(self, framerate='25/1'):
+        self.framerate = framerate
+
+    def probe_one(self, uri, refresh=False):  # pylint: disable=unused-argument
+        return ProbeResult(uri=uri, reachable=True, codec='video/x-h264', width=1920,
+                           height=1080, framerate=self.framerate)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+class FakePipeline():
+    """Creates PTZ objects whose pipelines are FakeMedia objects"""
+
+    def __init__(self):
+        self.medias = []
+
+    @property
+    def media(self):
+        """The last pipeline created"""
+        return self.medias[-1]
+
+    def start(self, **kwargs):
+        """Create a PTZ with an rtsp input and wait for its pipeline to play"""
+        stream = Stream(in_uri='rtsp://127.0.0.1:8554/input', out_port=5021, out_mapping='ptz_out')
+        ptz = PTZ(stream=stream, prober=FakeProber(), suspend_grace=None, lod_levels=1, **kwargs)
+        assert wait_for(lambda: ptz.get_state() == PTZ.PLAYING)
+        return ptz
+
+
+@pytest.fixture(name='fake_pipeline')
+def fixture_fake_pipeline(monkeypatch):
+    fake = FakePipeline()
+
+    class RecordedMedia(FakeMedia):
+        """FakeMedia that the fixture keeps track of"""
+
+        def __init__(self, description):
+            super().__init__(description)
+            fake.medias.append(self)
+
+    monkeypatch.setattr(ptz_module, 'Media', RecordedMedia)
+    return fake
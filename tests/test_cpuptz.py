@@ -0,0 +1,122 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Tests for the CPU PTZ remap
+"""
+
+import numpy as np
+import pytest
+
+from ptz.cpuptz import RemapCache, Remapper
+
+IN_SIZE = (360, 180)
+# Odd sizes put the center of the middle output pixel on the optical axis
+OUT_SIZE = (101, 101)
+CENTER = (OUT_SIZE[1] // 2, OUT_SIZE[0] // 2)
+
+
+def sampled(table):
+    """Input (column, row) sampled by the center output pixel"""
+    index = int(table[CENTER])
+    return index % IN_SIZE[0], index // IN_SIZE[0]
+
+
+def test_center_maps_to_input_center():
+    column, row = sampled(RemapCache().get(0.0, 0.0, 1.0, OUT_SIZE, IN_SIZE))
+
+    assert column == IN_SIZE[0] // 2
+    assert row == IN_SIZE[1] // 2
+
+
+@pytest.mark.parametrize('pan', [90.0, -90.0, 45.0])
+def test_pan_shifts_columns(pan):
+    column, row = sampled(RemapCache().get(pan, 0.0, 1.0, OUT_SIZE, IN_SIZE))
+
+    assert column == (IN_SIZE[0] // 2 + round(pan / 360 * IN_SIZE[0])) % IN_SIZE[0]
+    assert row == IN_SIZE[1] // 2
+
+
+def test_pan_wraps_around():
+    cache = RemapCache()
+
+    assert np.array_equal(cache.get(180.0, 0.0, 1.0, OUT_SIZE, IN_SIZE),
+                          cache.get(-180.0, 0.0, 1.0, OUT_SIZE, IN_SIZE))
+
+
+@pytest.mark.parametrize('tilt', [30.0, -30.0])
+def test_tilt_moves_rows(tilt):
+    column, row = sampled(RemapCache().get(0.0, tilt, 1.0, OUT_SIZE, IN_SIZE))
+
+    assert column == IN_SIZE[0] // 2
+    # Positive tilt looks up, towards the first rows
+    assert abs(row - round((0.5 - tilt / 180) * IN_SIZE[1])) <= 1
+
+
+def test_zoom_narrows_field_of_view():
+    cache = RemapCache()
+    wide = cache.get(0.0, 0.0, 1.0, OUT_SIZE, IN_SIZE)
+    narrow = cache.get(0.0, 0.0, 2.0, OUT_SIZE, IN_SIZE)
+
+    def span(table):
+        return int(table[CENTER[0], -1] - table[CENTER[0], 0])
+
+    # Zoom 1.0 is a 90 degrees horizontal field of view, a quarter of the input
+    assert abs(span(wide) - IN_SIZE[0] / 4) <= 2
+    assert span(narrow) < span(wide)
+
+
+def test_same_quantized_pose_reuses_table():
+    cache = RemapCache()
+    table = cache.get(10.0, 5.0, 1.5, OUT_SIZE, IN_SIZE)
+
+    assert cache.get(10.0, 5.0, 1.5, OUT_SIZE, IN_SIZE) is table
+    assert cache.get(10.01, 5.01, 1.501, OUT_SIZE, IN_SIZE) is table
+    assert cache.get(10.0, 5.0, 1.5, (51, 51), IN_SIZE) is not table
+
+
+def test_least_recently_used_table_is_evicted():
+    cache = RemapCache(capacity=2)
+    first = cache.get(0.0, 0.0, 1.0, OUT_SIZE, IN_SIZE)
+    second = cache.get(10.0, 0.0, 1.0, OUT_SIZE, IN_SIZE)
+
+    # Using the first table makes the second one the oldest
+    assert cache.get(0.0, 0.0, 1.0, OUT_SIZE, IN_SIZE) is first
+    cache.get(20.0, 0.0, 1.0, OUT_SIZE, IN_SIZE)
+
+    assert cache.get(0.0, 0.0, 1.0, OUT_SIZE, IN_SIZE) is first
+    rebuilt = cache.get(10.0, 0.0, 1.0, OUT_SIZE, IN_SIZE)
+    assert rebuilt is not second
+    assert np.array_equal(rebuilt, second)
+
+
+@pytest.fixture(name='source')
+def fixture_source():
+    return np.arange(IN_SIZE[0] * IN_SIZE[1], dtype=np.uint32).reshape(IN_SIZE[1], IN_SIZE[0])
+
+
+@pytest.mark.parametrize('threads, out_size', [
+    (1, OUT_SIZE),
+    (3, OUT_SIZE),
+    (4, (64, 7)),
+    # More bands than rows leaves some bands empty
+    (8, (64, 3)),
+])
+def test_bands_cover_the_whole_frame(source, threads, out_size):
+    cache = RemapCache()
+    remapper = Remapper(threads=threads, cache=cache)
+    destination = np.zeros((out_size[1], out_size[0]), dtype=np.uint32)
+    try:
+        remapper.remap(source, destination, 30.0, 10.0, 1.2)
+    finally:
+        remapper.shutdown()
+
+    # Each source pixel holds its own index, so the output is the table itself
+    assert np.array_equal(destination, cache.get(30.0, 10.0, 1.2, out_size, IN_SIZE))
@@ -0,0 +1,93 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Tests for the state change event hub
+"""
+
+import json
+from threading import Thread
+
+from ptz.events import EventHub
+
+
+def parse(events):
+    """Split concatenated Server-Sent Events into (id, kind, data) tuples"""
+    parsed = []
+    for event in events.decode().split('\n\n')[:-1]:
+        fields = dict(line.split(': ', 1) for line in event.split('\n'))
+        parsed.append((int(fields['id']), fields['event'], json.loads(fields['data'])))
+    return parsed
+
+
+def test_changes_are_coalesced_to_the_latest_state():
+    events = EventHub()
+    events.publish('position', {'pan': 1.0, 'tilt': 0.0})
+    events.publish('zoom', {'zoom': 2.0})
+    events.publish('position', {'pan': 3.0, 'tilt': 1.0})
+
+    version, data = events.changes(0)
+
+    assert version == 3
+    assert parse(data) == [(3, 'position', {'pan': 3.0, 'tilt': 1.0}), (2, 'zoom', {'zoom': 2.0})]
+
+
+def test_only_changes_after_the_version_are_returned():
+    events = EventHub()
+    events.publish('position', {'pan': 1.0, 'tilt': 0.0})
+    version, _ = events.changes(0)
+
+    assert events.changes(version) == (version, b'')
+
+    events.publish('zoom', {'zoom': 2.0})
+    assert parse(events.changes(version)[1]) == [(2, 'zoom', {'zoom': 2.0})]
+
+
+def test_kinds_filter_the_changes():
+    events = EventHub()
+    events.publish('position', {'pan': 1.0, 'tilt': 0.0})
+    events.publish('zoom', {'zoom': 2.0})
+
+    assert parse(events.changes(0, ('zoom',))[1]) == [(2, 'zoom', {'zoom': 2.0})]
+    assert events.states(0, ('position',)) == (2, [('position', 1, {'pan': 1.0, 'tilt': 0.0})])
+
+
+def test_each_change_is_encoded_once():
+    events = EventHub()
+    events.publish('zoom', {'zoom': 2.0})
+
+    first = events.changes(0)[1]
+    assert events.changes(0)[1] is first
+
+    events.publish('zoom', {'zoom': 3.0})
+    assert parse(events.changes(0)[1]) == [(2, 'zoom', {'zoom': 3.0})]
+
+
+def test_wait_times_out_without_changes():
+    events = EventHub()
+    events.publish('zoom', {'zoom': 2.0})
+
+    assert events.wait(1, 0.01) == 1
+    assert events.wait(1, 0.01, ('position',)) == 1
+    assert events.wait(0, 0.01, ('zoom',)) == 1
+
+
+def test_wait_wakes_up_on_a_change_of_the_kind():
+    events = EventHub()
+    events.publish('zoom', {'zoom': 2.0})
+    result = []
+    observer = Thread(target=lambda: result.append(events.wait(1, 5.0, ('position',))))
+    observer.start()
+
+    events.publish('zoom', {'zoom': 3.0})
+    events.publish('position', {'pan': 1.0, 'tilt': 0.0})
+    observer.join(5.0)
+
+    assert result == [3]
@@ -0,0 +1,179 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Tests for the input jitter buffer tuner
+"""
+
+from ptz import pipeline
+from ptz.jitter import CALM_INTERVALS, LOSSY_INTERVALS, JitterTuner
+
+
+class FakeStats(dict):
+    """Stands for the Gst.Structure of the rtpjitterbuffer stats property"""
+
+    def get_value(self, name):
+        return self[name]
+
+
+class FakeJitterBuffer():
+    """Stands for an rtpjitterbuffer, only the latency and stats properties"""
+
+    def __init__(self, latency=50, jitter=5.0):
+        self.properties = {'latency': latency}
+        self.stats = FakeStats({'num-pushed': 0, 'num-lost': 0, 'num-late': 0, 'num-duplicates': 0,
+                                'avg-jitter': int(jitter * 1e6)})
+
+    def get_property(self, name):
+        return self.stats if name == 'stats' else self.properties[name]
+
+    def set_property(self, name, value):
+        self.properties[name] = value
+
+    def receive(self, pushed=1000, lost=0, late=0):
+        self.stats['num-pushed'] += pushed
+        self.stats['num-lost'] += lost
+        self.stats['num-late'] += late
+
+
+class FakeManager():
+    """Stands for the rtpbin created by rtspsrc"""
+
+    def __init__(self):
+        self.on_jitterbuffer = None
+
+    def connect(self, signal_name, callback):
+        assert signal_name == 'new-jitterbuffer'
+        self.on_jitterbuffer = callback
+
+
+class FakeMedia():
+    """Stands for Media, only the signal handlers"""
+
+    def __init__(self):
+        self.handlers = {}
+
+    def add_signal_handler(self, element_name, signal_name, callback):
+        self.handlers[(element_name, signal_name)] = callback
+        return True
+
+
+def connect(transport=pipeline.AUTO, min_latency=20, max_latency=300, tcp_loss=0.05, latency=50):
+    media = FakeMedia()
+    tuner = JitterTuner(media, transport, min_latency, max_latency, tcp_loss)
+    manager = FakeManager()
+    media.handlers[('src', 'new-manager')](None, manager)
+    jitterbuffer = FakeJitterBuffer(latency)
+    manager.on_jitterbuffer(manager, jitterbuffer, 0, 1234)
+    return tuner, jitterbuffer
+
+
+def test_initial_latency_is_clamped_to_the_bounds():
+    _, jitterbuffer = connect(min_latency=20, latency=0)
+
+    assert jitterbuffer.properties['latency'] == 20
+
+
+def test_latency_grows_on_late_packets_and_shrinks_when_calm():
+    tuner, jitterbuffer = connect(latency=50)
+
+    jitterbuffer.receive(late=5)
+    assert tuner.update().latency == 75
+    assert jitterbuffer.properties['latency'] == 75
+
+    for _ in range(CALM_INTERVALS - 1):
+        jitterbuffer.receive()
+        assert tuner.update().latency == 75
+
+    jitterbuffer.receive()
+    assert tuner.update().latency == 67
+    assert jitterbuffer.properties['latency'] == 67
+
+
+def test_latency_stays_within_the_bounds():
+    tuner, jitterbuffer = connect(max_latency=100, latency=80)
+
+    for _ in range(5):
+        jitterbuffer.receive(late=10)
+        tuner.update()
+
+    assert tuner.get_stats().latency == 100
+    assert jitterbuffer.properties['latency'] == 100
+
+
+def test_loss_is_measured_per_update():
+    tuner, jitterbuffer = connect()
+
+    jitterbuffer.receive(pushed=900, lost=100)
+    assert tuner.update().loss == 0.1
+
+    jitterbuffer.receive(pushed=1000)
+    stats = tuner.update()
+    assert stats.loss == 0.0
+    assert stats.lost == 100
+    assert stats.packets == 1900
+
+
+def test_fall_back_fires_once_after_sustained_loss():
+    tuner, jitterbuffer = connect(tcp_loss=0.05)
+
+    for _ in range(LOSSY_INTERVALS - 1):
+        jitterbuffer.receive(pushed=900, lost=100)
+        tuner.update()
+        assert not tuner.fall_back()
+
+    jitterbuffer.receive(pushed=900, lost=100)
+    tuner.update()
+    assert tuner.fall_back()
+
+    for _ in range(3 * LOSSY_INTERVALS):
+        jitterbuffer.receive(pushed=900, lost=100)
+        tuner.update()
+        assert not tuner.fall_back()
+
+
+def test_a_clean_update_restarts_the_loss_count():
+    tuner, jitterbuffer = connect(tcp_loss=0.05)
+
+    for update in range(2 * LOSSY_INTERVALS):
+        jitterbuffer.receive(pushed=900, lost=0 if update == LOSSY_INTERVALS - 1 else 100)
+        tuner.update()
+        if update < 2 * LOSSY_INTERVALS - 1:
+            assert not tuner.fall_back()
+    assert tuner.fall_back()
+
+
+def test_tcp_inputs_never_fall_back():
+    tuner, jitterbuffer = connect(transport=pipeline.TCP, tcp_loss=0.05)
+
+    for _ in range(3 * LOSSY_INTERVALS):
+        jitterbuffer.receive(pushed=500, lost=500)
+        tuner.update()
+        assert not tuner.fall_back()
+    assert tuner.get_stats().transport == pipeline.TCP
+
+
+def test_fall_back_can_be_disabled():
+    tuner, jitterbuffer = connect(tcp_loss=None)
+
+    for _ in range(3 * LOSSY_INTERVALS):
+        jitterbuffer.receive(pushed=500, lost=500)
+        tuner.update()
+        assert not tuner.fall_back()
+
+
+def test_reset_applies_the_latency_of_a_new_mode():
+    tuner, jitterbuffer = connect(min_latency=20, max_latency=300, latency=50)
+
+    tuner.reset(0, True)
+
+    assert jitterbuffer.properties['latency'] == 20
+    assert jitterbuffer.properties['drop-on-latency'] is True
+    assert tuner.update().latency == 20
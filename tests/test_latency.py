@@ -0,0 +1,61 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Tests for the latency modes applied to the running pipeline
+"""
+
+from ptz import pipeline
+
+
+def test_latency_mode_is_applied_without_rebuilding(fake_pipeline):
+    ptz = fake_pipeline.start(latency_mode=pipeline.BALANCED)
+    media = fake_pipeline.media
+
+    assert ptz.set_latency_mode(pipeline.ULTRA_LOW)
+
+    assert fake_pipeline.medias == [media]
+    assert not media.closed
+    assert ptz.get_latency_mode() == pipeline.ULTRA_LOW
+    for name in pipeline.RAW_QUEUES:
+        queue = media.get_element(name).properties
+        assert queue['max-size-buffers'] == 1
+        assert queue['leaky'] == 'downstream'
+    assert media.get_element('input_queue').properties['max-size-time'] == 50000000
+    assert media.get_property('src', 'latency') == 0
+    assert media.get_property('src', 'drop-on-latency') is True
+
+
+def test_smooth_restores_the_default_queue_limits(fake_pipeline):
+    ptz = fake_pipeline.start(latency_mode=pipeline.ULTRA_LOW)
+    media = fake_pipeline.media
+
+    assert ptz.set_latency_mode(pipeline.SMOOTH)
+
+    queue = media.get_element('raw_queue0').properties
+    assert queue['max-size-buffers'] == 200
+    assert queue['leaky'] == 'no'
+    assert media.get_property('src', 'latency') == 200
+    assert media.get_property('src', 'drop-on-latency') is False
+
+
+def test_queues_are_named_in_the_description():
+    for backend in pipeline.BACKENDS:
+        description = pipeline.describe('rtsp://127.0.0.1:8554/input', 5021, 'ptz_out', 500,
+                                        backend=backend)
+        for name in pipeline.LIVE_LATENCY_ELEMENTS:
+            assert f'name={name} ' in description
+
+
+def test_unknown_latency_mode_is_rejected(fake_pipeline):
+    ptz = fake_pipeline.start()
+
+    assert not ptz.set_latency_mode('instant')
+    assert ptz.get_latency_mode() == pipeline.BALANCED
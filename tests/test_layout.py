@@ -0,0 +1,38 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Tests for the mosaic layout validation
+"""
+
+import pytest
+from pydantic import ValidationError
+
+from ptz.models.layout import MAX_GRID, Layout
+
+
+def layout(**kwargs):
+    return Layout(inputs=['rtsp://127.0.0.1:8554/input'], out_port=5022, out_mapping='mosaic', **kwargs)
+
+
+def test_largest_grid_is_accepted():
+    assert layout(rows=MAX_GRID, cols=MAX_GRID).rows == MAX_GRID
+
+
+@pytest.mark.parametrize('grid', [{'rows': MAX_GRID + 1}, {'cols': MAX_GRID + 1}, {'rows': 0}])
+def test_grid_out_of_bounds_is_rejected(grid):
+    with pytest.raises(ValidationError):
+        layout(**grid)
+
+
+@pytest.mark.parametrize('size', [{'width': 7, 'cols': 4}, {'height': 1, 'rows': 1}])
+def test_tiles_too_small_are_rejected(size):
+    with pytest.raises(ValidationError):
+        layout(**size)
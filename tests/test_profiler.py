@@ -0,0 +1,145 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+
+"""Tests for the profile captures
+"""
+
+import io
+import tarfile
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from ptz import media
+from ptz.profiler import Profiler
+
+
+class FakeBin():
+    """Stands for Gst.Bin, the elements that contain other elements"""
+
+
+FAKE_GST = SimpleNamespace(Bin=FakeBin, CLOCK_TIME_NONE=2**64 - 1,
+                           PadProbeType=SimpleNamespace(BUFFER=1),
+                           PadProbeReturn=SimpleNamespace(OK=1))
+
+
+class FakePad():
+    """Stands for a Gst.Pad, keeps the installed probes"""
+
+    def __init__(self):
+        self.probes = {}
+        self.next_id = 1
+
+    def add_probe(self, mask, callback):
+        assert mask == FAKE_GST.PadProbeType.BUFFER
+        self.probes[self.next_id] = callback
+        self.next_id += 1
+        return self.next_id - 1
+
+    def remove_probe(self, probe_id):
+        del self.probes[probe_id]
+
+    def push(self, pts):
+        info = SimpleNamespace(get_buffer=lambda: SimpleNamespace(pts=pts))
+        for callback in list(self.probes.values()):
+            callback(self, info)
+
+
+class FakeElement():
+    """Stands for a Gst.Element with static pads"""
+
+    def __init__(self, name, factory, sink=True, src=True):
+        self.name = name
+        self.factory = factory
+        self.sinkpads = [FakePad()] if sink else []
+        self.srcpads = [FakePad()] if src else []
+
+    def get_name(self):
+        return self.name
+
+    def get_factory(self):
+        return SimpleNamespace(get_name=lambda: self.factory)
+
+    def get_property(self, name):
+        return {'current-level-buffers': 2, 'current-level-time': 1000}[name]
+
+
+class FakeMedia():
+    """Stands for Media, only the elements and the graph"""
+
+    def __init__(self, elements):
+        self.elements = elements
+
+    def get_elements(self):
+        return self.elements
+
+    def dot_graph(self):
+        return 'digraph {}'
+
+
+@pytest.fixture(name='elements')
+def fixture_elements(monkeypatch):
+    monkeypatch.setattr(media, 'Gst', FAKE_GST)
+    return [FakeElement('source', 'fakesrc', sink=False), FakeElement('queue0', 'queue'),
+            FakeElement('sink', 'fakesink', src=False)]
+
+
+def files(archive):
+    with tarfile.open(fileobj=io.BytesIO(archive), mode='r:gz') as tar:
+        return {member.name: tar.extractfile(member).read().decode() for member in tar.getmembers()}
+
+
+def pads(elements):
+    return [pad for element in elements for pad in element.sinkpads + element.srcpads]
+
+
+def test_no_probe_remains_after_the_capture(elements):
+    installed = []
+
+    def watch():
+        while not all(pad.probes for pad in pads(elements)):
+            threading.Event().wait(0.001)
+        installed.append(True)
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    archive = Profiler(sample_interval=0.01).capture(FakeMedia(elements), 0.1)
+    watcher.join(1.0)
+
+    assert installed
+    assert not any(pad.probes for pad in pads(elements))
+    assert files(archive)['pipeline.dot'] == 'digraph {}'
+
+
+def test_buffers_are_measured_during_the_capture(elements):
+    source, queue, sink = elements
+
+    def push():
+        while not sink.sinkpads[0].probes:
+            threading.Event().wait(0.001)
+        for pts in range(3):
+            source.srcpads[0].push(pts)
+            queue.sinkpads[0].push(pts)
+            queue.srcpads[0].push(pts)
+            sink.sinkpads[0].push(pts)
+
+    pusher = threading.Thread(target=push, daemon=True)
+    pusher.start()
+    archive = Profiler(sample_interval=0.01).capture(FakeMedia(elements), 0.1)
+    pusher.join(1.0)
+
+    log = files(archive)['tracers.log'].split('\n')
+    assert sum(line.startswith('proctime, element=(string)queue0,') for line in log) == 3
+    assert sum(line.startswith('latency, element=(string)sink,') for line in log) == 3
+    assert any(line.startswith('queuelevels, element=(string)queue0, buffers=(guint)2,') for line in log)
+
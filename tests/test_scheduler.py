@@ -0,0 +1,191 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+
+"""Tests for the frame-accurate pose scheduler, run through the PTZ element probes
+"""
+
+import pytest
+from rrmsutils.models.ptz.position import Position
+from rrmsutils.models.ptz.zoom import Zoom
+
+from ptz.models.preset import Preset
+from ptz.models.stream import Stream
+from ptz.ptz import PTZ
+
+# Duration of a frame in nanoseconds, 25 fps
+FRAME = 40000000
+
+
+class Frames():
+    """Pushes frames through the PTZ element of the stand-in pipeline and records the
+    pose properties set on each one
+    """
+
+    def __init__(self, media, timestamps=True):
+        self.element = media.get_element('rr_panorama_ptz')
+        self.media = media
+        self.timestamps = timestamps
+        self.frame = 0
+        self.applied = []
+
+    def push(self, frames=1):
+        for _ in range(frames):
+            start = len(self.element.history)
+            self.media.push(self.frame * FRAME if self.timestamps else None)
+            self.applied += [(self.frame, name, value) for name, value in self.element.history[start:]]
+            self.frame += 1
+
+    def frames_of(self, name, value):
+        return [frame for frame, applied_name, applied_value in self.applied
+                if (applied_name, applied_value) == (name, value)]
+
+
+@pytest.fixture(name='ptz')
+def fixture_ptz(fake_pipeline):
+    return fake_pipeline.start()
+
+
+@pytest.fixture(name='frames')
+def fixture_frames(ptz, fake_pipeline):  # pylint: disable=unused-argument
+    return Frames(fake_pipeline.media)
+
+
+def test_command_is_applied_on_its_frame(ptz, frames):
+    ptz.schedule_pose(pan=10.0, frame=5)
+
+    frames.push(5)
+    assert not frames.applied
+
+    frames.push(5)
+    assert frames.frames_of('pan', 10.0) == [5]
+    assert not ptz.get_schedule().commands
+
+
+def test_schedule_reports_the_probed_frame_and_running_time(ptz, frames):
+    frames.push(3)
+
+    schedule = ptz.get_schedule()
+
+    assert schedule.frame == 3
+    assert schedule.running_time == 2 * FRAME
+
+
+def test_past_frame_is_applied_on_the_next_frame(ptz, frames):
+    frames.push(10)
+
+    ptz.schedule_pose(zoom=2.0, frame=3)
+    frames.push()
+
+    assert frames.frames_of('zoom', 2.0) == [10]
+
+
+def test_commands_of_the_same_frame_keep_scheduling_order(ptz, frames):
+    ptz.schedule_pose(pan=1.0, frame=8)
+    ptz.schedule_pose(pan=2.0, frame=4)
+    ptz.schedule_pose(tilt=3.0, frame=4)
+    ptz.schedule_pose(zoom=4.0, running_time=4 * FRAME)
+    ptz.schedule_pose(zoom=5.0, frame=4)
+
+    frames.push(10)
+
+    assert frames.applied == [(4, 'pan', 2.0), (4, 'tilt', 3.0), (4, 'zoom', 4.0), (4, 'zoom', 5.0),
+                              (8, 'pan', 1.0)]
+
+
+def test_cancelled_commands_are_not_applied(ptz, frames):
+    kept = ptz.schedule_pose(pan=1.0, frame=2)
+    cancelled = ptz.schedule_pose(pan=2.0, frame=2)
+    cancelled_by_time = ptz.schedule_pose(tilt=1.0, running_time=FRAME)
+
+    assert ptz.cancel_scheduled(cancelled.id)
+    assert ptz.cancel_scheduled(cancelled_by_time.id)
+    assert not ptz.cancel_scheduled(cancelled.id)
+    assert ptz.get_schedule().commands == [kept]
+
+    frames.push(4)
+
+    assert frames.applied == [(2, 'pan', 1.0)]
+    assert not ptz.cancel_scheduled(kept.id)
+
+
+def test_cancelled_entries_are_dropped_lazily(ptz, frames):
+    cancelled = ptz.schedule_pose(pan=1.0, frame=1)
+    ptz.cancel_scheduled(cancelled.id)
+    frames.push(3)
+
+    # The stale heap entry doesn't hide commands scheduled later for the same frame
+    ptz.schedule_pose(pan=2.0, frame=1)
+    frames.push()
+
+    assert frames.applied == [(3, 'pan', 2.0)]
+
+
+def test_running_time_command_is_applied_on_the_first_frame_at_or_after_it(ptz, frames):
+    ptz.schedule_pose(pan=1.0, running_time=3 * FRAME)
+    ptz.schedule_pose(pan=2.0, running_time=5 * FRAME + FRAME // 2)
+
+    frames.push(10)
+
+    assert frames.frames_of('pan', 1.0) == [3]
+    assert frames.frames_of('pan', 2.0) == [6]
+
+
+def test_running_time_commands_wait_for_timestamped_frames(ptz, frames):
+    frames.timestamps = False
+    ptz.schedule_pose(pan=1.0, running_time=0)
+
+    frames.push(3)
+    assert not frames.applied
+
+    frames.timestamps = True
+    frames.push()
+    assert frames.frames_of('pan', 1.0) == [3]
+
+
+def test_frame_wins_over_running_time(ptz):
+    command = ptz.schedule_pose(pan=1.0, frame=2, running_time=0)
+
+    assert command.frame == 2
+    assert command.running_time is None
+
+
+def test_a_target_is_required(ptz):
+    assert ptz.schedule_pose(pan=1.0) is None
+
+
+def test_new_stream_drops_every_command(ptz, fake_pipeline):
+    ptz.schedule_pose(pan=1.0, frame=1)
+    ptz.schedule_pose(pan=2.0, running_time=FRAME)
+
+    assert ptz.set_stream(Stream(in_uri='rtsp://127.0.0.1:8554/other', out_port=5021, out_mapping='ptz_out'))
+    frames = Frames(fake_pipeline.media)
+    frames.push(3)
+
+    assert not frames.applied
+    assert not ptz.get_schedule().commands
+
+
+def test_recall_transition_is_applied_frame_by_frame(ptz, frames):
+    frames.push()
+    ptz.apply_pose(0.0, 0.0, 1.0)
+    preset = Preset(name='door', position=Position(pan=40.0, tilt=20.0), zoom=Zoom(zoom=4.0))
+
+    assert ptz.recall(preset, 1.0)
+    frames.push(30)
+
+    pans = [value for _, name, value in frames.applied if name == 'pan']
+    # 25 fps, one pose per frame ending on the preset
+    assert len(pans) == 25
+    assert pans == sorted(pans)
+    assert frames.frames_of('pan', 40.0) == [25]
+    assert ptz.get_zoom().zoom == 4.0
+    assert ptz.get_state() == PTZ.STREAMING
@@ -0,0 +1,72 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+
+"""Tests for the pipeline state reported to /health
+"""
+
+from conftest import wait_for
+
+from ptz.models.stream import Stream
+from ptz.ptz import PTZ
+
+
+def test_first_frame_moves_to_streaming(fake_pipeline):
+    ptz = fake_pipeline.start()
+
+    fake_pipeline.media.push()
+
+    assert ptz.get_state() == PTZ.STREAMING
+    assert ptz.get_time_to_first_frame() is not None
+
+
+def test_pipeline_error_leaves_streaming_until_the_next_frame(fake_pipeline):
+    ptz = fake_pipeline.start()
+    media = fake_pipeline.media
+    media.push()
+
+    media.fail()
+    assert ptz.get_state() == PTZ.ERROR
+
+    # The reconnected pipeline delivers frames again
+    media.push()
+    assert ptz.get_state() == PTZ.STREAMING
+
+
+def test_frames_of_a_replaced_pipeline_dont_count(fake_pipeline):
+    ptz = fake_pipeline.start()
+    first = fake_pipeline.media
+    first.push()
+
+    assert ptz.set_stream(Stream(in_uri='rtsp://127.0.0.1:8554/other', out_port=5021, out_mapping='ptz_out'))
+    second = fake_pipeline.media
+    assert second is not first
+    assert first.closed
+    assert ptz.get_state() == PTZ.PLAYING
+
+    first.push()
+    first.fail()
+    assert ptz.get_state() == PTZ.PLAYING
+
+    second.push()
+    assert ptz.get_state() == PTZ.STREAMING
+
+
+def test_input_loss_leaves_streaming(fake_pipeline, monkeypatch):
+    monkeypatch.setattr(PTZ, 'STALL_TIMEOUT', 0.3)
+    monkeypatch.setattr(PTZ, 'CLIENTS_INTERVAL', 0.05)
+    ptz = fake_pipeline.start()
+    fake_pipeline.media.push()
+
+    assert wait_for(lambda: ptz.get_state() == PTZ.PLAYING)
+
+    fake_pipeline.media.push()
+    assert ptz.get_state() == PTZ.STREAMING
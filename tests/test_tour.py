@@ -0,0 +1,114 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+
+"""Tests for the tour runner
+"""
+
+import time
+from threading import Event, Lock
+
+import pytest
+from pydantic import ValidationError
+from rrmsutils.models.ptz.position import Position
+from rrmsutils.models.ptz.zoom import Zoom
+
+from ptz.models.preset import MAX_TRANSITION, Preset, Tour
+from ptz.tour import TourRunner
+
+DWELL = 0.05
+
+
+class Recorder():
+    """Stands for PTZ.recall, there is no pipeline running"""
+
+    def __init__(self):
+        self.lock = Lock()
+        self.recalls = []
+        self.changed = Event()
+
+    def __call__(self, preset, transition):
+        with self.lock:
+            self.recalls.append((preset.name, transition))
+        self.changed.set()
+
+    def wait_for(self, count, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self.lock:
+                if len(self.recalls) >= count:
+                    return list(self.recalls)
+            self.changed.wait(0.01)
+            self.changed.clear()
+        return list(self.recalls)
+
+
+def preset(name):
+    return Preset(name=name, position=Position(pan=0.0, tilt=0.0), zoom=Zoom(zoom=1.0))
+
+
+@pytest.fixture(name='presets')
+def fixture_presets():
+    return [preset('a'), preset('b'), preset('c')]
+
+
+def test_tour_advances_without_a_pipeline(presets):
+    recorder = Recorder()
+    runner = TourRunner(recorder)
+    runner.start(Tour(presets=['a', 'b', 'c'], dwell=DWELL), presets)
+
+    recalls = recorder.wait_for(5)
+    runner.stop()
+
+    assert [name for name, _ in recalls[:5]] == ['a', 'b', 'c', 'a', 'b']
+
+
+def test_tour_without_loop_finishes(presets):
+    recorder = Recorder()
+    runner = TourRunner(recorder)
+    runner.start(Tour(presets=['a', 'b', 'c'], dwell=DWELL, loop=False), presets)
+
+    recorder.wait_for(3)
+    time.sleep(3 * DWELL)
+
+    assert [name for name, _ in recorder.recalls] == ['a', 'b', 'c']
+    assert not runner.get_status().running
+    assert not runner.stop()
+
+
+def test_stopped_tour_doesnt_advance(presets):
+    recorder = Recorder()
+    runner = TourRunner(recorder)
+    runner.start(Tour(presets=['a', 'b'], dwell=DWELL), presets)
+    recorder.wait_for(1)
+
+    assert runner.stop()
+    time.sleep(3 * DWELL)
+
+    assert recorder.recalls == [('a', 0.0)]
+
+
+def test_new_tour_replaces_the_running_one(presets):
+    recorder = Recorder()
+    runner = TourRunner(recorder)
+    runner.start(Tour(presets=['a', 'b'], dwell=10.0), presets[:2])
+    recorder.wait_for(1)
+
+    runner.start(Tour(presets=['c'], dwell=DWELL, transition=0.5), presets[2:])
+    recalls = recorder.wait_for(3)
+    runner.stop()
+
+    assert recalls[:3] == [('a', 0.0), ('c', 0.5), ('c', 0.5)]
+
+
+def test_tour_transition_is_bounded():
+    with pytest.raises(ValidationError):
+        Tour(presets=['a'], dwell=1.0, transition=MAX_TRANSITION + 1)
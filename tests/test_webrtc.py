@@ -0,0 +1,106 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Tests for the choice of the H264 payload type of WebRTC offers
+"""
+
+from ptz.webrtc import payload_type
+
+
+def sdp(*lines):
+    """SDP document with CRLF line endings, as browsers send them"""
+    return '\r\n'.join(('v=0', 's=-', 't=0 0') + lines) + '\r\n'
+
+
+CHROME = sdp(
+    'm=video 9 UDP/TLS/RTP/SAVPF 96 97 102 103 104 105 106 107 108 109 127 125 112 113',
+    'a=rtpmap:96 VP8/90000',
+    'a=rtpmap:97 rtx/90000',
+    'a=fmtp:97 apt=96',
+    'a=rtpmap:102 H264/90000',
+    'a=rtcp-fb:102 nack pli',
+    'a=fmtp:102 level-asymmetry-allowed=1;packetization-mode=1;profile-level-id=42001f',
+    'a=rtpmap:103 rtx/90000',
+    'a=fmtp:103 apt=102',
+    'a=rtpmap:104 H264/90000',
+    'a=fmtp:104 level-asymmetry-allowed=1;packetization-mode=0;profile-level-id=42001f',
+    'a=rtpmap:106 H264/90000',
+    'a=fmtp:106 level-asymmetry-allowed=1;packetization-mode=1;profile-level-id=42e01f',
+    'a=rtpmap:108 H264/90000',
+    'a=fmtp:108 level-asymmetry-allowed=1;packetization-mode=0;profile-level-id=42e01f',
+    'a=rtpmap:127 H264/90000',
+    'a=fmtp:127 level-asymmetry-allowed=1;packetization-mode=1;profile-level-id=4d001f',
+    'a=rtpmap:112 H264/90000',
+    'a=fmtp:112 level-asymmetry-allowed=1;packetization-mode=1;profile-level-id=64001f',
+)
+
+# Firefox lists the fmtp lines before the rtpmap lines, and mode 0 without the parameter
+FIREFOX = sdp(
+    'm=video 9 UDP/TLS/RTP/SAVPF 120 124 121 125 126 127 97 98',
+    'a=fmtp:126 profile-level-id=42e01f;level-asymmetry-allowed=1;packetization-mode=1',
+    'a=fmtp:97 profile-level-id=42e01f;level-asymmetry-allowed=1',
+    'a=fmtp:120 max-fs=12288;max-fr=60',
+    'a=rtpmap:120 VP8/90000',
+    'a=rtpmap:126 H264/90000',
+    'a=rtpmap:97 H264/90000',
+)
+
+SAFARI = sdp(
+    'm=video 9 UDP/TLS/RTP/SAVPF 96 97 98 99 100',
+    'a=rtpmap:96 H264/90000',
+    'a=fmtp:96 level-asymmetry-allowed=1;packetization-mode=1;profile-level-id=640C1F',
+    'a=rtpmap:97 rtx/90000',
+    'a=fmtp:97 apt=96',
+    'a=rtpmap:98 H264/90000',
+    'a=fmtp:98 level-asymmetry-allowed=1;packetization-mode=1;profile-level-id=42E01F',
+    'a=rtpmap:100 VP8/90000',
+)
+
+
+def test_chrome_gets_non_interleaved_constrained_baseline():
+    assert payload_type(CHROME) == 106
+
+
+def test_firefox_gets_non_interleaved_constrained_baseline():
+    assert payload_type(FIREFOX) == 126
+
+
+def test_safari_profile_level_id_is_case_insensitive():
+    assert payload_type(SAFARI) == 98
+
+
+def test_constrained_baseline_with_both_constraint_flags():
+    offer = sdp(
+        'a=rtpmap:100 H264/90000',
+        'a=fmtp:100 packetization-mode=1;profile-level-id=64001f',
+        'a=rtpmap:101 H264/90000',
+        'a=fmtp:101 packetization-mode=1;profile-level-id=42c01f',
+    )
+    assert payload_type(offer) == 101
+
+
+def test_non_interleaved_is_preferred_over_the_profile():
+    offer = sdp(
+        'a=rtpmap:100 H264/90000',
+        'a=fmtp:100 packetization-mode=0;profile-level-id=42e01f',
+        'a=rtpmap:101 H264/90000',
+        'a=fmtp:101 packetization-mode=1;profile-level-id=64001f',
+    )
+    assert payload_type(offer) == 101
+
+
+def test_first_h264_type_without_fmtp():
+    offer = sdp('a=rtpmap:96 VP8/90000', 'a=rtpmap:102 H264/90000', 'a=rtpmap:104 H264/90000')
+    assert payload_type(offer) == 102
+
+
+def test_offer_without_h264():
+    assert payload_type(sdp('a=rtpmap:96 VP8/90000', 'a=rtpmap:98 VP9/90000')) is None
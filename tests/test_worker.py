@@ -0,0 +1,109 @@
+#  Copyright (C) 2024 RidgeRun, LLC (http://www.ridgerun.com)
+#  All Rights Reserved.
+#
+#  The contents of this software are proprietary and confidential to RidgeRun,
+#  LLC.  No part of this program may be photocopied, reproduced or translated
+#  into another programming language without prior written consent of
+#  RidgeRun, LLC.  The user is free to modify the source code after obtaining
+#  a software license from RidgeRun.  All source code changes must be provided
+#  back to RidgeRun without any encumbrance.
+
+
+"""Tests for the state handed to restarted pipeline workers
+"""
+
+import multiprocessing
+import os
+from multiprocessing.connection import Connection
+from threading import Event
+
+import pytest
+from conftest import wait_for
+from rrmsutils.models.ptz.position import Position
+from rrmsutils.models.ptz.zoom import Zoom
+
+from ptz import worker
+from ptz.events import EventHub
+from ptz.models.stream import Stream
+from ptz.worker import EVENT, RemotePTZ
+
+
+class FakeProcess():
+    """Stands for a worker process: keeps its end of the pipe and the constructor arguments
+    instead of running _serve, and exits when told to"""
+
+    def __init__(self, context, target, args, daemon):  # pylint: disable=unused-argument
+        self.__context = context
+        self.conn, _, self.kwargs, _ = args
+        self.exited = Event()
+        self.exitcode = None
+        self.pid = len(context.processes)
+
+    def start(self):
+        # The parent closes its copy of the worker end once the process is started
+        self.conn = Connection(os.dup(self.conn.fileno()))
+        self.__context.processes.append(self)
+
+    def join(self):
+        self.exited.wait()
+
+    def exit(self):
+        self.exitcode = -9
+        self.conn.close()
+        self.exited.set()
+
+
+class FakeContext():
+    """Stands for the spawn context, processes are FakeProcess objects"""
+
+    def __init__(self):
+        self.processes = []
+
+    @staticmethod
+    def Pipe():  # pylint: disable=invalid-name
+        return multiprocessing.Pipe()
+
+    def Process(self, target, args, daemon):  # pylint: disable=invalid-name
+        return FakeProcess(self, target, args, daemon)
+
+
+@pytest.fixture(name='context')
+def fixture_context(monkeypatch):
+    context = FakeContext()
+    monkeypatch.setattr(worker.multiprocessing, 'get_context', lambda method: context)
+    return context
+
+
+def test_restarted_worker_gets_the_last_reported_pose(context):
+    events = EventHub()
+    stream = Stream(in_uri='rtsp://127.0.0.1:8554/input', out_port=5021, out_mapping='ptz_out')
+    RemotePTZ(restart_delay=0.01, events=events, stream=stream)
+    first = context.processes[0]
+
+    # Poses set in the worker without a setter call, by the local control socket or a recall
+    first.conn.send((None, EVENT, ('position', {'pan': 30.0, 'tilt': -10.0})))
+    first.conn.send((None, EVENT, ('zoom', {'zoom': 2.5})))
+    assert wait_for(lambda: events.get_version() == 2)
+
+    first.exit()
+    assert wait_for(lambda: len(context.processes) == 2)
+
+    kwargs = context.processes[1].kwargs
+    assert kwargs['stream'] == stream
+    assert kwargs['position'] == Position(pan=30.0, tilt=-10.0)
+    assert kwargs['zoom'] == Zoom(zoom=2.5)
+    context.processes[1].exit()
+
+
+def test_invalid_reported_pose_is_not_restored(context):
+    events = EventHub()
+    RemotePTZ(restart_delay=0.01, events=events, position=Position(pan=10.0, tilt=0.0))
+    first = context.processes[0]
+
+    first.conn.send((None, EVENT, ('position', {'pan': 500.0, 'tilt': 0.0})))
+    assert wait_for(lambda: events.get_version() == 1)
+
+    first.exit()
+    assert wait_for(lambda: len(context.processes) == 2)
+    assert context.processes[1].kwargs['position'] == Position(pan=10.0, tilt=0.0)
+    context.processes[1].exit()